@@ -0,0 +1,157 @@
+import sqlite3
+from typing import Any, Dict, List
+
+import pandas as pd
+import ray
+import requests
+from common_processing.efo.neighbours import (
+    EFO_NEIGHBOURS_DB_FILE,
+    EFO_NEIGHBOURS_LIMIT,
+    EFO_NEIGHBOURS_META_NODES,
+    EFO_NEIGHBOURS_TABLE,
+)
+
+from analysis import utils
+from analysis.settings import config
+
+from icecream import ic  # noqa
+from loguru import logger  # noqa
+from pydash import py_  # noqa
+
+from metaflow import Flow, FlowSpec, Parameter, step  # noqa
+
+
+DATA_ROOT = utils.find_data_root()
+BATCH_LOG_STEP = 5_000
+
+
+def get_efo_ids(db_path) -> List[str]:
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT DISTINCT efo_id FROM IC").fetchall()
+    res = [_[0] for _ in rows]
+    return res
+
+
+@ray.remote
+def get_efo_neighbours(
+    url: str, efo_ids: List[str], skip: int
+) -> List[Dict[str, Any]]:
+    if skip % BATCH_LOG_STEP == 0:
+        logger.info(f"efo_neighbours {skip=}")
+    res = []
+    for efo_id in efo_ids:
+        for meta_node in EFO_NEIGHBOURS_META_NODES:
+            params = {
+                "entity_id": efo_id,
+                "meta_node": "Efo",
+                "include_meta_nodes": [meta_node],
+                "limit": EFO_NEIGHBOURS_LIMIT,
+            }
+            r = requests.get(f"{url}/query/entity", params=params)
+            r.raise_for_status()
+            res.extend(
+                [
+                    {
+                        "efo_id": efo_id,
+                        "meta_node": meta_node,
+                        "rank": rank,
+                        "ent_id": _["id"],
+                        "ent_term": _["name"],
+                        "text": _["text"],
+                        "score": _["score"],
+                    }
+                    for rank, _ in enumerate(r.json()["results"])
+                ]
+            )
+    return res
+
+
+class EfoNeighboursProcessing(FlowSpec):
+    NUM_WORKERS = Parameter(
+        "num_workers",
+        help="Number of cpu workers",
+        default=8,
+    )
+    OVERWRITE = Parameter(
+        "overwrite",
+        help="overwrite",
+        default=False,
+    )
+
+    @step
+    def start(self):
+        "Init."
+        logger.info("Start.")
+
+        self.DATA_DIR = DATA_ROOT / "efo"
+        self.NEURAL_URL = config.epigraphdb_neural_url
+        logger.info(
+            f"""Params
+
+        {self.NUM_WORKERS=}
+        {self.OVERWRITE=}
+        {self.NEURAL_URL=}
+        {self.DATA_DIR=}
+        """
+        )
+        ray.init(num_cpus=self.NUM_WORKERS)
+        self.next(self.get_efo_neighbours)
+
+    @step
+    def get_efo_neighbours(self):
+        "Top neighbours of every efo node, from the efo flow IC table."
+        efo_ids = get_efo_ids(self.DATA_DIR / "epigraphdb_efo.db")
+        ic(len(efo_ids))
+        batch_size = 100
+        neighbours_futures = [
+            get_efo_neighbours.remote(
+                url=self.NEURAL_URL,
+                efo_ids=efo_ids[skip : skip + batch_size],
+                skip=skip,
+            )
+            for skip in range(0, len(efo_ids), batch_size)
+        ]
+        self.neighbours_df = pd.DataFrame(
+            py_.flatten(ray.get(neighbours_futures)),
+            columns=[
+                "efo_id",
+                "meta_node",
+                "rank",
+                "ent_id",
+                "ent_term",
+                "text",
+                "score",
+            ],
+        )
+        ic(self.neighbours_df.info())
+        self.next(self.save)
+
+    @step
+    def save(self):
+        "Efo neighbours table, served by ent_harmonization."
+        self.NEIGHBOURS_DB_FILE = self.DATA_DIR / EFO_NEIGHBOURS_DB_FILE
+        if not self.NEIGHBOURS_DB_FILE.exists() or self.OVERWRITE:
+            logger.info(f"write to {self.NEIGHBOURS_DB_FILE}")
+            with sqlite3.connect(self.NEIGHBOURS_DB_FILE) as conn:
+                self.neighbours_df.to_sql(
+                    EFO_NEIGHBOURS_TABLE,
+                    conn,
+                    index=False,
+                    if_exists="replace",
+                )
+                conn.execute(
+                    f"""
+                    CREATE INDEX IF NOT EXISTS idx_efo_meta_node
+                    ON {EFO_NEIGHBOURS_TABLE} (efo_id, meta_node, rank)
+                    """
+                )
+        self.next(self.end)
+
+    @step
+    def end(self):
+        "Finish."
+        logger.info("Done.")
+
+
+if __name__ == "__main__":
+    EfoNeighboursProcessing()
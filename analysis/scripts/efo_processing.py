@@ -4,6 +4,7 @@ from typing import Any, Dict
 import pandas as pd
 import ray
 import requests
+from common_processing.efo.graph import EFO_GRAPH_FILE, EfoGraph
 from nxontology import NXOntology
 
 from analysis import utils
@@ -269,6 +270,17 @@ class EfoProcessing(FlowSpec):
                     index_label="idx",
                     if_exists="replace",
                 )
+        self.next(self.save_efo_graph)
+
+    @step
+    def save_efo_graph(self):
+        "Compact CSR graph for local parent / child / root path lookups."
+        self.EFO_GRAPH_FILE = self.DATA_DIR / EFO_GRAPH_FILE
+        if not self.EFO_GRAPH_FILE.exists() or self.OVERWRITE:
+            efo_graph = EfoGraph.from_sqlite(self.EFO_DB_FILE)
+            ic(len(efo_graph))
+            logger.info(f"write to {self.EFO_GRAPH_FILE}")
+            efo_graph.save(self.EFO_GRAPH_FILE)
         self.next(self.end)
 
     @step
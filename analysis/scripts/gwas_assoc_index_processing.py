@@ -0,0 +1,85 @@
+from typing import List
+
+import requests
+from common_processing.funcs.gwas_assoc_index import (
+    GWAS_ASSOC_INDEX_FILE,
+    GWAS_ASSOC_META_RELS,
+    GwasAssocIndex,
+)
+
+from analysis import utils
+from analysis.settings import config
+
+from icecream import ic  # noqa
+from loguru import logger  # noqa
+from pydash import py_  # noqa
+
+from metaflow import Flow, FlowSpec, Parameter, step  # noqa
+
+
+DATA_ROOT = utils.find_data_root()
+
+
+def get_gwas_ids(url: str, meta_rel: str) -> List[str]:
+    query = f"""
+    MATCH (gwas:Gwas)-[r:{meta_rel}]-(:Gwas)
+    RETURN DISTINCT gwas._id AS ent_id
+    """
+    payload = {"query": query}
+    r = requests.post(f"{url}/cypher", json=payload)
+    r.raise_for_status()
+    res = [_["ent_id"] for _ in r.json()["results"]]
+    return res
+
+
+class GwasAssocIndexProcessing(FlowSpec):
+    OVERWRITE = Parameter(
+        "overwrite",
+        help="overwrite",
+        default=False,
+    )
+
+    @step
+    def start(self):
+        "Init."
+        logger.info("Start.")
+
+        self.DATA_DIR = DATA_ROOT / "gwas"
+        self.API_URL = config.epigraphdb_api_url
+        logger.info(
+            f"""Params
+
+        {self.OVERWRITE=}
+        {self.API_URL=}
+        {self.DATA_DIR=}
+        """
+        )
+        self.DATA_DIR.mkdir(parents=True, exist_ok=True)
+        self.next(self.get_gwas_ids)
+
+    @step
+    def get_gwas_ids(self):
+        self.gwas_ids = {
+            meta_rel: get_gwas_ids(url=self.API_URL, meta_rel=meta_rel)
+            for meta_rel in GWAS_ASSOC_META_RELS
+        }
+        ic({k: len(v) for k, v in self.gwas_ids.items()})
+        self.next(self.save)
+
+    @step
+    def save(self):
+        "GWAS ids by assoc meta rel, served by ent_filters."
+        self.INDEX_FILE = self.DATA_DIR / GWAS_ASSOC_INDEX_FILE
+        if not self.INDEX_FILE.exists() or self.OVERWRITE:
+            logger.info(f"write to {self.INDEX_FILE}")
+            GwasAssocIndex(ent_ids=self.gwas_ids).to_npz(self.INDEX_FILE)
+        self.next(self.end)
+
+    @step
+    def end(self):
+        "Finish."
+        logger.info("Done.")
+
+
+if __name__ == "__main__":
+    GwasAssocIndexProcessing()
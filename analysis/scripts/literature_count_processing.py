@@ -0,0 +1,141 @@
+import sqlite3
+from typing import Any, Dict, List
+
+import pandas as pd
+import ray
+import requests
+from common_processing.literature_evidence.counts import (
+    LITERATURE_COUNT_DB_FILE,
+    LITERATURE_COUNT_TABLE,
+)
+
+from analysis import utils
+from analysis.settings import config
+
+from icecream import ic  # noqa
+from loguru import logger  # noqa
+from pydash import py_  # noqa
+
+from metaflow import Flow, FlowSpec, Parameter, step  # noqa
+
+
+DATA_ROOT = utils.find_data_root()
+BATCH_LOG_STEP = 50_000
+
+
+def get_triples_size(url: str) -> int:
+    query = """
+    MATCH (triple:LiteratureTriple)
+    RETURN count(triple) AS n_triples
+    """
+    payload = {"query": query}
+    r = requests.post(f"{url}/cypher", json=payload)
+    r.raise_for_status()
+    res = r.json()["results"]
+    return res[0]["n_triples"]
+
+
+@ray.remote
+def get_literature_counts(
+    url: str, skip: int, size: int
+) -> List[Dict[str, Any]]:
+    if skip % BATCH_LOG_STEP == 0:
+        logger.info(f"literature_counts {skip=}")
+    query = f"""
+    MATCH (triple:LiteratureTriple)
+    WITH triple ORDER BY triple._id
+    SKIP {skip}
+    LIMIT {size}
+    MATCH (triple)-[r:SEMMEDDB_TO_LIT]->(literature:Literature)
+    RETURN
+        triple._id AS triple_id,
+        count(DISTINCT literature) AS literature_count
+    """
+    payload = {"query": query}
+    r = requests.post(f"{url}/cypher", json=payload)
+    r.raise_for_status()
+    res = r.json()["results"]
+    return res
+
+
+class LiteratureCountProcessing(FlowSpec):
+    NUM_WORKERS = Parameter(
+        "num_workers",
+        help="Number of cpu workers",
+        default=16,
+    )
+    OVERWRITE = Parameter(
+        "overwrite",
+        help="overwrite",
+        default=False,
+    )
+
+    @step
+    def start(self):
+        "Init."
+        logger.info("Start.")
+
+        self.DATA_DIR = DATA_ROOT / "literature"
+        self.API_URL = config.epigraphdb_api_url
+        logger.info(
+            f"""Params
+
+        {self.NUM_WORKERS=}
+        {self.OVERWRITE=}
+        {self.API_URL=}
+        {self.DATA_DIR=}
+        """
+        )
+        ray.init(num_cpus=self.NUM_WORKERS)
+        self.DATA_DIR.mkdir(parents=True, exist_ok=True)
+        self.next(self.get_literature_counts)
+
+    @step
+    def get_literature_counts(self):
+        self.triples_size: int = get_triples_size(url=self.API_URL)
+        ic(self.triples_size)
+        batch_size = 10_000
+        count_futures = [
+            get_literature_counts.remote(
+                url=self.API_URL,
+                skip=skip,
+                size=batch_size,
+            )
+            for skip in range(0, self.triples_size + 1, batch_size)
+        ]
+        self.count_df = pd.DataFrame(
+            py_.flatten(ray.get(count_futures)),
+            columns=["triple_id", "literature_count"],
+        ).drop_duplicates(subset=["triple_id"])
+        ic(self.count_df.info())
+        self.next(self.save)
+
+    @step
+    def save(self):
+        "Per triple literature counts, served by get_literature_count_df."
+        self.COUNT_DB_FILE = self.DATA_DIR / LITERATURE_COUNT_DB_FILE
+        if not self.COUNT_DB_FILE.exists() or self.OVERWRITE:
+            logger.info(f"write to {self.COUNT_DB_FILE}")
+            with sqlite3.connect(self.COUNT_DB_FILE) as conn:
+                self.count_df.to_sql(
+                    LITERATURE_COUNT_TABLE,
+                    conn,
+                    index=False,
+                    if_exists="replace",
+                )
+                conn.execute(
+                    f"""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_triple_id
+                    ON {LITERATURE_COUNT_TABLE} (triple_id)
+                    """
+                )
+        self.next(self.end)
+
+    @step
+    def end(self):
+        "Finish."
+        logger.info("Done.")
+
+
+if __name__ == "__main__":
+    LiteratureCountProcessing()
@@ -10,7 +10,7 @@ from metaflow import FlowSpec, Parameter, step
 
 from analysis import utils
 from analysis.funcs.generic import interval_str
-from analysis.settings import config, params
+from analysis.settings import config, harmonization_cache, params
 
 from icecream import ic  # noqa
 from loguru import logger  # noqa
@@ -27,32 +27,18 @@ def _make_efo_ents(
     context_text: str,
     pred_term: str,
     triple_data: Dict[str, Any],
-    params: Params,
+    subject_harmonizer: ent_harmonization.OntologyEntHarmonizer,
+    object_harmonizer: ent_harmonization.OntologyEntHarmonizer,
 ) -> Optional[Dict]:
+    # NOTE: the harmonizers should have been `_harmonize_terms`-ed
+    # on the subject and object terms respectively
     try:
-        ontology_ent_harmonizer = ent_harmonization.OntologyEntHarmonizer(
-            config=config
-        )
         # subjects
-        ontology_ent_harmonizer.reset()
-        ontology_ent_harmonizer.harmonize(
-            ent_id="",
-            ent_term=subject_term,
-            similarity_score_threshold=params.SIM_THRESHOLD_EFO,
-            num_similarity_candidates=params.NUM_SIMILARITY_CANDIDATES_EFO,
-            ic_score_threshold=params.IC_THRESHOLD_EFO,
-            identity_score_threshold=params.IDENTITY_THRESHOLD,
-        )
-        subject_ents = ontology_ent_harmonizer.ents
-        subject_candidates = ontology_ent_harmonizer.candidates
+        subject_ents = subject_harmonizer.ents_of(subject_term)
+        subject_candidates = subject_harmonizer.candidates_of(subject_term)
         # objects
-        ontology_ent_harmonizer.reset()
-        ontology_ent_harmonizer.harmonize(
-            ent_id="",
-            ent_term=object_term,
-        )
-        object_ents = ontology_ent_harmonizer.ents
-        object_candidates = ontology_ent_harmonizer.candidates
+        object_ents = object_harmonizer.ents_of(object_term)
+        object_candidates = object_harmonizer.candidates_of(object_term)
         # finalize
         valid = len(subject_ents) > 0 and len(object_ents) > 0
         if not valid:
@@ -86,7 +72,7 @@ def _make_umls_ents(
 ) -> Optional[Dict]:
     try:
         umls_ent_harmonizer = ent_harmonization.UmlsEntHarmonizer(
-            config=config
+            config=config, cache=harmonization_cache
         )
         # subjects
         umls_ent_harmonizer.reset()
@@ -148,7 +134,7 @@ def _make_trait_ents(
 ) -> Optional[Dict]:
     try:
         phenotype_ent_harmonizer = ent_harmonization.PhenotypeEntHarmonizer(
-            config=config
+            config=config, cache=harmonization_cache
         )
         # subjects
         phenotype_ent_harmonizer.reset()
@@ -202,6 +188,31 @@ def _make_trait_ents(
         return None
 
 
+def _harmonize_terms(
+    doi: str,
+    ontology_ent_harmonizer: ent_harmonization.OntologyEntHarmonizer,
+    ent_terms: List[str],
+    **kwargs,
+) -> None:
+    """`harmonize_many` on `ent_terms`, on failure the terms are
+    harmonized one by one so that a failing term only leaves itself
+    without results (i.e. its triples are skipped).
+    """
+    try:
+        ontology_ent_harmonizer.harmonize_many(ent_terms=ent_terms, **kwargs)
+        return None
+    except Exception as e:
+        logger.warning(f"Error, {doi=}, retry per term; {e}")
+    for ent_term in dict.fromkeys(ent_terms):
+        try:
+            ontology_ent_harmonizer.harmonize_many(
+                ent_terms=[ent_term], **kwargs
+            )
+        except Exception as e:
+            logger.warning(f"Error, {doi=}, {ent_term=}; {e}")
+    return None
+
+
 @ray.remote
 def make_efo_ents(
     idx: int,
@@ -238,6 +249,27 @@ def make_efo_ents(
         )
         .to_dict(orient="records")
     )
+    subject_harmonizer = ent_harmonization.OntologyEntHarmonizer(
+        config=config, cache=harmonization_cache
+    )
+    _harmonize_terms(
+        doi=doi,
+        ontology_ent_harmonizer=subject_harmonizer,
+        ent_terms=[_["subject_term"] for _ in triples_clean],
+        similarity_score_threshold=params.SIM_THRESHOLD_EFO,
+        num_similarity_candidates=params.NUM_SIMILARITY_CANDIDATES_EFO,
+        ic_score_threshold=params.IC_THRESHOLD_EFO,
+        identity_score_threshold=params.IDENTITY_THRESHOLD,
+    )
+    # NOTE: objects are harmonized with the library defaults
+    object_harmonizer = ent_harmonization.OntologyEntHarmonizer(
+        config=config, cache=harmonization_cache
+    )
+    _harmonize_terms(
+        doi=doi,
+        ontology_ent_harmonizer=object_harmonizer,
+        ent_terms=[_["object_term"] for _ in triples_clean],
+    )
     ents = [
         _make_efo_ents(
             doi=doi,
@@ -247,7 +279,8 @@ def make_efo_ents(
             context_text=_["context_text"],
             pred_term=_["pred_term"],
             triple_data=_["triple_data"],
-            params=params,
+            subject_harmonizer=subject_harmonizer,
+            object_harmonizer=object_harmonizer,
         )
         for _ in triples_clean
     ]
@@ -41,25 +41,22 @@ def _make_triple_evidence(
 
 
 def _make_assoc_evidence(
-    evidence_type: str,
     subject_ents: List[Dict],
     object_ents: List[Dict],
     pred_term: str,
     params: Params,
-) -> List[Dict]:
+) -> Dict[str, List[Dict]]:
     processor = assoc_evidence.AssocEvidenceProcessor(config=config)
-    process_status = processor.process(
-        evidence_type=evidence_type,
+    evidence_dfs = processor.process_all(
         subject_ents=subject_ents,
         object_ents=object_ents,
         pred_term=pred_term,
         pval_threshold=params.ASSOC_PVAL_THRESHOLD,
     )
-    if process_status:
-        df = processor.evidence_df.dropna()
-        res = df.to_dict(orient="records")
-    else:
-        res = []
+    res = {
+        evidence_type: df.dropna().to_dict(orient="records")
+        for evidence_type, df in evidence_dfs.items()
+    }
     return res
 
 
@@ -130,19 +127,13 @@ def make_assoc_evidence(
             {"ent_id": _["ent_id"], "ent_term": _["ent_term"]}
             for _ in data["trait_ents"]["object_ents"]
         ]
-        pred_term = data["pred_term"]
-        pred_directional_type = epigraphdb.PRED_DIRECTIONAL_MAPPING[pred_term]
-        evidence_types = assoc_evidence.EVIDENCE_TYPES[pred_directional_type]
-        evidence = {
-            _: _make_assoc_evidence(
-                evidence_type=_,
-                subject_ents=subject_ents,
-                object_ents=object_ents,
-                pred_term=pred_term,
-                params=params,
-            )
-            for _ in evidence_types
-        }
+        # NOTE: queries of all evidence types are sent in one wave
+        evidence = _make_assoc_evidence(
+            subject_ents=subject_ents,
+            object_ents=object_ents,
+            pred_term=data["pred_term"],
+            params=params,
+        )
         res = {
             "doi": doi,
             "triple": data["triple"],
@@ -1,3 +1,4 @@
+from common_processing.ent_harmonization import make_harmonization_cache
 from common_processing.types import Config, Params
 from environs import Env
 
@@ -19,6 +20,7 @@ config = Config(
     epigraphdb_es_url=env("ANALYSIS_EPIGRAPHDB_ES_URL"),
     backend_url=env("ANALYSIS_BACKEND_URL"),
     data_path=find_data_root(),
+    local_embeddings=env.bool("ANALYSIS_LOCAL_EMBEDDINGS", False),
 )
 
 params = Params(
@@ -39,3 +41,9 @@ params = Params(
     # assoc evidence
     ASSOC_PVAL_THRESHOLD=1e-2,
 )
+
+# shared with the backend via the data volume
+harmonization_cache = make_harmonization_cache(
+    path=config.data_path / "cache" / "ent_harmonization.db",
+    redis_url=env("HARMONIZATION_CACHE_REDIS_URL", None),
+)
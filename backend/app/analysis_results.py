@@ -0,0 +1,181 @@
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, get_args
+
+from loguru import logger
+from starlette.requests import Request
+from starlette.responses import Response
+from typing_extensions import Literal
+
+from app.settings import config
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+ANALYSIS_RESULTS_FILE = (
+    config.data_path / "analysis-artifacts" / "case_data_flat.json"
+)
+ScoreField = Literal[
+    "triple_evidence_supporting_score",
+    "triple_evidence_reversal_score",
+    "assoc_evidence_supporting_score",
+    "assoc_evidence_reversal_score",
+    "assoc_evidence_insufficient_score",
+    "assoc_evidence_additional_score",
+]
+SortField = Literal[
+    "triple",
+    "doi_count",
+    "triple_evidence_supporting_score",
+    "triple_evidence_reversal_score",
+    "assoc_evidence_supporting_score",
+    "assoc_evidence_reversal_score",
+    "assoc_evidence_insufficient_score",
+    "assoc_evidence_additional_score",
+]
+SCORE_FIELDS: List[str] = list(get_args(ScoreField))
+# NOTE: the full artifact is compressed once at its best levels,
+#       query results per request at cheap ones
+FULL_LEVELS = {"gzip": 9, "br": 11}
+QUERY_LEVELS = {"gzip": 5, "br": 4}
+# NOTE: clients revalidate with the etag instead of refetching
+CACHE_CONTROL = "no-cache"
+
+
+class Payload:
+    """A json body pre-serialized to bytes, with its compressed variants
+    (by content coding) and etag.
+    """
+
+    def __init__(self, data: Any, levels: Dict[str, int]):
+        body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        self.etag = '"{digest}"'.format(digest=hashlib.sha1(body).hexdigest())
+        self.variants: Dict[str, bytes] = {
+            "identity": body,
+            "gzip": gzip.compress(body, compresslevel=levels["gzip"]),
+        }
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(body, quality=levels["br"])
+
+    def response(
+        self, request: Request, headers: Optional[Dict[str, str]] = None
+    ) -> Response:
+        """The best variant the client accepts, 304 if its copy is fresh."""
+        headers = {
+            "ETag": self.etag,
+            "Vary": "Accept-Encoding",
+            "Cache-Control": CACHE_CONTROL,
+            **(headers or {}),
+        }
+        if_none_match = request.headers.get("if-none-match", "")
+        if self.etag in [_.strip() for _ in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+        encoding = negotiate_encoding(
+            request.headers.get("accept-encoding", ""),
+            available=list(self.variants.keys()),
+        )
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        res = Response(
+            content=self.variants[encoding],
+            media_type="application/json",
+            headers=headers,
+        )
+        return res
+
+
+class AnalysisResults:
+    def __init__(self, records: List[Dict[str, Any]]):
+        self.records = records
+        self.payload = Payload(records, levels=FULL_LEVELS)
+
+    def query(
+        self,
+        doi: Optional[str] = None,
+        pred_term: Optional[str] = None,
+        score_field: str = SCORE_FIELDS[0],
+        min_score: Optional[float] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = True,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Filter, sort and paginate the records.
+
+        - doi: cases citing this preprint doi
+        - pred_term: cases of this predicate
+        - min_score: cases with a `score_field` score of at least this
+        - sort_by: field to sort by, missing scores go last
+        """
+        records = self.records
+        if doi is not None:
+            doi = doi.lower()
+            records = [
+                _
+                for _ in records
+                if doi in [item["doi"].lower() for item in _["doi"]]
+            ]
+        if pred_term is not None:
+            pred_term = pred_term.upper()
+            records = [_ for _ in records if _["pred_term"] == pred_term]
+        if min_score is not None:
+            records = [
+                _
+                for _ in records
+                if _[score_field] is not None and _[score_field] >= min_score
+            ]
+        if sort_by is not None:
+            present = [_ for _ in records if _[sort_by] is not None]
+            missing = [_ for _ in records if _[sort_by] is None]
+            records = (
+                sorted(present, key=lambda _: _[sort_by], reverse=descending)
+                + missing
+            )
+        end = None if limit is None else offset + limit
+        res = {"total": len(records), "results": records[offset:end]}
+        return res
+
+
+@lru_cache()
+def load_analysis_results(path: Path) -> AnalysisResults:
+    logger.info(f"Load analysis results, {path=}")
+    with path.open() as f:
+        records = json.load(f)
+    res = AnalysisResults(records)
+    return res
+
+
+def artifact() -> Optional[AnalysisResults]:
+    """The analysis results artifact on the data volume, if present."""
+    if not ANALYSIS_RESULTS_FILE.exists():
+        return None
+    res = load_analysis_results(ANALYSIS_RESULTS_FILE)
+    return res
+
+
+def negotiate_encoding(accept_encoding: str, available: List[str]) -> str:
+    """Content coding to serve for an `Accept-Encoding` header,
+    preferring br over gzip.
+    """
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        qvalue = 1.0
+        if params.strip().startswith("q="):
+            try:
+                qvalue = float(params.strip()[2:])
+            except ValueError:
+                qvalue = 0.0
+        accepted[coding.strip().lower()] = qvalue
+    for coding in ["br", "gzip"]:
+        if coding not in available:
+            continue
+        qvalue = accepted.get(coding, accepted.get("*", 0.0))
+        if qvalue > 0:
+            return coding
+    return "identity"
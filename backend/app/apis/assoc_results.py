@@ -4,7 +4,9 @@ from common_processing import assoc_evidence
 from fastapi import APIRouter
 
 from app import types
+from app.cache import evidence_cache
 from app.settings import config
+from app.single_flight import single_flight
 from app.types import request_models, response_models
 
 router = APIRouter()
@@ -14,12 +16,13 @@ router = APIRouter()
     "/evidence/association",
     response_model=Optional[response_models.AssocEvidenceResponse],  # type: ignore
 )
-# @cache(namespace="evidence_assoc")
+@single_flight(namespace="evidence_assoc")
+@evidence_cache(namespace="evidence_assoc")
 async def get_assoc(data: request_models.AssocRequests) -> types.AssocEvidence:
     subject_ents = [_.dict() for _ in data.subject_ents]
     object_ents = [_.dict() for _ in data.object_ents]
     assoc_processor = assoc_evidence.AssocEvidenceProcessor(config=config)
-    assoc_processor.process(
+    await assoc_processor.aprocess(
         evidence_type=data.evidence_type,
         pred_term=data.pred_term,
         subject_ents=subject_ents,
@@ -6,7 +6,7 @@ from common_processing.types import semrep_types
 from fastapi import APIRouter
 from fastapi_cache.decorator import cache
 
-from app import types
+from app import executor, types
 from app.settings import config
 from app.types import request_models, response_models
 
@@ -23,14 +23,19 @@ segmenter = pysbd.Segmenter(language="en", clean=False)
 async def parse_text_to_triples(
     data: request_models.ClaimTextRequest,
 ) -> types.TripleData:
+    res = await executor.run_sync(parse_claim_text, claim_text=data.claim_text)
+    return res
+
+
+def parse_claim_text(claim_text: str) -> types.TripleData:
     claim_parser = claim_parsing.ClaimParser(config=config)
-    claim_parser.parse_claim(claim_text=data.claim_text)
+    claim_parser.parse_claim(claim_text=claim_text)
     semrep_triples: List[semrep_types.TripleItem] = claim_parser.triple_items
     invalid_triples: List[
         semrep_types.TripleItem
     ] = claim_parser.invalid_triple_items
     html_text: List[Dict[str, Union[int, str]]] = claim_parser.html_text
-    segmented_text = segmenter.segment(data.claim_text)
+    segmented_text = segmenter.segment(claim_text)
     res: types.TripleData = {
         "data": semrep_triples,
         "html": html_text,
@@ -1,26 +1,30 @@
-import json
-from pathlib import Path
-from typing import Any, Dict, List, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
 
 import pandas as pd
 import pandera as pa
-import requests
+from common_processing.efo import EfoGraph, get_efo_graph
 from common_processing.ent_harmonization.processing import efo_ic_scores
+from common_processing.funcs import http_client, parallel
 from common_processing.resources.epigraphdb import ENT_URL_TEMPLATE
 from common_processing.types import Config
-from fastapi import APIRouter
-from fastapi_cache.decorator import cache
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from loguru import logger
 from pandera.typing import DataFrame, Series
 from pydantic import BaseModel
 from pydash import py_
 from typing_extensions import TypedDict
 
-from app import types
+from app import analysis_results, executor, types
 from app.settings import config
 from app.types import request_models, response_models
 
 router = APIRouter()
 
+# NOTE: similarity between a pair of terms does not change between
+# requests, memoize them across requests
+SIM_SCORE_CACHE_SIZE = 16_384
+
 
 class BaseEnt(TypedDict):
     ent_id: str
@@ -107,15 +111,93 @@ async def get_efo_ic_scores(
     data: request_models.EfoIcRequest,
 ) -> types.EfoIcRes:
     ent_ids = data.ent_ids
-    df = efo_ic_scores(ent_ids=ent_ids, config=config)
+    df = await executor.run_sync(efo_ic_scores, ent_ids=ent_ids, config=config)
     res: types.EfoIcRes = df.to_dict(orient="records")
     return res
 
 
 @router.post("/data/ontology", response_model=OntologyDataResponse)
 async def get_ontology_data(data: OntologyDataRequest) -> OntologyDataRes:
-    ent_ids = data.ent_ids
-    query_terms = data.query_terms
+    res = await executor.run_sync(
+        _make_ontology_data, ent_ids=data.ent_ids, query_terms=data.query_terms
+    )
+    return res
+
+
+@router.get(
+    "/data/prompt/literature-term", response_model=List[BaseEntResponse]
+)
+async def get_prompt_literature_term(q: str) -> List[BaseEnt]:
+    url = config.epigraphdb_web_backend_url + "/search/quick/node"
+    params: Dict[str, Any] = {
+        "q": q,
+        "size": 20,
+        "meta_node": "LiteratureTerm",
+    }
+    r = await http_client.aget(
+        url, service="epigraphdb_web_backend", params=params
+    )
+    r.raise_for_status()
+    r_data = r.json()
+    res: List[BaseEnt] = [
+        {"ent_id": _["id"]["id"], "ent_term": _["name"]} for _ in r_data
+    ]
+    return res
+
+
+@router.get("/data/analysis-results")
+async def get_analysis_results(
+    request: Request,
+    doi: Optional[str] = None,
+    pred_term: Optional[str] = None,
+    score_field: analysis_results.ScoreField = (
+        "triple_evidence_supporting_score"
+    ),
+    min_score: Optional[float] = None,
+    sort_by: Optional[analysis_results.SortField] = None,
+    descending: bool = True,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+) -> Response:
+    """Cases of the medRxiv analysis.
+
+    Without params the full artifact is served as preloaded, otherwise
+    the filtered, sorted page of cases, `X-Total-Count` being the
+    number of cases before pagination.
+    """
+    results = analysis_results.artifact()
+    if results is None:
+        raise HTTPException(
+            status_code=404, detail="Analysis results are not available"
+        )
+    filters = [doi, pred_term, min_score, sort_by, limit]
+    if offset == 0 and all(_ is None for _ in filters):
+        payload = results.payload
+        total = len(results.records)
+    else:
+        query_res = results.query(
+            doi=doi,
+            pred_term=pred_term,
+            score_field=score_field,
+            min_score=min_score,
+            sort_by=sort_by,
+            descending=descending,
+            offset=offset,
+            limit=limit,
+        )
+        payload = await executor.run_sync(
+            analysis_results.Payload,
+            query_res["results"],
+            levels=analysis_results.QUERY_LEVELS,
+        )
+        total = query_res["total"]
+    res = payload.response(request, headers={"X-Total-Count": str(total)})
+    return res
+
+
+def _make_ontology_data(
+    ent_ids: List[str], query_terms: List[str]
+) -> OntologyDataRes:
     query_ents: List[BaseEnt] = [
         {"ent_id": f"query-ent-{idx}", "ent_term": _}
         for idx, _ in enumerate(query_terms)
@@ -146,41 +228,81 @@ async def get_ontology_data(data: OntologyDataRequest) -> OntologyDataRes:
     return res
 
 
-@router.get(
-    "/data/prompt/literature-term", response_model=List[BaseEntResponse]
-)
-async def get_prompt_literature_term(q: str) -> List[BaseEnt]:
-    url = config.epigraphdb_web_backend_url + "/search/quick/node"
-    params: Dict[str, Any] = {
-        "q": q,
-        "size": 20,
-        "meta_node": "LiteratureTerm",
-    }
-    r = requests.get(url=url, params=params)
-    r.raise_for_status()
-    r_data = r.json()
-    res: List[BaseEnt] = [
-        {"ent_id": _["id"]["id"], "ent_term": _["name"]} for _ in r_data
-    ]
-    return res
+@pa.check_types
+def _get_efo_data(ent_id: str, config: Config) -> DataFrame[EfoDf]:
+    try:
+        efo_graph = get_efo_graph(config.data_path / "efo")
+    except FileNotFoundError as e:
+        logger.warning(f"efo graph not available, query remote; {e}")
+        return _get_efo_data_remote(ent_id=ent_id, config=config)
+    return _get_efo_data_local(
+        ent_id=ent_id, efo_graph=efo_graph, config=config
+    )
 
 
-@router.get("/data/analysis-results")
-@cache(namespace="analysis-results")
-async def get_analysis_results():
-    data_path = Path("/data") / "analysis-artifacts" / "case_data_flat.json"
-    assert data_path.exists()
-    with data_path.open() as f:
-        res = json.load(f)
+@pa.check_types
+def _get_efo_data_local(
+    ent_id: str, efo_graph: EfoGraph, config: Config
+) -> DataFrame[EfoDf]:
+    # NOTE: mirrors the queries in `_get_efo_data_remote`
+    if ent_id not in efo_graph:
+        empty_df = EfoDf.example(size=1).iloc[:0, :].copy()
+        return empty_df
+    limit = 10
+    parent_ents = efo_graph.parents(ent_id, limit=limit)
+    ancestor_items = []
+    for parent in parent_ents:
+        root_path = efo_graph.root_path(parent)
+        if len(root_path) > 2:
+            ancestor_items.extend(
+                [
+                    (root_path[idx], root_path[idx + 1], "ontology_ancestor")
+                    for idx in range(len(root_path) - 1)
+                ]
+            )
+    items = (
+        [(ent_id, ent_id, "ontology_self")]
+        + [(_, ent_id, "ontology_parent") for _ in parent_ents]
+        + ancestor_items
+        + [
+            (_, ent_id, "ontology_child")
+            for _ in efo_graph.children(ent_id, limit=limit)
+        ]
+    )
+    df = pd.DataFrame(
+        [
+            {
+                "ent_id": _[0],
+                "ent_term": efo_graph.term_of(_[0]),
+                "ref_ent_id": _[1],
+                "ent_type": _[2],
+            }
+            for _ in items
+        ]
+    ).assign(
+        ent_url=lambda df: df["ent_id"].apply(
+            lambda ent_id: ENT_URL_TEMPLATE.format(
+                meta_ent="Efo", ent_id=ent_id
+            )
+        )
+    )
+    ic_df = efo_ic_scores(
+        ent_ids=df["ent_id"].drop_duplicates().tolist(),
+        config=config,
+        ic_score_threshold=None,
+    )
+    res = df.merge(ic_df[["ent_id", "ic_score"]], on="ent_id")
     return res
 
 
 @pa.check_types
-def _get_efo_data(ent_id: str, config: Config) -> DataFrame[EfoDf]:
+def _get_efo_data_remote(ent_id: str, config: Config) -> DataFrame[EfoDf]:
     @pa.check_types
     def _query(query: str, ent_type: str, config: Config) -> DataFrame[EfoDf]:
         url = "{url}/cypher".format(url=config.epigraphdb_api_url)
-        r = requests.post(url, json={"query": query})
+        r = http_client.post(
+            url, service="epigraphdb_api", json={"query": query}
+        )
         r.raise_for_status()
         results = r.json()["results"]
         if len(results) == 0:
@@ -295,7 +417,9 @@ def _get_efo_shortest_from_origin(
         root_id=root_id, ent_id=ent_id
     )
     url = "{url}/cypher".format(url=config.epigraphdb_api_url)
-    r = requests.post(url, json={"query": query})
+    r = http_client.post(
+        url, service="epigraphdb_api", retry_post=True, json={"query": query}
+    )
     r.raise_for_status()
     results = r.json()["results"]
     if len(results) == 0:
@@ -328,19 +452,21 @@ def _get_efo_shortest_from_origin(
         return nodes_df
 
 
-def _make_similarity_scores(efo_df: pd.DataFrame, query_ents: List[BaseEnt]):
-    def _get_sim_score(term1: str, term2: str) -> float:
-        url = config.neural_models_url + "/nlp/similarity"
-        params: Dict[str, Union[str, bool]] = {
-            "text1": term1,
-            "text2": term2,
-            "asis": False,
-        }
-        r = requests.get(url, params=params)
-        r.raise_for_status()
-        res = r.json()
-        return res
+@lru_cache(maxsize=SIM_SCORE_CACHE_SIZE)
+def _get_sim_score(term1: str, term2: str) -> float:
+    url = config.neural_models_url + "/nlp/similarity"
+    params: Dict[str, Union[str, bool]] = {
+        "text1": term1,
+        "text2": term2,
+        "asis": False,
+    }
+    r = http_client.get(url, service="neural_models", params=params)
+    r.raise_for_status()
+    res = r.json()
+    return res
+
 
+def _make_similarity_scores(efo_df: pd.DataFrame, query_ents: List[BaseEnt]):
     efo_ents = (
         py_.chain(
             [
@@ -355,6 +481,24 @@ def _make_similarity_scores(efo_df: pd.DataFrame, query_ents: List[BaseEnt]):
         .uniq_by(lambda item: item["ent_id"])
         .value()
     )
+    # unique term pairs are scored concurrently, then fanned back out
+    term_pairs = list(
+        dict.fromkeys(
+            [
+                (source["ent_term"], target["ent_term"])
+                for source in efo_ents
+                for target in query_ents
+            ]
+        )
+    )
+    pair_scores = dict(
+        zip(
+            term_pairs,
+            parallel.thread_map(
+                lambda pair: _get_sim_score(*pair), term_pairs
+            ),
+        )
+    )
     sim_scores = (
         py_.chain(
             [
@@ -364,9 +508,9 @@ def _make_similarity_scores(efo_df: pd.DataFrame, query_ents: List[BaseEnt]):
                         "source_ent_term": source["ent_term"],
                         "target_ent_id": target["ent_id"],
                         "target_ent_term": target["ent_term"],
-                        "similarity_score": _get_sim_score(
-                            term1=source["ent_term"], term2=target["ent_term"]
-                        ),
+                        "similarity_score": pair_scores[
+                            (source["ent_term"], target["ent_term"])
+                        ],
                     }
                     for target in query_ents
                 ]
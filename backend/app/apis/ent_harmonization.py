@@ -10,7 +10,8 @@ from fastapi import APIRouter
 from fastapi_cache.decorator import cache
 
 from app import types
-from app.settings import config
+from app.settings import config, harmonization_cache
+from app.single_flight import single_flight
 from app.types import request_models, response_models
 
 router = APIRouter()
@@ -20,18 +21,70 @@ router = APIRouter()
     "/ent_harmonization/ontology_ents",
     response_model=Optional[response_models.OntologyHarmonizationResponse],  # type: ignore
 )
+@single_flight(namespace="ent_harmonization_ontology_ents")
 @cache(namespace="ent_harmonization_ontology_ents")
 async def ontology_ents(
     data: request_models.ClaimEntRequest,
 ) -> Optional[types.OntologyResults]:
-    ontology_ent_harmonizer = ent_harmonization.OntologyEntHarmonizer(
-        config=config
-    )
-    harmonization_status = ontology_ent_harmonizer.harmonize(
+    res = await harmonize_ontology_ents(
         ent_id=data.ent_id,
         ent_term=data.ent_term,
-        similarity_score_threshold=data.similarity_threshold,
-        num_similarity_candidates=data.num_ent_candidates,
+        num_ent_candidates=data.num_ent_candidates,
+        similarity_threshold=data.similarity_threshold,
+    )
+    return res
+
+
+@router.post(
+    "/ent_harmonization/trait_ents",
+    response_model=Optional[response_models.PostOntologyEntResponse],  # type: ignore
+)
+@single_flight(namespace="ent_harmonization_trait_ents")
+@cache(namespace="ent_harmonization_trait_ents")
+async def trait_ents(
+    data: request_models.TraitEntRequest,
+) -> Optional[types.PostOntologyEntResults]:
+    res = await harmonize_trait_ents(
+        ontology_ents=[_.dict() for _ in data.ents],
+        pred_term=data.pred_term,
+        num_ent_candidates=data.num_ent_candidates,
+        similarity_threshold=data.similarity_threshold,
+    )
+    return res
+
+
+@router.post(
+    "/ent_harmonization/umls_ents",
+    response_model=Optional[response_models.PostOntologyEntResponse],  # type: ignore
+)
+@single_flight(namespace="ent_harmonization_umls_ents")
+@cache(namespace="ent_harmonization_umls_ents")
+async def umls_ents(
+    data: request_models.UmlsEntRequest,
+) -> Optional[types.PostOntologyEntResults]:
+    res = await harmonize_umls_ents(
+        query_umls_ent=data.query_umls_ent.dict(),
+        ontology_ents=[_.dict() for _ in data.ontology_ents],
+        num_similarity_candidates=data.num_similarity_candidates,
+        similarity_score_threshold=data.similarity_score_threshold,
+    )
+    return res
+
+
+async def harmonize_ontology_ents(
+    ent_id: str,
+    ent_term: str,
+    num_ent_candidates: int,
+    similarity_threshold: float,
+) -> Optional[types.OntologyResults]:
+    ontology_ent_harmonizer = ent_harmonization.OntologyEntHarmonizer(
+        config=config, cache=harmonization_cache
+    )
+    harmonization_status = await ontology_ent_harmonizer.aharmonize(
+        ent_id=ent_id,
+        ent_term=ent_term,
+        similarity_score_threshold=similarity_threshold,
+        num_similarity_candidates=num_ent_candidates,
     )
     if not harmonization_status:
         return None
@@ -45,23 +98,20 @@ async def ontology_ents(
     return res
 
 
-@router.post(
-    "/ent_harmonization/trait_ents",
-    response_model=Optional[response_models.PostOntologyEntResponse],  # type: ignore
-)
-@cache(namespace="ent_harmonization_trait_ents")
-async def trait_ents(
-    data: request_models.TraitEntRequest,
+async def harmonize_trait_ents(
+    ontology_ents: List[ent_types.BaseEnt],
+    pred_term: str,
+    num_ent_candidates: int,
+    similarity_threshold: float,
 ) -> Optional[types.PostOntologyEntResults]:
-    ontology_ents = [_.dict() for _ in data.ents]
     phenotype_ent_harmonizer = ent_harmonization.PhenotypeEntHarmonizer(
-        config=config
+        config=config, cache=harmonization_cache
     )
-    harmonization_status = phenotype_ent_harmonizer.harmonize(
+    harmonization_status = await phenotype_ent_harmonizer.aharmonize(
         ontology_ents=ontology_ents,
-        pred_term=data.pred_term,
-        num_similarity_candidates=data.num_ent_candidates,
-        similarity_score_threshold=data.similarity_threshold,
+        pred_term=pred_term,
+        num_similarity_candidates=num_ent_candidates,
+        similarity_score_threshold=similarity_threshold,
     )
     if not harmonization_status:
         return None
@@ -85,22 +135,20 @@ async def trait_ents(
     return res
 
 
-@router.post(
-    "/ent_harmonization/umls_ents",
-    response_model=Optional[response_models.PostOntologyEntResponse],  # type: ignore
-)
-@cache(namespace="ent_harmonization_umls_ents")
-async def umls_ents(
-    data: request_models.UmlsEntRequest,
+async def harmonize_umls_ents(
+    query_umls_ent: ent_types.BaseEnt,
+    ontology_ents: List[ent_types.BaseEnt],
+    num_similarity_candidates: int,
+    similarity_score_threshold: float,
 ) -> Optional[types.PostOntologyEntResults]:
-    query_umls_ent = data.query_umls_ent.dict()
-    ontology_ents = [_.dict() for _ in data.ontology_ents]
-    umls_ent_harmonizer = ent_harmonization.UmlsEntHarmonizer(config=config)
-    harmonization_status = umls_ent_harmonizer.harmonize(
+    umls_ent_harmonizer = ent_harmonization.UmlsEntHarmonizer(
+        config=config, cache=harmonization_cache
+    )
+    harmonization_status = await umls_ent_harmonizer.aharmonize(
         umls_ent=query_umls_ent,
         ontology_ents=ontology_ents,
-        num_similarity_candidates=data.num_similarity_candidates,
-        similarity_score_threshold=data.similarity_score_threshold,
+        num_similarity_candidates=num_similarity_candidates,
+        similarity_score_threshold=similarity_score_threshold,
     )
     if not harmonization_status:
         return None
@@ -1,13 +1,19 @@
+import json
 from functools import partial
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 import pandas as pd
 from common_processing import literature_evidence
 from common_processing.funcs import ner
+from common_processing.types import literature_types
 from fastapi import APIRouter
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 
 from app import types
-from app.settings import config
+from app.cache import evidence_cache
+from app.settings import config, literature_cache
+from app.single_flight import single_flight
 from app.types import request_models, response_models
 
 router = APIRouter()
@@ -17,7 +23,8 @@ router = APIRouter()
     "/evidence/literature-lite",
     response_model=Optional[response_models.LiteratureLiteEvidenceResponse],  # type: ignore
 )
-# @cache(namespace="evidence_literature_lite")
+@single_flight(namespace="evidence_literature_lite")
+@evidence_cache(namespace="evidence_literature_lite")
 async def get_literature_lite(  # noqa
     data: request_models.LiteratureLiteRequests,
 ) -> Optional[types.LiteratureLiteEvidence]:
@@ -25,7 +32,7 @@ async def get_literature_lite(  # noqa
     literature_processor = literature_evidence.LiteratureLiteEvidenceProcessor(
         config=config
     )
-    literature_processor.process(triples=triple_items)
+    await literature_processor.aprocess(triples=triple_items)
     evidence_df = literature_processor.evidence_df
     evidence_data = evidence_df.to_dict(orient="records")
     res: types.LiteratureLiteEvidence = {
@@ -38,15 +45,16 @@ async def get_literature_lite(  # noqa
     "/evidence/literature",
     response_model=Optional[response_models.LiteratureEvidenceResponse],  # type: ignore
 )
-# @cache(namespace="evidence_literature")
+@single_flight(namespace="evidence_literature")
+@evidence_cache(namespace="evidence_literature")
 async def get_literature(  # noqa
     data: request_models.LiteratureRequests,
 ) -> Optional[types.LiteratureEvidence]:
     triple_items = [_.dict() for _ in data.triple_items]
     literature_processor = literature_evidence.LiteratureEvidenceProcessor(
-        config=config
+        config=config, cache=literature_cache
     )
-    literature_processor.process(
+    await literature_processor.aprocess(
         triples=triple_items,
         num_items_per_triple=data.num_literature_items_per_triple,
     )
@@ -66,6 +74,55 @@ async def get_literature(  # noqa
     return res
 
 
+@router.post("/evidence/literature-stream")
+async def get_literature_stream(
+    data: request_models.LiteratureRequests,
+) -> StreamingResponse:
+    """`/evidence/literature` as ndjson, one {data, html_text} line
+    per pubmed id as soon as its evidence is ready.
+    """
+    triple_items = [_.dict() for _ in data.triple_items]
+    literature_processor = literature_evidence.LiteratureEvidenceProcessor(
+        config=config, cache=literature_cache
+    )
+    res = StreamingResponse(
+        _stream_literature(
+            literature_processor, triple_items=triple_items, data=data
+        ),
+        media_type="application/x-ndjson",
+    )
+    return res
+
+
+async def _stream_literature(
+    literature_processor: literature_evidence.LiteratureEvidenceProcessor,
+    triple_items: List[literature_types.TripleItem],
+    data: request_models.LiteratureRequests,
+) -> AsyncIterator[str]:
+    # NOTE: html_text idx continues across lines, as in a single response
+    offset = 0
+    async for evidence_df in literature_processor.astream(
+        triples=triple_items,
+        num_items_per_triple=data.num_literature_items_per_triple,
+    ):
+        evidence_df = evidence_df.set_index(
+            pd.RangeIndex(offset, offset + len(evidence_df))
+        )
+        offset += len(evidence_df)
+        html_text = make_html_text(
+            evidence_df=evidence_df,
+            triple_subject_term=data.triple_subject_term,
+            triple_object_term=data.triple_object_term,
+            claim_subject_term=data.claim_subject_term,
+            claim_object_term=data.claim_object_term,
+        )
+        item: types.LiteratureEvidence = {
+            "data": evidence_df.to_dict(orient="records"),
+            "html_text": html_text,
+        }
+        yield json.dumps(jsonable_encoder(item)) + "\n"
+
+
 def make_html_text(
     evidence_df: pd.DataFrame,
     triple_subject_term: Optional[str],
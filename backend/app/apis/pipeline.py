@@ -0,0 +1,424 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+import pandas as pd
+from common_processing import assoc_evidence, scores, triple_evidence
+from common_processing.resources import epigraphdb
+from common_processing.types import ent_types, semrep_types
+from fastapi import APIRouter
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from loguru import logger
+
+from app import executor, types
+from app.types import request_models
+
+from .assoc_results import get_assoc
+from .claim_parsing import parse_claim_text
+from .ent_harmonization import (
+    harmonize_ontology_ents,
+    harmonize_trait_ents,
+    harmonize_umls_ents,
+)
+from .literature_results import get_literature_lite
+from .triple_results import get_triples
+
+router = APIRouter()
+
+
+@router.post("/pipeline/claim")
+async def claim_pipeline(data: request_models.PipelineClaimRequest):
+    """Run the whole claim pipeline in-process: parsing,
+    ontology / umls / trait harmonization, triple / literature /
+    association evidence and their scores.
+
+    Independent branches run concurrently, with `stream` every stage
+    is sent as an ndjson line as soon as it completes.
+
+    The evidence stages are those of the /evidence/* routes (and share
+    their cache), literature evidence is that of
+    /evidence/literature-lite.
+    """
+    if not data.stream:
+        res = await run_pipeline(data)
+        return res
+    queue: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(_run_streamed(data, queue=queue))
+    stream_res = StreamingResponse(
+        _stream_stages(queue, task=task), media_type="application/x-ndjson"
+    )
+    return stream_res
+
+
+async def run_pipeline(
+    data: request_models.PipelineClaimRequest,
+    queue: Optional[asyncio.Queue] = None,
+) -> types.PipelineResults:
+    parse_results = await executor.run_sync(
+        parse_claim_text, claim_text=data.claim_text
+    )
+    await _emit(queue, stage="parse", triple_idx=None, data=parse_results)
+    triples = [
+        _
+        for _ in parse_results["data"]
+        if data.triple_idx is None or _["idx"] == data.triple_idx
+    ]
+    triple_results = await asyncio.gather(
+        *[_triple_pipeline(_, data=data, queue=queue) for _ in triples]
+    )
+    res: types.PipelineResults = {
+        "parse": parse_results,
+        "triples": list(triple_results),
+    }
+    return res
+
+
+async def _triple_pipeline(
+    triple: semrep_types.TripleItem,
+    data: request_models.PipelineClaimRequest,
+    queue: Optional[asyncio.Queue],
+) -> types.PipelineTripleResults:
+    ontology_subject, ontology_object = await asyncio.gather(
+        harmonize_ontology_ents(
+            ent_id=triple["sub_id"],
+            ent_term=triple["sub_term"],
+            num_ent_candidates=data.num_ontology_candidates,
+            similarity_threshold=data.ontology_similarity_threshold,
+        ),
+        harmonize_ontology_ents(
+            ent_id=triple["obj_id"],
+            ent_term=triple["obj_term"],
+            num_ent_candidates=data.num_ontology_candidates,
+            similarity_threshold=data.ontology_similarity_threshold,
+        ),
+    )
+    ontology_ents: types.PipelineOntologyEnts = {
+        "subject": ontology_subject,
+        "object": ontology_object,
+    }
+    await _emit(
+        queue,
+        stage="ontology_ents",
+        triple_idx=triple["idx"],
+        data=ontology_ents,
+    )
+    res: types.PipelineTripleResults = {
+        "triple": triple,
+        "ontology_ents": ontology_ents,
+        "umls_ents": None,
+        "trait_ents": None,
+        "triple_evidence": {},
+        "literature_evidence": {},
+        "assoc_evidence": {},
+    }
+    # NOTE: as in the web app, the later stages need ontology ents
+    #       of both the subject and the object
+    if any(
+        _ is None or len(_["ents"]) == 0
+        for _ in [ontology_subject, ontology_object]
+    ):
+        return res
+    # NOTE: umls ents -> triple / literature evidence and
+    #       trait ents -> assoc evidence are independent of each other
+    literature_results, assoc_results = await asyncio.gather(
+        _literature_branch(
+            triple, ontology_ents=ontology_ents, data=data, queue=queue
+        ),
+        _assoc_branch(
+            triple, ontology_ents=ontology_ents, data=data, queue=queue
+        ),
+    )
+    res.update(literature_results)  # type: ignore
+    res.update(assoc_results)  # type: ignore
+    return res
+
+
+async def _literature_branch(
+    triple: semrep_types.TripleItem,
+    ontology_ents: types.PipelineOntologyEnts,
+    data: request_models.PipelineClaimRequest,
+    queue: Optional[asyncio.Queue],
+) -> Dict[str, Any]:
+    umls_subject, umls_object = await asyncio.gather(
+        harmonize_umls_ents(
+            query_umls_ent=_base_ent(triple, "sub"),
+            ontology_ents=_base_ents(ontology_ents["subject"]),
+            num_similarity_candidates=data.num_umls_candidates,
+            similarity_score_threshold=data.umls_similarity_threshold,
+        ),
+        harmonize_umls_ents(
+            query_umls_ent=_base_ent(triple, "obj"),
+            ontology_ents=_base_ents(ontology_ents["object"]),
+            num_similarity_candidates=data.num_umls_candidates,
+            similarity_score_threshold=data.umls_similarity_threshold,
+        ),
+    )
+    umls_ents: types.PipelinePostOntologyEnts = {
+        "subject": umls_subject,
+        "object": umls_object,
+    }
+    await _emit(
+        queue, stage="umls_ents", triple_idx=triple["idx"], data=umls_ents
+    )
+    res: Dict[str, Any] = {
+        "umls_ents": umls_ents,
+        "triple_evidence": {},
+        "literature_evidence": {},
+    }
+    if umls_subject is None or umls_object is None:
+        return res
+    evidence_types = triple_evidence.EVIDENCE_TYPES[
+        epigraphdb.PRED_DIRECTIONAL_MAPPING[triple["pred"]]
+    ]
+    evidence_dfs = await asyncio.gather(
+        *[
+            _triple_evidence_df(
+                request_models.TriplesRequests(
+                    subject_ents=_base_ents(umls_subject),
+                    object_ents=_base_ents(umls_object),
+                    pred_term=triple["pred"],
+                    evidence_type=_,
+                )
+            )
+            for _ in evidence_types
+        ]
+    )
+    scored_dfs = await executor.run_sync(
+        scores.make_triple_scores_batch,
+        claims=[
+            {
+                "triple_evidence": _,
+                "query_subject_term": triple["sub_term"],
+                "query_object_term": triple["obj_term"],
+                "ontology_subject_mapping": pd.DataFrame(
+                    ontology_ents["subject"]["ents"]  # type: ignore
+                ),
+                "ontology_object_mapping": pd.DataFrame(
+                    ontology_ents["object"]["ents"]  # type: ignore
+                ),
+                "umls_subject_mapping": pd.DataFrame(
+                    umls_subject["detail_data"]
+                ),
+                "umls_object_mapping": pd.DataFrame(
+                    umls_object["detail_data"]
+                ),
+            }
+            for _ in evidence_dfs
+        ],
+    )
+    res["triple_evidence"] = {
+        evidence_type: df.to_dict(orient="records")
+        for evidence_type, df in zip(evidence_types, scored_dfs)
+    }
+    await _emit(
+        queue,
+        stage="triple_evidence",
+        triple_idx=triple["idx"],
+        data=res["triple_evidence"],
+    )
+    literature_dfs = await asyncio.gather(
+        *[_literature_evidence_df(_) for _ in evidence_dfs]
+    )
+    res["literature_evidence"] = {
+        evidence_type: df.to_dict(orient="records")
+        for evidence_type, df in zip(evidence_types, literature_dfs)
+    }
+    await _emit(
+        queue,
+        stage="literature_evidence",
+        triple_idx=triple["idx"],
+        data=res["literature_evidence"],
+    )
+    return res
+
+
+async def _assoc_branch(
+    triple: semrep_types.TripleItem,
+    ontology_ents: types.PipelineOntologyEnts,
+    data: request_models.PipelineClaimRequest,
+    queue: Optional[asyncio.Queue],
+) -> Dict[str, Any]:
+    trait_subject, trait_object = await asyncio.gather(
+        harmonize_trait_ents(
+            ontology_ents=_base_ents(ontology_ents["subject"]),
+            pred_term=triple["pred"],
+            num_ent_candidates=data.num_trait_candidates,
+            similarity_threshold=data.trait_similarity_threshold,
+        ),
+        harmonize_trait_ents(
+            ontology_ents=_base_ents(ontology_ents["object"]),
+            pred_term=triple["pred"],
+            num_ent_candidates=data.num_trait_candidates,
+            similarity_threshold=data.trait_similarity_threshold,
+        ),
+    )
+    trait_ents: types.PipelinePostOntologyEnts = {
+        "subject": trait_subject,
+        "object": trait_object,
+    }
+    await _emit(
+        queue, stage="trait_ents", triple_idx=triple["idx"], data=trait_ents
+    )
+    res: Dict[str, Any] = {"trait_ents": trait_ents, "assoc_evidence": {}}
+    if trait_subject is None or trait_object is None:
+        return res
+    evidence_types = assoc_evidence.EVIDENCE_TYPES[
+        epigraphdb.PRED_DIRECTIONAL_MAPPING[triple["pred"]]
+    ]
+    evidence_dfs = await asyncio.gather(
+        *[
+            _assoc_evidence_df(
+                request_models.AssocRequests(
+                    subject_ents=_base_ents(trait_subject),
+                    object_ents=_base_ents(trait_object),
+                    pval_threshold=data.pval_threshold,
+                    pred_term=triple["pred"],
+                    evidence_type=_,
+                )
+            )
+            for _ in evidence_types
+        ]
+    )
+    scored_dfs = await executor.run_sync(
+        scores.make_assoc_scores_batch,
+        claims=[
+            {
+                "assoc_evidence": _,
+                "query_subject_term": triple["sub_term"],
+                "query_object_term": triple["obj_term"],
+                "ontology_subject_mapping": pd.DataFrame(
+                    ontology_ents["subject"]["ents"]  # type: ignore
+                ),
+                "ontology_object_mapping": pd.DataFrame(
+                    ontology_ents["object"]["ents"]  # type: ignore
+                ),
+                "trait_subject_mapping": pd.DataFrame(
+                    trait_subject["detail_data"]
+                ),
+                "trait_object_mapping": pd.DataFrame(
+                    trait_object["detail_data"]
+                ),
+            }
+            for _ in evidence_dfs
+        ],
+    )
+    res["assoc_evidence"] = {
+        evidence_type: df.to_dict(orient="records")
+        for evidence_type, df in zip(evidence_types, scored_dfs)
+    }
+    await _emit(
+        queue,
+        stage="assoc_evidence",
+        triple_idx=triple["idx"],
+        data=res["assoc_evidence"],
+    )
+    return res
+
+
+# NOTE: the evidence stages go through the /evidence/* route functions,
+#       so that they share their cache entries and in-flight requests
+async def _triple_evidence_df(
+    data: request_models.TriplesRequests,
+) -> pd.DataFrame:
+    evidence_data = await get_triples(data=data)
+    res = _make_evidence_df(evidence_data)
+    return res
+
+
+async def _assoc_evidence_df(
+    data: request_models.AssocRequests,
+) -> pd.DataFrame:
+    assoc_results = await get_assoc(data=data)
+    res = _make_evidence_df(assoc_results["data"])
+    return res
+
+
+async def _literature_evidence_df(evidence_df: pd.DataFrame) -> pd.DataFrame:
+    if len(evidence_df) == 0:
+        return pd.DataFrame()
+    data = request_models.LiteratureLiteRequests(
+        triple_items=[
+            {"triple_id": triple_id, "triple_label": triple_lower}
+            for triple_id, triple_lower in zip(
+                evidence_df["triple_id"], evidence_df["triple_lower"]
+            )
+        ]
+    )
+    literature_results = await get_literature_lite(data=data)
+    res = pd.DataFrame(
+        literature_results["data"] if literature_results is not None else []
+    )
+    return res
+
+
+def _make_evidence_df(evidence_data: List[Any]) -> pd.DataFrame:
+    res = pd.DataFrame(evidence_data).assign(idx=lambda df: range(len(df)))
+    return res
+
+
+def _base_ent(
+    triple: semrep_types.TripleItem, prefix: str
+) -> ent_types.BaseEnt:
+    res: ent_types.BaseEnt = {
+        "ent_id": triple[f"{prefix}_id"],  # type: ignore
+        "ent_term": triple[f"{prefix}_term"],  # type: ignore
+    }
+    return res
+
+
+def _base_ents(
+    results: Optional[
+        Union[types.OntologyResults, types.PostOntologyEntResults]
+    ]
+) -> List[ent_types.BaseEnt]:
+    if results is None:
+        return []
+    res: List[ent_types.BaseEnt] = [
+        {"ent_id": _["ent_id"], "ent_term": _["ent_term"]}
+        for _ in results["ents"]
+    ]
+    return res
+
+
+async def _emit(
+    queue: Optional[asyncio.Queue],
+    stage: str,
+    triple_idx: Optional[int],
+    data: Any,
+) -> None:
+    if queue is None:
+        return None
+    item: types.PipelineStage = {
+        "stage": stage,
+        "triple_idx": triple_idx,
+        "data": data,
+    }
+    await queue.put(item)
+
+
+async def _run_streamed(
+    data: request_models.PipelineClaimRequest, queue: asyncio.Queue
+) -> None:
+    try:
+        await run_pipeline(data, queue=queue)
+    except Exception as e:
+        logger.exception(f"Pipeline failed: {e}")
+        await _emit(queue, stage="error", triple_idx=None, data=str(e))
+    finally:
+        await queue.put(None)
+
+
+async def _stream_stages(
+    queue: asyncio.Queue, task: "asyncio.Task[None]"
+) -> AsyncIterator[str]:
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            yield json.dumps(jsonable_encoder(item)) + "\n"
+    finally:
+        # NOTE: stop the remaining stages when the client goes away
+        if not task.done():
+            task.cancel()
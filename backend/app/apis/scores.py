@@ -1,7 +1,12 @@
+from typing import Any, Dict, List, Sequence, Type, Union
+
 import pandas as pd
 from common_processing import scores
 from common_processing.scores import types
 from fastapi import APIRouter
+from pydantic import BaseModel
+
+from app import executor
 
 router = APIRouter()
 
@@ -26,7 +31,8 @@ async def get_assoc_scores(data: types.AssocScoresRequests):
     trait_object_mapping = pd.DataFrame(
         [_.dict() for _ in data.trait_object_mapping]
     )
-    res_df = scores.make_assoc_scores(
+    res_df = await executor.run_sync(
+        scores.make_assoc_scores,
         assoc_evidence=assoc_evidence,
         query_subject_term=query_subject_term,
         query_object_term=query_object_term,
@@ -59,7 +65,8 @@ async def get_triple_scores(data: types.TripleScoresRequests):
     umls_object_mapping = pd.DataFrame(
         [_.dict() for _ in data.umls_object_mapping]
     )
-    res_df = scores.make_triple_scores(
+    res_df = await executor.run_sync(
+        scores.make_triple_scores,
         triple_evidence=triple_evidence,
         query_subject_term=query_subject_term,
         query_object_term=query_object_term,
@@ -70,3 +77,97 @@ async def get_triple_scores(data: types.TripleScoresRequests):
     )
     res = {"data": res_df.to_dict(orient="records")}
     return res
+
+
+@router.post(
+    "/scores/assoc/batch",
+    response_model=types.AssocScoresBatchResponse,
+)
+async def get_assoc_scores_batch(data: types.AssocScoresBatchRequests):
+    """Score many claims in one pass, results are in the order of claims."""
+    claims = [
+        {
+            "assoc_evidence": _make_df(
+                _.assoc_evidence, types.AssocEvidenceItem
+            ),
+            "query_subject_term": _.query_subject_term,
+            "query_object_term": _.query_object_term,
+            "ontology_subject_mapping": _make_df(
+                _.ontology_subject_mapping, types.OntologyMappingItem
+            ),
+            "ontology_object_mapping": _make_df(
+                _.ontology_object_mapping, types.OntologyMappingItem
+            ),
+            "trait_subject_mapping": _make_df(
+                _.trait_subject_mapping, types.TraitMappingItem
+            ),
+            "trait_object_mapping": _make_df(
+                _.trait_object_mapping, types.TraitMappingItem
+            ),
+        }
+        for _ in data.claims
+    ]
+    res_dfs = await executor.run_sync(
+        scores.make_assoc_scores_batch,
+        claims=claims,
+        include_mapping_data=data.include_mapping_data,
+    )
+    res = {"data": [_.to_dict(orient="records") for _ in res_dfs]}
+    return res
+
+
+@router.post(
+    "/scores/triples/batch",
+    response_model=types.TripleScoresBatchResponse,
+)
+async def get_triple_scores_batch(data: types.TripleScoresBatchRequests):
+    """Score many claims in one pass, results are in the order of claims."""
+    claims = [
+        {
+            "triple_evidence": _make_df(
+                _.triple_evidence, types.TripleEvidenceItem
+            ),
+            "query_subject_term": _.query_subject_term,
+            "query_object_term": _.query_object_term,
+            "ontology_subject_mapping": _make_df(
+                _.ontology_subject_mapping, types.OntologyMappingItem
+            ),
+            "ontology_object_mapping": _make_df(
+                _.ontology_object_mapping, types.OntologyMappingItem
+            ),
+            "umls_subject_mapping": _make_df(
+                _.umls_subject_mapping, types.UmlsMappingItem
+            ),
+            "umls_object_mapping": _make_df(
+                _.umls_object_mapping, types.UmlsMappingItem
+            ),
+        }
+        for _ in data.claims
+    ]
+    res_dfs = await executor.run_sync(
+        scores.make_triple_scores_batch,
+        claims=claims,
+        include_mapping_data=data.include_mapping_data,
+    )
+    res = {"data": [_.to_dict(orient="records") for _ in res_dfs]}
+    return res
+
+
+def _make_df(
+    items: Union[Sequence[BaseModel], Dict[str, List[Any]]],
+    model: Type[BaseModel],
+) -> pd.DataFrame:
+    """Frame of `items` as records or columnar, columnar items are
+    reduced to the `model` fields as the records are.
+    """
+    if isinstance(items, dict):
+        num_items = len(next(iter(items.values()), []))
+        return pd.DataFrame(
+            {
+                name: items.get(name, [field.default] * num_items)
+                for name, field in model.__fields__.items()
+                if name in items or not field.required
+            }
+        )
+    res = pd.DataFrame([_.dict() for _ in items])
+    return res
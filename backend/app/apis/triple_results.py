@@ -4,7 +4,9 @@ from common_processing import triple_evidence
 from fastapi import APIRouter
 
 from app import types
+from app.cache import evidence_cache
 from app.settings import config
+from app.single_flight import single_flight
 from app.types import request_models, response_models
 
 router = APIRouter()
@@ -13,14 +15,15 @@ router = APIRouter()
 @router.post(
     "/evidence/triples", response_model=response_models.TripleEvidenceResponse
 )
-# @cache(namespace="evidence_triples")
+@single_flight(namespace="evidence_triples")
+@evidence_cache(namespace="evidence_triples")
 async def get_triples(
     data: request_models.TriplesRequests,
 ) -> List[types.TripleEvidence]:
     subject_ents = [_.dict() for _ in data.subject_ents]
     object_ents = [_.dict() for _ in data.object_ents]
     processor = triple_evidence.TripleEvidenceProcessor(config=config)
-    processor.process(
+    await processor.aprocess(
         evidence_type=data.evidence_type,
         subject_ents=subject_ents,
         object_ents=object_ents,
@@ -1,19 +1,29 @@
-import time
+import asyncio
+from typing import Dict
 
 from fastapi import APIRouter
 from fastapi_cache.decorator import cache
 
+from app import executor
+
 router = APIRouter()
 
 
 @router.get("/utils/non-cached", response_model=bool)
 async def non_cached(arg: int = 0) -> bool:
-    time.sleep(2)
+    await asyncio.sleep(2)
     return True
 
 
+@router.get("/utils/executor", response_model=Dict[str, int])
+async def executor_stats() -> executor.ExecutorStats:
+    """Queue depth of the blocking work executor of this worker."""
+    res = executor.stats()
+    return res
+
+
 @router.get("/utils/cached", response_model=bool)
 @cache()
 async def cached(arg: int = 0) -> bool:
-    time.sleep(2)
+    await asyncio.sleep(2)
     return True
@@ -0,0 +1,107 @@
+import base64
+import hashlib
+import json
+import zlib
+from typing import Any, Callable, Optional
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.coder import Coder, JsonCoder
+from fastapi_cache.decorator import cache
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.settings import evidence_cache_version
+
+EVIDENCE_CACHE_TTL = 30 * 24 * 60 * 60  # 30 days
+# NOTE: significant digits kept of float params, e.g. thresholds
+FLOAT_DIGITS = 6
+# NOTE: request fields queried as sets of ids, other lists
+#       (e.g. literature triple items) keep their order in the results
+UNORDERED_FIELDS = {"subject_ents", "object_ents"}
+
+
+class ZlibJsonCoder(Coder):
+    """JsonCoder payloads, zlib compressed and base64 encoded
+    as the redis client decodes responses to str.
+    """
+
+    @classmethod
+    def encode(cls, value: Any) -> str:
+        data = zlib.compress(JsonCoder.encode(value).encode("utf-8"))
+        res = base64.b64encode(data).decode("ascii")
+        return res
+
+    @classmethod
+    def decode(cls, value: Any) -> Any:
+        data = zlib.decompress(base64.b64decode(value)).decode("utf-8")
+        res = JsonCoder.decode(data)
+        return res
+
+
+def canonicalize(value: Any, unordered: bool = False) -> Any:
+    """Request params in a canonical form: models as dicts,
+    lists of UNORDERED_FIELDS sorted, floats rounded to
+    FLOAT_DIGITS significant digits.
+    """
+    if isinstance(value, BaseModel):
+        return canonicalize(value.dict())
+    if isinstance(value, dict):
+        return {
+            str(k): canonicalize(v, unordered=k in UNORDERED_FIELDS)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        items = [canonicalize(_) for _ in value]
+        if not unordered:
+            return items
+        return sorted(items, key=lambda _: json.dumps(_, sort_keys=True))
+    if isinstance(value, float):
+        return float(f"{value:.{FLOAT_DIGITS}g}")
+    return value
+
+
+def evidence_key_builder(
+    func: Callable,
+    namespace: Optional[str] = "",
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Optional[tuple] = None,
+    kwargs: Optional[dict] = None,
+) -> str:
+    """Content-addressed key of the canonical request params,
+    scoped to the EpiGraphDB data release.
+    """
+    res = "{prefix}:{namespace}:{version}:{digest}".format(
+        prefix=FastAPICache.get_prefix(),
+        namespace=namespace,
+        version=evidence_cache_version,
+        digest=request_digest(func, args=args, kwargs=kwargs),
+    )
+    return res
+
+
+def request_digest(
+    func: Callable, args: Optional[tuple] = None, kwargs: Optional[dict] = None
+) -> str:
+    payload = json.dumps(
+        {
+            "func": f"{func.__module__}:{func.__name__}",
+            "args": [canonicalize(_) for _ in args or ()],
+            "kwargs": canonicalize(kwargs or {}),
+        },
+        sort_keys=True,
+    )
+    res = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    return res
+
+
+def evidence_cache(namespace: str) -> Callable:
+    """`fastapi_cache` `cache` for the (POST) evidence endpoints."""
+    res = cache(
+        expire=EVIDENCE_CACHE_TTL,
+        coder=ZlibJsonCoder,
+        key_builder=evidence_key_builder,
+        namespace=namespace,
+    )
+    return res
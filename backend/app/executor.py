@@ -0,0 +1,91 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+from typing_extensions import TypedDict
+
+from app.settings import executor_max_workers
+
+R = TypeVar("R")
+
+
+class ExecutorStats(TypedDict):
+    max_workers: int
+    queued: int
+    running: int
+    completed: int
+
+
+class MeteredThreadPoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor keeping counts of queued / running /
+    completed work items, i.e. the queue depth of blocking work.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = ""):
+        super().__init__(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self.max_workers = max_workers
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+
+    def submit(
+        self, fn: Callable[..., R], /, *args: Any, **kwargs: Any
+    ) -> "Future[R]":
+        with self._stats_lock:
+            self._queued += 1
+        try:
+            res = super().submit(self._run, fn, *args, **kwargs)
+        except RuntimeError:
+            with self._stats_lock:
+                self._queued -= 1
+            raise
+        return res
+
+    def stats(self) -> ExecutorStats:
+        with self._stats_lock:
+            res: ExecutorStats = {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+            }
+        return res
+
+    def _run(self, fn: Callable[..., R], /, *args: Any, **kwargs: Any) -> R:
+        with self._stats_lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._stats_lock:
+                self._running -= 1
+                self._completed += 1
+
+
+# NOTE: installed as the default executor of the event loop on startup,
+#       so `run_in_executor(None, ...)` in common_processing uses it too
+executor = MeteredThreadPoolExecutor(
+    max_workers=executor_max_workers, thread_name_prefix="asq-blocking"
+)
+
+
+def install() -> None:
+    asyncio.get_running_loop().set_default_executor(executor)
+
+
+async def run_sync(func: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+    """Run blocking `func` on the executor, off the event loop."""
+    loop = asyncio.get_running_loop()
+    res = await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+    return res
+
+
+def stats() -> ExecutorStats:
+    res = executor.stats()
+    return res
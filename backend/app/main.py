@@ -1,12 +1,14 @@
 from typing import Dict
 
 import aioredis
+from common_processing.funcs import ent_filters, http_client
 from common_processing.utils import check_component_status
 from fastapi import FastAPI
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from starlette.middleware.cors import CORSMiddleware
 
+from app import analysis_results, executor, single_flight
 from app.settings import config
 
 from .apis import (
@@ -15,6 +17,7 @@ from .apis import (
     data,
     ent_harmonization,
     literature_results,
+    pipeline,
     scores,
     triple_results,
     utils,
@@ -29,6 +32,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Total-Count"],
 )
 
 
@@ -38,6 +42,18 @@ async def startup():
         "redis://redis", encoding="utf8", decode_responses=True
     )
     FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
+    single_flight.init(redis)
+    executor.install()
+    # NOTE: load the gwas assoc index (if built) and the analysis results
+    #       before the first request
+    ent_filters.gwas_assoc_index(config)
+    await executor.run_sync(analysis_results.artifact)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await http_client.close_async_client()
+    executor.executor.shutdown(wait=False)
 
 
 @app.get("/ping", response_model=bool)
@@ -62,3 +78,4 @@ app.include_router(
 app.include_router(assoc_results.router, tags=["main: association results"])
 app.include_router(data.router, tags=["main: data endpoints"])
 app.include_router(scores.router, tags=["main: scores endpoints"])
+app.include_router(pipeline.router, tags=["main: pipeline"])
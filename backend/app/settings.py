@@ -1,5 +1,7 @@
 from pathlib import Path
 
+from common_processing.ent_harmonization import make_harmonization_cache
+from common_processing.literature_evidence import make_literature_cache
 from common_processing.types import Config, Params
 from environs import Env
 
@@ -22,3 +24,21 @@ config = Config(
 )
 
 params = Params()
+
+# threads per worker for blocking pipeline steps, see app.executor
+executor_max_workers = env.int("EXECUTOR_MAX_WORKERS", 16)
+
+# evidence endpoints responses are cached per EpiGraphDB data release
+evidence_cache_version = env("EPIGRAPHDB_DATA_RELEASE", "1")
+
+# shared with the analysis flows via the data volume
+harmonization_cache = make_harmonization_cache(
+    path=config.data_path / "cache" / "ent_harmonization.db",
+    redis_url=env("HARMONIZATION_CACHE_REDIS_URL", None),
+)
+
+# melodi-presto sentences and medline abstracts by pubmed id
+literature_cache = make_literature_cache(
+    path=config.data_path / "cache" / "literature.db",
+    redis_url=env("LITERATURE_CACHE_REDIS_URL", None),
+)
@@ -0,0 +1,115 @@
+import asyncio
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+from uuid import uuid4
+
+from loguru import logger
+
+from app.cache import request_digest
+
+# NOTE: upper bound of an upstream fan-out, the lock expires after it
+#       in case its holder dies
+LOCK_TTL = 120.0
+POLL_INTERVAL = 0.1
+LOCK_PREFIX = "single-flight"
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+else
+    return 0
+end
+"""
+
+_redis: Optional[Any] = None
+_in_flight: Dict[str, "asyncio.Future[Any]"] = {}
+
+
+def init(redis: Any) -> None:
+    """Coalesce across workers via locks on `redis` (an aioredis client),
+    without it only within this process.
+    """
+    global _redis
+    _redis = redis
+
+
+def single_flight(namespace: str) -> Callable:
+    """Concurrent calls with identical (canonical) params
+    await one computation and share its result.
+
+    Within the process the callers share a task. Across workers one
+    of them holds a redis lock while it computes, the others wait for
+    the lock to be released and then call `func`, i.e. put this
+    above `cache` so that they are served from the fresh cache entry.
+    """
+
+    def wrapper(func):
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            key = "{namespace}:{digest}".format(
+                namespace=namespace,
+                digest=request_digest(func, args=args, kwargs=kwargs),
+            )
+            task = _in_flight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(
+                    _run_locked(key, func, args=args, kwargs=kwargs)
+                )
+                _in_flight[key] = task
+                task.add_done_callback(_pop_when_done(key))
+            # NOTE: a cancelled caller must not cancel the shared task
+            res = await asyncio.shield(task)
+            return res
+
+        return inner
+
+    return wrapper
+
+
+def _pop_when_done(key: str) -> Callable[["asyncio.Future[Any]"], None]:
+    def _pop(task: "asyncio.Future[Any]") -> None:
+        if _in_flight.get(key) is task:
+            del _in_flight[key]
+
+    return _pop
+
+
+async def _run_locked(key: str, func: Callable, args: tuple, kwargs: dict):
+    if _redis is None:
+        return await func(*args, **kwargs)
+    lock_key = f"{LOCK_PREFIX}:{key}"
+    token = uuid4().hex
+    try:
+        acquired = await _redis.set(
+            lock_key, token, nx=True, px=int(LOCK_TTL * 1000)
+        )
+    except Exception as e:
+        logger.warning(f"single flight lock failed, {lock_key=}; {e}")
+        return await func(*args, **kwargs)
+    if acquired:
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            await _release(lock_key, token)
+    await _wait_for_release(lock_key)
+    res = await func(*args, **kwargs)
+    return res
+
+
+async def _release(lock_key: str, token: str) -> None:
+    try:
+        await _redis.eval(RELEASE_SCRIPT, 1, lock_key, token)  # type: ignore
+    except Exception as e:
+        logger.warning(f"single flight release failed, {lock_key=}; {e}")
+
+
+async def _wait_for_release(lock_key: str) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + LOCK_TTL
+    while loop.time() < deadline:
+        try:
+            if not await _redis.exists(lock_key):  # type: ignore
+                return None
+        except Exception as e:
+            logger.warning(f"single flight wait failed, {lock_key=}; {e}")
+            return None
+        await asyncio.sleep(POLL_INTERVAL)
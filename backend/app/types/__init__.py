@@ -131,3 +131,38 @@ class AssocEvidenceDataItem(TypedDict):
 
 class AssocEvidence(TypedDict):
     data: List[AssocEvidenceDataItem]
+
+
+class PipelineOntologyEnts(TypedDict):
+    subject: Optional[OntologyResults]
+    object: Optional[OntologyResults]
+
+
+class PipelinePostOntologyEnts(TypedDict):
+    subject: Optional[PostOntologyEntResults]
+    object: Optional[PostOntologyEntResults]
+
+
+class PipelineTripleResults(TypedDict):
+    triple: semrep_types.TripleItem
+    ontology_ents: PipelineOntologyEnts
+    umls_ents: Optional[PipelinePostOntologyEnts]
+    trait_ents: Optional[PipelinePostOntologyEnts]
+    # scored evidence by evidence type
+    triple_evidence: Dict[str, List[Dict[str, Any]]]
+    # NOTE: lite literature evidence (as /evidence/literature-lite),
+    #       the full evidence with its html text is left to
+    #       /evidence/literature
+    literature_evidence: Dict[str, List[LiteratureLiteEvidenceData]]
+    assoc_evidence: Dict[str, List[Dict[str, Any]]]
+
+
+class PipelineResults(TypedDict):
+    parse: TripleData
+    triples: List[PipelineTripleResults]
+
+
+class PipelineStage(TypedDict):
+    stage: str
+    triple_idx: Optional[int]
+    data: Any
@@ -84,3 +84,17 @@ class AssocRequests(BaseModel):
     pval_threshold: float = 1e-2
     pred_term: str = "CAUSES"
     evidence_type: str = "supporting"
+
+
+class PipelineClaimRequest(ClaimTextRequest):
+    # NOTE: idx of a parsed triple, None for every triple of the claim
+    triple_idx: Optional[int] = None
+    num_ontology_candidates: int = params.NUM_SIMILARITY_CANDIDATES_EFO
+    ontology_similarity_threshold: float = params.SIM_THRESHOLD_EFO
+    num_trait_candidates: int = params.NUM_SIMILARITY_CANDIDATES_TRAIT
+    trait_similarity_threshold: float = params.SIM_THRESHOLD_TRAIT
+    num_umls_candidates: int = params.NUM_SIMILARITY_CANDIDATES_UMLS
+    umls_similarity_threshold: float = params.SIM_THRESHOLD_UMLS
+    pval_threshold: float = params.ASSOC_PVAL_THRESHOLD
+    # NOTE: stream stages as ndjson lines as they complete
+    stream: bool = False
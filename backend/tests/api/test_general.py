@@ -65,3 +65,24 @@ def test_analysis_results():
         r = client.get("/data/analysis-results")
     assert r.ok
     assert len(r.json()) > 0
+    etag = r.headers["etag"]
+    with TestClient(app) as client:
+        r = client.get(
+            "/data/analysis-results", headers={"If-None-Match": etag}
+        )
+    assert r.status_code == 304
+
+
+def test_analysis_results_query():
+    params = {
+        "pred_term": "CAUSES",
+        "sort_by": "triple_evidence_supporting_score",
+        "limit": 5,
+    }
+    with TestClient(app) as client:
+        r = client.get("/data/analysis-results", params=params)
+    assert r.ok
+    results = r.json()
+    assert 0 < len(results) <= 5
+    assert int(r.headers["x-total-count"]) >= len(results)
+    assert all(_["pred_term"] == "CAUSES" for _ in results)
@@ -109,3 +109,110 @@ class TestTripleScores:
         assert r.ok
         assert len(r.json()) > 0
         assert len(r.json()["data"]) > 0
+
+
+def _columns(records):
+    res = {key: [_[key] for _ in records] for key in records[0].keys()}
+    return res
+
+
+class TestScoresBatch:
+    def test_assoc_api(self):
+        claim = {
+            "assoc_evidence": assoc_evidence,
+            "query_subject_term": "Obesity",
+            "query_object_term": "Asthma",
+            "ontology_subject_mapping": ontology_subject_ents,
+            "ontology_object_mapping": ontology_object_ents,
+            "trait_subject_mapping": trait_subject_ents,
+            "trait_object_mapping": trait_object_ents,
+        }
+        columnar_claim = {
+            key: _columns(value) if isinstance(value, list) else value
+            for key, value in claim.items()
+        }
+        empty_claim = {**claim, "assoc_evidence": []}
+        url = "/scores/assoc/batch"
+        with TestClient(app) as client:
+            single_r = client.post("/scores/assoc", json=claim)
+            r = client.post(
+                url, json={"claims": [claim, columnar_claim, empty_claim]}
+            )
+            no_mapping_r = client.post(
+                url, json={"claims": [claim], "include_mapping_data": False}
+            )
+        assert r.ok and single_r.ok and no_mapping_r.ok
+        data = r.json()["data"]
+        assert data[0] == single_r.json()["data"]
+        assert data[1] == data[0]
+        assert data[2] == []
+        no_mapping_data = no_mapping_r.json()["data"][0]
+        assert all(_["mapping_data"] is None for _ in no_mapping_data)
+        assert [
+            {key: value for key, value in _.items() if key != "mapping_data"}
+            for _ in no_mapping_data
+        ] == [
+            {key: value for key, value in _.items() if key != "mapping_data"}
+            for _ in data[0]
+        ]
+
+    def test_assoc_api_invalid_columns(self):
+        claim = {
+            "assoc_evidence": _columns(assoc_evidence),
+            "query_subject_term": "Obesity",
+            "query_object_term": "Asthma",
+            "ontology_subject_mapping": _columns(ontology_subject_ents),
+            "ontology_object_mapping": _columns(ontology_object_ents),
+            "trait_subject_mapping": _columns(trait_subject_ents),
+            "trait_object_mapping": _columns(trait_object_ents),
+        }
+        missing_claim = {
+            **claim,
+            "assoc_evidence": {
+                key: value
+                for key, value in claim["assoc_evidence"].items()
+                if key != "se"
+            },
+        }
+        num_items = len(claim["assoc_evidence"]["se"])
+        wrong_type_claim = {
+            **claim,
+            "assoc_evidence": {
+                **claim["assoc_evidence"],
+                "se": ["na"] * num_items,
+            },
+        }
+        url = "/scores/assoc/batch"
+        with TestClient(app) as client:
+            r = client.post(url, json={"claims": [claim]})
+            missing_r = client.post(url, json={"claims": [missing_claim]})
+            wrong_type_r = client.post(
+                url, json={"claims": [wrong_type_claim]}
+            )
+        assert r.ok
+        assert missing_r.status_code == 422
+        assert "se" in missing_r.text
+        assert wrong_type_r.status_code == 422
+
+    def test_triple_api(self):
+        claim = {
+            "triple_evidence": triple_evidence,
+            "query_subject_term": "Obesity",
+            "query_object_term": "Asthma",
+            "ontology_subject_mapping": ontology_subject_ents,
+            "ontology_object_mapping": ontology_object_ents,
+            "umls_subject_mapping": umls_subject_ents,
+            "umls_object_mapping": umls_object_ents,
+        }
+        columnar_claim = {
+            key: _columns(value) if isinstance(value, list) else value
+            for key, value in claim.items()
+        }
+        url = "/scores/triples/batch"
+        with TestClient(app) as client:
+            single_r = client.post("/scores/triples", json=claim)
+            r = client.post(url, json={"claims": [claim, columnar_claim]})
+        assert r.ok and single_r.ok
+        data = r.json()["data"]
+        assert data[0] == single_r.json()["data"]
+        assert data[1] == data[0]
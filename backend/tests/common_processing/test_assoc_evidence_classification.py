@@ -0,0 +1,213 @@
+import re
+
+import pandas as pd
+import pytest
+from common_processing.assoc_evidence import processing
+
+SUBJECT_IDS = ["s1", "s2"]
+OBJECT_IDS = ["o1"]
+PVAL_THRESHOLD = 0.01
+QUERY_COLUMNS = [
+    "source_id",
+    "source_term",
+    "target_id",
+    "target_term",
+    "meta_rel",
+    "effect_size",
+    "se",
+    "pval",
+    "rel_data",
+]
+
+
+def _edge_df(meta_rel: str, rows: list) -> pd.DataFrame:
+    # NOTE: the source of an edge is always bound to the subject ids
+    res = pd.DataFrame(
+        [
+            {
+                "source_id": source_id,
+                "source_term": source_id.upper(),
+                "target_id": target_id,
+                "target_term": target_id.upper(),
+                "meta_rel": meta_rel,
+                "effect_size": 0.1,
+                "se": 0.01,
+                "pval": pval,
+                "rel_data": {"_id": edge_id},
+                **({"forward": forward} if forward is not None else {}),
+            }
+            for edge_id, source_id, target_id, pval, forward in rows
+        ]
+    )
+    return res
+
+
+def _edge_dfs() -> dict:
+    res = {
+        "MR_EVE_MR": _edge_df(
+            "MR_EVE_MR",
+            [
+                # s1 -> o1
+                ("m1", "s1", "o1", 1e-5, True),
+                # o1 -> s1
+                ("m2", "s1", "o1", 1e-4, False),
+                ("m3", "s2", "o1", 0.5, True),
+                ("m4", "s2", "o1", 0.3, False),
+                ("m5", "s1", "o1", None, True),
+            ],
+        ),
+        "PRS": _edge_df(
+            "PRS",
+            [
+                ("p1", "s1", "o1", 1e-3, None),
+                ("p2", "s2", "o1", 0.2, None),
+                ("p3", "s1", "o1", None, None),
+            ],
+        ),
+        "GEN_COR": _edge_df(
+            "GEN_COR",
+            [
+                ("g1", "s1", "o1", 1e-6, None),
+                ("g2", "s2", "o1", 0.9, None),
+            ],
+        ),
+    }
+    return res
+
+
+def _edge_ids(df: pd.DataFrame) -> list:
+    res = [_["_id"] for _ in df["rel_data"]]
+    return res
+
+
+@pytest.mark.parametrize(
+    "pred_term, expected",
+    [
+        (
+            "CAUSES",
+            {
+                "supporting": (["m1"], "forward"),
+                "contradictory_directional_type1": (["m2"], "reverse"),
+                "contradictory_directional_type2": (["m3", "m4"], "forward"),
+                "generic_directional": (
+                    ["p1", "p2", "p3", "g1", "g2"],
+                    "undirectional",
+                ),
+            },
+        ),
+        (
+            "ASSOCIATED_WITH",
+            {
+                "supporting": (["p1", "g1", "m1", "m2"], "undirectional"),
+                "contradictory_undirectional": (
+                    ["p2", "g2", "m3", "m4"],
+                    "undirectional",
+                ),
+            },
+        ),
+    ],
+)
+def test_classify_evidence(pred_term, expected):
+    res = processing.classify_evidence(
+        edge_dfs=_edge_dfs(),
+        pred_term=pred_term,
+        pval_threshold=PVAL_THRESHOLD,
+    )
+    assert set(res.keys()) == set(expected.keys())
+    for evidence_type, (edge_ids, direction) in expected.items():
+        df = res[evidence_type]
+        assert _edge_ids(df) == edge_ids, evidence_type
+        assert (df["direction"] == direction).all()
+        assert "forward" not in df.columns
+        # NOTE: reverse edges keep the subject ids on the subject side
+        assert set(df["subject_id"]) <= set(SUBJECT_IDS)
+        assert set(df["object_id"]) <= set(OBJECT_IDS)
+        assert (df["subject_term"] == df["subject_id"].str.upper()).all()
+
+
+def test_classify_evidence_threshold():
+    res = processing.classify_evidence(
+        edge_dfs=_edge_dfs(),
+        pred_term="CAUSES",
+        pval_threshold=0.6,
+        evidence_types=["supporting", "contradictory_directional_type2"],
+    )
+    assert _edge_ids(res["supporting"]) == ["m1", "m3"]
+    assert _edge_ids(res["contradictory_directional_type2"]) == []
+
+
+def test_classify_evidence_empty_edges():
+    edge_dfs = processing._make_edge_dfs(
+        {
+            meta_rel: pd.DataFrame(columns=QUERY_COLUMNS)
+            for meta_rel in ["MR_EVE_MR", "PRS", "GEN_COR"]
+        }
+    )
+    for pred_term in ["CAUSES", "ASSOCIATED_WITH"]:
+        res = processing.classify_evidence(
+            edge_dfs=edge_dfs,
+            pred_term=pred_term,
+            pval_threshold=PVAL_THRESHOLD,
+        )
+        assert all(len(_) == 0 for _ in res.values())
+
+
+@pytest.mark.parametrize("directional_type", ["directional", "undirectional"])
+def test_evidence_edges_match_evidence_queries(directional_type):
+    """EVIDENCE_EDGES filters are those of the EVIDENCE_FUNCS queries:
+    meta rel, direction relative to the subject, and pval clause.
+    """
+    evidence_funcs = processing.EVIDENCE_FUNCS[directional_type]
+    evidence_edges = processing.EVIDENCE_EDGES[directional_type]
+    assert set(evidence_funcs.keys()) == set(evidence_edges.keys())
+    for evidence_type, evidence_func in evidence_funcs.items():
+        evidence_queries = evidence_func(
+            subject_ids=SUBJECT_IDS,
+            object_ids=OBJECT_IDS,
+            pval_threshold=PVAL_THRESHOLD,
+        )
+        edge_filters = [
+            _query_edge_filter(_, columns=evidence_queries["columns"])
+            for _ in evidence_queries["queries"]
+        ]
+        assert edge_filters == evidence_edges[evidence_type]["edges"]
+        assert (
+            evidence_queries["direction"]
+            == evidence_edges[evidence_type]["direction"]
+        )
+
+
+def test_edge_queries_return_direction():
+    queries = processing._make_edge_queries(
+        subject_ids=SUBJECT_IDS, object_ids=OBJECT_IDS, meta_rels=None
+    )
+    mr_query = queries["MR_EVE_MR"].render()
+    assert "-[r:MR_EVE_MR]-(target" in mr_query
+    assert "startNode(r) = source AS forward" in mr_query
+    assert 'source._id IN ["s1", "s2"]' in mr_query
+    assert "pval <=" not in mr_query and "pval >" not in mr_query
+
+
+def _query_edge_filter(query, columns: dict) -> dict:
+    text = query.render()
+    meta_rel_match = re.search(r"\[r:(\w+)\]", text)
+    assert meta_rel_match is not None
+    meta_rel = meta_rel_match.group(1)
+    if "]->" in text:
+        # subject ids bound to the source: subject -> object
+        forward = query.params["source_ids"] == SUBJECT_IDS
+        assert columns == (
+            processing.FORWARD_COLUMNS
+            if forward
+            else processing.REVERSE_COLUMNS
+        )
+    else:
+        forward = None
+    pval_clause = re.search(r"r\.(?:pval|p) (<=|>)", text)
+    significant = None if pval_clause is None else pval_clause.group(1) == "<="
+    res = {
+        "meta_rel": meta_rel,
+        "forward": forward,
+        "significant": significant,
+    }
+    return res
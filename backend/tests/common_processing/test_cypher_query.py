@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from common_processing.funcs.cypher import CypherQuery, to_literal
+
+
+def test_render():
+    query = CypherQuery(
+        query="MATCH (n) WHERE n._id IN $ids AND n.p < $pval RETURN n",
+        params={"ids": ["a", "b'c"], "pval": 0.01},
+    )
+    assert query.render() == (
+        """MATCH (n) WHERE n._id IN ["a", "b'c"] AND n.p < 0.01 RETURN n"""
+    )
+
+
+def test_chunks():
+    query = CypherQuery(
+        query="MATCH (n)-[r]-(m) WHERE n._id IN $ids AND m._id IN $others",
+        params={"ids": ["a", "b", "c", "a"], "others": ["x", "y"]},
+        chunk_params=["ids", "others"],
+        chunk_size=2,
+    )
+    chunks = query.chunks()
+    assert [(_.params["ids"], _.params["others"]) for _ in chunks] == [
+        (["a", "b"], ["x", "y"]),
+        (["c"], ["x", "y"]),
+    ]
+    empty_query = CypherQuery(
+        query="MATCH (n) WHERE n._id IN $ids",
+        params={"ids": []},
+        chunk_params=["ids"],
+    )
+    assert empty_query.chunks() == []
+
+
+def test_render_quoted_and_unknown_params():
+    query = CypherQuery(
+        query=(
+            "MATCH (n) WHERE n.name = '$ids' AND n.text = \"a $b\"\n"
+            "// filter by $ids\n"
+            "AND n._id IN $ids AND n.x = $missing RETURN n"
+        ),
+        params={"ids": ["a"]},
+    )
+    assert query.render() == (
+        "MATCH (n) WHERE n.name = '$ids' AND n.text = \"a $b\"\n"
+        "// filter by $ids\n"
+        'AND n._id IN ["a"] AND n.x = $missing RETURN n'
+    )
+
+
+def test_to_literal_numbers():
+    assert to_literal(np.float32(0.5)) == "0.5"
+    assert to_literal(np.int64(3)) == "3"
+    assert to_literal(True) == "true"
+    for value in [float("nan"), float("inf"), np.float64("-inf")]:
+        with pytest.raises(ValueError):
+            to_literal(value)
@@ -0,0 +1,20 @@
+from common_processing.efo import EfoGraph
+from common_processing.efo.graph import EFO_ROOT_ID
+
+
+def test_efo_graph(tmp_path):
+    efo_graph = EfoGraph.from_edges(
+        ent_ids=[EFO_ROOT_ID, "EFO_a", "EFO_b", "EFO_c"],
+        ent_terms=["experimental factor", "a", "b", "c"],
+        parent_ids=[EFO_ROOT_ID, "EFO_a", EFO_ROOT_ID, "EFO_b"],
+        child_ids=["EFO_a", "EFO_b", "EFO_b", "EFO_c"],
+    )
+    path = tmp_path / "efo_graph.npz"
+    efo_graph.save(path)
+    efo_graph = EfoGraph.load(path)
+    assert efo_graph.parents("EFO_b") == ["EFO_a", EFO_ROOT_ID]
+    assert efo_graph.children("EFO_b") == ["EFO_c"]
+    assert efo_graph.children(EFO_ROOT_ID, limit=1) == ["EFO_a"]
+    assert efo_graph.root_path("EFO_c") == [EFO_ROOT_ID, "EFO_b", "EFO_c"]
+    assert efo_graph.term_of("EFO_c") == "c"
+    assert efo_graph.parents("EFO_missing") == []
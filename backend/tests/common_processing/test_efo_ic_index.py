@@ -0,0 +1,25 @@
+import sqlite3
+
+from common_processing.efo import EfoIcIndex
+
+
+def test_efo_ic_index(tmp_path):
+    db_path = tmp_path / "epigraphdb_efo.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE IC (idx, efo_term, efo_id, ic_score)")
+        conn.executemany(
+            "INSERT INTO IC VALUES (?, ?, ?, ?)",
+            [
+                (0, "obesity", "EFO_0001073", 0.8),
+                (1, "disease", "EFO_0000408", 0.1),
+            ],
+        )
+    efo_ic_index = EfoIcIndex.from_sqlite(db_path)
+    df = efo_ic_index.lookup(
+        ["EFO_0001073", "EFO_0000408", "EFO_0001073", "EFO_missing"]
+    )
+    assert df["ent_id"].tolist() == ["EFO_0001073", "EFO_0000408"]
+    df = efo_ic_index.lookup(
+        ["EFO_0001073", "EFO_0000408"], ic_score_threshold=0.5
+    )
+    assert df["ent_term"].tolist() == ["obesity"]
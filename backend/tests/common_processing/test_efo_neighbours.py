@@ -0,0 +1,89 @@
+import asyncio
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+
+from common_processing.efo import neighbours
+from common_processing.ent_harmonization import processing
+from common_processing.types import Config
+
+
+def _make_db(db_path: Path) -> None:
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        conn.execute(
+            f"CREATE TABLE {neighbours.EFO_NEIGHBOURS_TABLE} "
+            "(efo_id, meta_node, rank, ent_id, ent_term, text, score)"
+        )
+        conn.executemany(
+            f"INSERT INTO {neighbours.EFO_NEIGHBOURS_TABLE} "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                ("EFO_1", "Gwas", 1, "ieu-a-2", "bmi", "bmi", 0.8),
+                ("EFO_1", "Gwas", 0, "ieu-a-1", "obesity", "obesity", 0.9),
+                ("EFO_1", "Literatureterm", 0, "C1", "fat", "fat", 0.7),
+            ],
+        )
+
+
+def test_lookup_efo_neighbours(tmp_path):
+    db_path = tmp_path / neighbours.EFO_NEIGHBOURS_DB_FILE
+    _make_db(db_path)
+    res = neighbours.lookup_efo_neighbours(db_path, "EFO_1", "Gwas", limit=5)
+    assert [_["id"] for _ in res] == ["ieu-a-1", "ieu-a-2"]
+    res = neighbours.lookup_efo_neighbours(db_path, "EFO_1", "Gwas", limit=1)
+    assert [_["name"] for _ in res] == ["obesity"]
+    assert (
+        neighbours.lookup_efo_neighbours(db_path, "EFO_2", "Gwas", 5) is None
+    )
+    assert (
+        neighbours.lookup_efo_neighbours(
+            db_path, "EFO_1", "Gwas", limit=neighbours.EFO_NEIGHBOURS_LIMIT + 1
+        )
+        is None
+    )
+
+
+def test_aneural_candidates_off_loop(tmp_path, monkeypatch):
+    (tmp_path / "efo").mkdir()
+    _make_db(tmp_path / "efo" / neighbours.EFO_NEIGHBOURS_DB_FILE)
+    config = Config(
+        **{
+            f"{_}_url": "http://localhost:1"
+            for _ in [
+                "semrep_api",
+                "melodi_presto_api",
+                "medline_api",
+                "epigraphdb_api",
+                "epigraphdb_web_backend",
+                "epigraphdb_neural",
+                "neural_transformers",
+                "neural_models",
+                "epigraphdb_es",
+                "backend",
+            ]
+        },
+        data_path=tmp_path,
+    )
+    lookup_threads = []
+
+    def lookup_efo_neighbours(**kwargs):
+        lookup_threads.append(threading.get_ident())
+        return neighbours.lookup_efo_neighbours(**kwargs)
+
+    monkeypatch.setattr(
+        processing, "lookup_efo_neighbours", lookup_efo_neighbours
+    )
+    res = asyncio.run(
+        processing.agwas_similarity_candidates(
+            ent_id="EFO_1",
+            limit=5,
+            similarity_score_threshold=0.0,
+            config=config,
+        )
+    )
+    assert res is not None
+    assert res["ent_id"].tolist() == ["ieu-a-1", "ieu-a-2"]
+    # NOTE: the sqlite lookup runs in the executor, not on the loop thread
+    assert len(lookup_threads) == 1
+    assert lookup_threads[0] != threading.get_ident()
@@ -0,0 +1,52 @@
+import numpy as np
+from common_processing.ent_harmonization import EmbeddingIndex, embedding_index
+
+
+def test_embedding_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_index, "SEARCH_BLOCK_SIZE", 7)
+    rng = np.random.default_rng(0)
+    vectors = {}
+    for meta_node, size in [("Efo", 5), ("Gwas", 30)]:
+        matrix = rng.normal(size=(size, 8))
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        vectors[meta_node] = matrix.astype(np.float16)
+    EmbeddingIndex(
+        vectors=vectors,
+        ent_ids={
+            k: [f"{k}_{i}" for i in range(len(v))] for k, v in vectors.items()
+        },
+        ent_terms={
+            k: [f"term {i}" for i in range(len(v))] for k, v in vectors.items()
+        },
+    ).to_dir(tmp_path)
+    index = EmbeddingIndex.from_dir(tmp_path)
+    results = index.query_entity(
+        entity_id="Efo_2",
+        meta_node="Efo",
+        include_meta_nodes=["Gwas"],
+        limit=4,
+    )
+    scores = vectors["Gwas"].astype(np.float32) @ vectors["Efo"][2].astype(
+        np.float32
+    )
+    expected = [f"Gwas_{_}" for _ in np.argsort(-scores)[:4]]
+    assert [_["id"] for _ in results] == expected
+    assert results[0]["score"] >= results[-1]["score"]
+    assert index.query_entity("missing", "Efo", ["Gwas"], limit=4) is None
+
+
+def test_embedding_index_partial_export(tmp_path):
+    matrix = np.eye(3, dtype=np.float32)
+    EmbeddingIndex(
+        vectors={"Efo": matrix},
+        ent_ids={"Efo": ["a", "b", "c"]},
+        ent_terms={"Efo": ["term a", "term b", "term c"]},
+    ).to_dir(tmp_path)
+    index = EmbeddingIndex.from_dir(tmp_path)
+    assert [
+        _["id"] for _ in index.query_entity("a", "Efo", ["Efo"], limit=1)
+    ] == ["a"]
+    # NOTE: missing meta nodes are left to the neural service
+    assert index.query_entity("a", "Efo", ["Gwas"], limit=5) is None
+    assert index.query_entity("a", "Efo", ["Efo", "Gwas"], limit=5) is None
+    assert index.query_entity("a", "Gwas", ["Efo"], limit=5) is None
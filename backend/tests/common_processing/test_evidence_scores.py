@@ -0,0 +1,194 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pandera as pa
+import pytest
+from common_processing import scores
+
+test_data_dir = Path(__file__).parent.parent / "test_data" / "test-scores"
+
+
+def _load_df(name: str) -> pd.DataFrame:
+    with (test_data_dir / f"{name}.json").open() as f:
+        res = pd.DataFrame(json.load(f))
+    return res
+
+
+def _assoc_claim() -> dict:
+    res = {
+        "assoc_evidence": _load_df("assoc-evidence"),
+        "query_subject_term": "Obesity",
+        "query_object_term": "Asthma",
+        "ontology_subject_mapping": _load_df("ontology-subject-ents"),
+        "ontology_object_mapping": _load_df("ontology-object-ents"),
+        "trait_subject_mapping": _load_df("trait-subject-ents"),
+        "trait_object_mapping": _load_df("trait-object-ents"),
+    }
+    return res
+
+
+def _triple_claim() -> dict:
+    res = {
+        "triple_evidence": _load_df("triple-evidence"),
+        "query_subject_term": "Obesity",
+        "query_object_term": "Asthma",
+        "ontology_subject_mapping": _load_df("ontology-subject-ents"),
+        "ontology_object_mapping": _load_df("ontology-object-ents"),
+        "umls_subject_mapping": _load_df("umls-subject-ents"),
+        "umls_object_mapping": _load_df("umls-object-ents"),
+    }
+    return res
+
+
+def _scalar_assoc_score(effect_size: float, se: float) -> float:
+    # NOTE: the per row scoring of the vectorized scores
+    if np.isclose(se, 0) or np.isclose(effect_size / se, 0):
+        return np.nan
+    return max(0, 1 + np.log10(np.abs(effect_size / se)))
+
+
+def test_assoc_score_matches_scalar():
+    effect_size = np.array([0.5, -0.2, 1e-3, 0.0, 3.0, 0.1])
+    se = np.array([0.1, 0.4, 10.0, 0.1, 0.0, 1e-12])
+    expected = [_scalar_assoc_score(*_) for _ in zip(effect_size, se)]
+    res = scores._make_assoc_score(effect_size=effect_size, se=se)
+    np.testing.assert_allclose(res, expected)
+
+
+def test_scores_unchanged():
+    # NOTE: evidence scores of the fixtures by the per row implementation
+    assoc_res = scores.make_assoc_scores(**_assoc_claim())
+    assert assoc_res["idx"].tolist() == [0, 2, 3, 1]
+    np.testing.assert_allclose(
+        assoc_res["evidence_score"],
+        [
+            0.8324479959415478,
+            1.121249906560469,
+            0.9944483005641244,
+            1.1090797440860363,
+        ],
+    )
+    triple_res = scores.make_triple_scores(**_triple_claim())
+    assert triple_res["idx"].tolist() == [0, 1]
+    np.testing.assert_allclose(
+        triple_res["evidence_score"], [2.3010299956639813, 0.7759282999999999]
+    )
+
+
+def test_assoc_scores_drop_zero_se():
+    claim = _assoc_claim()
+    res = scores.make_assoc_scores(**claim)
+    assert len(res) > 1
+    dropped_idx = res["idx"].iloc[0]
+    claim["assoc_evidence"].loc[
+        claim["assoc_evidence"]["idx"] == dropped_idx, "se"
+    ] = 1e-12
+    zero_se_res = scores.make_assoc_scores(**claim)
+    assert dropped_idx not in zero_se_res["idx"].tolist()
+    pd.testing.assert_frame_equal(
+        zero_se_res.drop(columns=["mapping_data"]),
+        res[res["idx"] != dropped_idx]
+        .drop(columns=["mapping_data"])
+        .reset_index(drop=True),
+    )
+
+
+def test_assoc_scores_null_pval():
+    # NOTE: evidence with a null pval is never scored
+    claim = _assoc_claim()
+    claim["assoc_evidence"].loc[0, "pval"] = np.nan
+    with pytest.raises(pa.errors.SchemaError):
+        scores.make_assoc_scores(**claim)
+    with pytest.raises(pa.errors.SchemaError):
+        scores.make_assoc_scores_batch(claims=[_assoc_claim(), claim])
+
+
+def test_scores_without_mapping_data():
+    for make_scores, claim in [
+        (scores.make_assoc_scores, _assoc_claim()),
+        (scores.make_triple_scores, _triple_claim()),
+    ]:
+        res = make_scores(**claim)
+        assert "mapping_data" in res.columns
+        assert all(
+            set(_.keys())
+            == {
+                "subject_mapping_score",
+                "object_mapping_score",
+                "subject_mapping_data",
+                "object_mapping_data",
+            }
+            for _ in res["mapping_data"]
+        )
+        no_mapping_res = make_scores(**claim, include_mapping_data=False)
+        assert "mapping_data" not in no_mapping_res.columns
+        pd.testing.assert_frame_equal(
+            no_mapping_res, res.drop(columns=["mapping_data"])
+        )
+
+
+def _batch_claims(claim: dict, evidence_key: str, mapping_key: str) -> list:
+    """Claims sharing ent ids: the fixture claim, a subset of its
+    evidence with other query terms, empty evidence and empty mapping.
+    """
+    subset_claim = {
+        **claim,
+        evidence_key: claim[evidence_key].iloc[:2].copy(),
+        "query_subject_term": "Body mass index",
+        "query_object_term": "Asthma attack",
+    }
+    empty_evidence_claim = {
+        **claim,
+        evidence_key: claim[evidence_key].iloc[:0].copy(),
+    }
+    empty_mapping_claim = {
+        **claim,
+        mapping_key: claim[mapping_key].iloc[:0].copy(),
+    }
+    res = [
+        claim,
+        subset_claim,
+        empty_evidence_claim,
+        empty_mapping_claim,
+        claim,
+    ]
+    return res
+
+
+def test_assoc_scores_batch_matches_single():
+    claims = _batch_claims(
+        _assoc_claim(), "assoc_evidence", "trait_subject_mapping"
+    )
+    res = scores.make_assoc_scores_batch(claims=claims)
+    assert len(res) == len(claims)
+    for claim, claim_res in zip(claims, res):
+        pd.testing.assert_frame_equal(
+            claim_res, scores.make_assoc_scores(**claim)
+        )
+    assert len(res[0]) > 0 and len(res[2]) == 0 and len(res[3]) == 0
+
+
+def test_triple_scores_batch_matches_single():
+    claims = _batch_claims(
+        _triple_claim(), "triple_evidence", "umls_subject_mapping"
+    )
+    res = scores.make_triple_scores_batch(claims=claims)
+    assert len(res) == len(claims)
+    for claim, claim_res in zip(claims, res):
+        pd.testing.assert_frame_equal(
+            claim_res, scores.make_triple_scores(**claim)
+        )
+    assert len(res[0]) > 0 and len(res[2]) == 0 and len(res[3]) == 0
+
+
+def test_scores_batch_all_empty():
+    claim = _assoc_claim()
+    claim["assoc_evidence"] = claim["assoc_evidence"].iloc[:0].copy()
+    res = scores.make_assoc_scores_batch(
+        claims=[claim, claim], include_mapping_data=False
+    )
+    assert [len(_) for _ in res] == [0, 0]
+    assert "mapping_data" not in res[0].columns
+    assert res[0] is not res[1]
@@ -0,0 +1,19 @@
+from common_processing.funcs.gwas_assoc_index import GwasAssocIndex
+
+
+def test_gwas_assoc_index(tmp_path):
+    path = tmp_path / "gwas_assoc_index.npz"
+    GwasAssocIndex(
+        ent_ids={
+            "MR_EVE_MR": ["ieu-a-2", "ieu-a-1"],
+            "PRS": ["ukb-b-1"],
+            "GEN_COR": [],
+        }
+    ).to_npz(path)
+    index = GwasAssocIndex.from_npz(path)
+    ent_ids = ["ukb-b-1", "ieu-a-1", "ieu-a-3", "ieu-a-1", "zzz"]
+    assert index.filter(ent_ids, meta_rels=["MR_EVE_MR"]) == ["ieu-a-1"]
+    assert index.filter(
+        ent_ids, meta_rels=["MR_EVE_MR", "PRS", "GEN_COR"]
+    ) == ["ukb-b-1", "ieu-a-1"]
+    assert index.filter([], meta_rels=["PRS"]) == []
@@ -0,0 +1,91 @@
+import sqlite3
+
+import pandas as pd
+from common_processing.ent_harmonization import cache
+from common_processing.funcs.cache import MemoryCache, SqliteCache
+
+
+def test_cache_key():
+    key = cache.make_cache_key(
+        "ontology", ent_term="Body  Mass Index", num_similarity_candidates=30
+    )
+    assert key == cache.make_cache_key(
+        "ontology", ent_term="body mass index", num_similarity_candidates=30
+    )
+    assert key != cache.make_cache_key(
+        "ontology", ent_term="body mass index", num_similarity_candidates=20
+    )
+
+
+def test_memory_cache_lru():
+    backend = MemoryCache(max_entries=2)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    assert backend.get("a") == 1
+    backend.set("c", 3)
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+    assert backend.get("c") == 3
+
+
+def test_sqlite_cache(tmp_path):
+    backend = SqliteCache(
+        path=tmp_path / "cache.db", max_entries=2, evict_interval=1
+    )
+    df = pd.DataFrame(
+        [{"ent_id": "EFO_0001073", "ent_term": "obesity", "score": 0.9}]
+    )
+    cache.set_results(backend, "a", status=True, dfs={"ents_df": df})
+    cache.set_results(backend, "b", status=False)
+    res = cache.get_results(backend, "a")
+    assert res is not None and res["status"]
+    pd.testing.assert_frame_equal(res["dfs"]["ents_df"], df)
+    backend.set("c", 3)
+    assert backend.get("b") is None
+    assert backend.get("c") == 3
+
+
+def test_sqlite_cache_reads_do_not_write(tmp_path):
+    path = tmp_path / "cache.db"
+    backend = SqliteCache(path=path, max_entries=2, evict_interval=1)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    with sqlite3.connect(path) as conn:
+        accessed_at = conn.execute(
+            "SELECT accessed_at FROM CACHE WHERE key = 'a'"
+        ).fetchone()[0]
+    assert backend.get("a") == 1
+    with sqlite3.connect(path) as conn:
+        assert (
+            accessed_at
+            == conn.execute(
+                "SELECT accessed_at FROM CACHE WHERE key = 'a'"
+            ).fetchone()[0]
+        )
+    # NOTE: the batched access of "a" is written before eviction
+    backend.set("c", 3)
+    assert backend.get("a") == 1
+    assert backend.get("b") is None
+
+
+def test_sqlite_cache_batched_eviction(tmp_path):
+    path = tmp_path / "cache.db"
+    backend = SqliteCache(path=path, max_entries=2, evict_interval=3)
+    for key in ["a", "b"]:
+        backend.set(key, key)
+    backend.get("a")
+    backend.set("c", "c")
+    # NOTE: evicted in one batch on every third set
+    assert [backend.get(_) for _ in ["a", "b", "c"]] == ["a", None, "c"]
+    for key in ["d", "e"]:
+        backend.set(key, key)
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM CACHE").fetchone()[0] == 4
+    backend.set("f", "f")
+    assert [backend.get(_) for _ in ["a", "c", "d", "e", "f"]] == [
+        None,
+        None,
+        None,
+        "e",
+        "f",
+    ]
@@ -0,0 +1,47 @@
+import asyncio
+
+import httpx
+from common_processing.funcs import http_client
+
+
+def test_async_client_per_loop():
+    async def get_client():
+        res = http_client.get_async_client()
+        assert res is http_client.get_async_client()
+        return res
+
+    clients = [asyncio.run(get_client()) for _ in range(3)]
+    assert len({id(_) for _ in clients}) == len(clients)
+    # NOTE: clients of the closed loops are dropped with the next client
+    assert len(http_client._async_clients) <= 1
+
+
+def test_arequest_retries(monkeypatch):
+    monkeypatch.setattr(http_client, "BACKOFF_FACTOR", 0.0)
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.method)
+        return httpx.Response(503)
+
+    async def request_counts():
+        loop = asyncio.get_event_loop()
+        http_client._async_clients[loop] = (
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            asyncio.Semaphore(http_client.MAX_CONCURRENCY),
+        )
+        res = []
+        for request in [
+            http_client.aget("http://test/"),
+            http_client.apost("http://test/"),
+            http_client.apost("http://test/", retry_post=True),
+        ]:
+            requests.clear()
+            r = await request
+            assert r.status_code == 503
+            res.append(len(requests))
+        await http_client.close_async_client()
+        return res
+
+    num_attempts = http_client.MAX_RETRIES + 1
+    assert asyncio.run(request_counts()) == [num_attempts, 1, num_attempts]
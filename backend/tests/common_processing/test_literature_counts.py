@@ -0,0 +1,18 @@
+import sqlite3
+
+from common_processing.literature_evidence import counts
+
+
+def test_lookup_literature_counts(tmp_path):
+    db_path = tmp_path / counts.LITERATURE_COUNT_DB_FILE
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            f"CREATE TABLE {counts.LITERATURE_COUNT_TABLE} "
+            "(triple_id, literature_count)"
+        )
+        conn.executemany(
+            f"INSERT INTO {counts.LITERATURE_COUNT_TABLE} VALUES (?, ?)",
+            [("1", 42), ("2", 3)],
+        )
+    df = counts.lookup_literature_counts(db_path, ["2", "missing", "2"])
+    assert df.values.tolist() == [["2", 3], ["missing", 0]]
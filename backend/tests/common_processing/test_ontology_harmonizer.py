@@ -0,0 +1,234 @@
+import asyncio
+import sqlite3
+import threading
+from contextlib import closing
+
+import pytest
+from common_processing.ent_harmonization import OntologyEntHarmonizer
+from common_processing.funcs import http_client
+from common_processing.funcs.cache import CacheBackend, MemoryCache
+from common_processing.types import Config
+
+EFO_ENTS = {
+    "EFO_0001073": ("obesity", 0.8),
+    "EFO_0004340": ("body mass index", 0.7),
+    "EFO_0000270": ("asthma", 0.75),
+    "EFO_0000408": ("disease", 0.1),
+    "EFO_0001645": ("coronary artery disease", 0.6),
+}
+# NOTE: neural service `/query/text` efo results by query term
+NEURAL_RESULTS = {
+    "obesity": [
+        ("EFO_0001073", 0.95),
+        ("EFO_0004340", 0.8),
+        ("EFO_0000408", 0.75),
+    ],
+    "Body mass index": [
+        ("EFO_0004340", 0.9),
+        ("EFO_0001073", 0.85),
+        ("EFO_0000270", 0.72),
+    ],
+    "asthma attack": [
+        ("EFO_0000270", 0.88),
+        ("EFO_0000408", 0.8),
+        ("EFO_0001645", 0.71),
+    ],
+    # below the similarity threshold
+    "shoe size": [("EFO_0000408", 0.3)],
+    "nothing": [],
+}
+ENT_TERMS = [
+    "obesity",
+    "Body mass index",
+    "asthma attack",
+    "shoe size",
+    "nothing",
+    "obesity",
+]
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+def _neural_get(url, service="default", params=None, **kwargs):
+    assert url.endswith("/query/text")
+    res = FakeResponse(
+        {
+            "results": [
+                {
+                    "id": ent_id,
+                    "name": EFO_ENTS[ent_id][0],
+                    "text": EFO_ENTS[ent_id][0],
+                    "score": score,
+                    "meta_node": "Efo",
+                }
+                for ent_id, score in NEURAL_RESULTS[params["text"]]
+            ]
+        }
+    )
+    return res
+
+
+def _transformers_post(url, service="default", json=None, **kwargs):
+    assert url.endswith("/inference")
+    # NOTE: identical when one term contains the other
+    res = FakeResponse(
+        [
+            0.5 if text_2.lower() in text_1.lower() else 2.0
+            for text_1, text_2 in zip(json["text_1"], json["text_2"])
+        ]
+    )
+    return res
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    (tmp_path / "efo").mkdir()
+    db_path = tmp_path / "efo" / "epigraphdb_efo.db"
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        conn.execute("CREATE TABLE IC (idx, efo_term, efo_id, ic_score)")
+        conn.executemany(
+            "INSERT INTO IC VALUES (?, ?, ?, ?)",
+            [
+                (idx, ent_term, ent_id, ic_score)
+                for idx, (ent_id, (ent_term, ic_score)) in enumerate(
+                    EFO_ENTS.items()
+                )
+            ],
+        )
+    monkeypatch.setattr(http_client, "get", _neural_get)
+    monkeypatch.setattr(http_client, "post", _transformers_post)
+    res = Config(
+        **{
+            f"{_}_url": "http://localhost:1"
+            for _ in [
+                "semrep_api",
+                "melodi_presto_api",
+                "medline_api",
+                "epigraphdb_api",
+                "epigraphdb_web_backend",
+                "epigraphdb_neural",
+                "neural_transformers",
+                "neural_models",
+                "epigraphdb_es",
+                "backend",
+            ]
+        },
+        data_path=tmp_path,
+    )
+    return res
+
+
+def _harmonize_each(config: Config) -> dict:
+    res = {}
+    for ent_term in ENT_TERMS:
+        harmonizer = OntologyEntHarmonizer(config=config)
+        status = harmonizer.harmonize(ent_id=ent_term, ent_term=ent_term)
+        res[ent_term] = (status, harmonizer.candidates, harmonizer.ents)
+    return res
+
+
+def _harmonize_many(harmonizer: OntologyEntHarmonizer) -> dict:
+    status = harmonizer.harmonize_many(ent_terms=ENT_TERMS)
+    res = {
+        ent_term: (
+            status[ent_term],
+            harmonizer.candidates_of(ent_term),
+            harmonizer.ents_of(ent_term),
+        )
+        for ent_term in ENT_TERMS
+    }
+    return res
+
+
+def test_harmonize_many_matches_harmonize(config):
+    expected = _harmonize_each(config)
+    assert [_[0] for _ in expected.values()] == [
+        True,
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert all(len(_[2]) > 0 for _ in expected.values() if _[0])
+    assert any(len(_[2]) < len(_[1]) for _ in expected.values() if _[0])
+    res = _harmonize_many(OntologyEntHarmonizer(config=config))
+    assert res == expected
+
+
+def test_harmonize_many_cached(config, monkeypatch):
+    backend = MemoryCache()
+    expected = _harmonize_many(
+        OntologyEntHarmonizer(config=config, cache=backend)
+    )
+
+    def unreachable(*args, **kwargs):
+        raise AssertionError("not cached")
+
+    monkeypatch.setattr(http_client, "get", unreachable)
+    monkeypatch.setattr(http_client, "post", unreachable)
+    res = _harmonize_many(OntologyEntHarmonizer(config=config, cache=backend))
+    assert res == expected
+    for ent_term, (status, candidates, ents) in expected.items():
+        harmonizer = OntologyEntHarmonizer(config=config, cache=backend)
+        assert (
+            harmonizer.harmonize(ent_id=ent_term, ent_term=ent_term) == status
+        )
+        assert (harmonizer.candidates, harmonizer.ents) == (candidates, ents)
+
+
+class ThreadRecordingCache(CacheBackend):
+    def __init__(self):
+        self.backend = MemoryCache()
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return self.backend.get(key)
+
+    def set(self, key, value):
+        self.threads.add(threading.get_ident())
+        self.backend.set(key, value)
+
+
+def test_aharmonize_cache_off_loop(config, monkeypatch):
+    async def aget(*args, **kwargs):
+        return _neural_get(*args, **kwargs)
+
+    async def apost(*args, **kwargs):
+        return _transformers_post(*args, **kwargs)
+
+    monkeypatch.setattr(http_client, "aget", aget)
+    monkeypatch.setattr(http_client, "apost", apost)
+    expected = _harmonize_each(config)
+    backend = ThreadRecordingCache()
+
+    async def aharmonize_each():
+        res = {}
+        for _ in range(2):
+            for ent_term in ENT_TERMS:
+                harmonizer = OntologyEntHarmonizer(
+                    config=config, cache=backend
+                )
+                status = await harmonizer.aharmonize(
+                    ent_id=ent_term, ent_term=ent_term
+                )
+                res[ent_term] = (
+                    status,
+                    harmonizer.candidates,
+                    harmonizer.ents,
+                )
+        return res
+
+    assert asyncio.run(aharmonize_each()) == expected
+    # NOTE: cache gets and sets run in the executor, not on the loop thread
+    assert len(backend.threads) > 0
+    assert threading.get_ident() not in backend.threads
@@ -1,6 +1,6 @@
 import pandas as pd
-import requests
 
+from .funcs import cypher
 from .types import Config
 
 
@@ -10,21 +10,23 @@ def get_assoc_data_causation(
     query = """
     MATCH (source:Gwas)-[r:MR_EVE_MR]->(target:Gwas)
     WHERE
-        r.pval < {pval}
-        AND source._id IN [{source_id_list}]
-        AND target._id IN [{target_id_list}]
+        r.pval < $pval
+        AND source._id IN $source_ids
+        AND target._id IN $target_ids
     RETURN
         source, r, target
-    """.format(
-        source_id_list=",".join([f"'{_}'" for _ in source_id_list]),
-        target_id_list=",".join([f"'{_}'" for _ in target_id_list]),
-        pval=pval,
+    """
+    cypher_query = cypher.CypherQuery(
+        query=query,
+        params={
+            "source_ids": source_id_list,
+            "target_ids": target_id_list,
+            "pval": pval,
+        },
+        chunk_params=["source_ids", "target_ids"],
     )
-    url = "{url}/cypher".format(url=config.epigraphdb_api_url)
-    data = {"query": query}
-    r = requests.post(url, json=data)
-    r.raise_for_status()
-    res = pd.json_normalize(r.json()["results"])
+    results = cypher.query_cypher(cypher_query, config=config)
+    res = pd.json_normalize(results)
     return res
 
 
@@ -33,19 +35,21 @@ def get_assoc_data_additional(source_id_list, target_id_list, config: Config):
     query = """
     MATCH (source:Gwas)-[r]-(target:Gwas)
     WHERE
-        type(r) IN [{assoc_meta_rels}]
-        AND source._id IN [{source_id_list}]
-        AND target._id IN [{target_id_list}]
+        type(r) IN $assoc_meta_rels
+        AND source._id IN $source_ids
+        AND target._id IN $target_ids
     RETURN
         source, type(r) AS r_type, r, target
-    """.format(
-        source_id_list=",".join([f"'{_}'" for _ in source_id_list]),
-        target_id_list=",".join([f"'{_}'" for _ in target_id_list]),
-        assoc_meta_rels=",".join([f"'{_}'" for _ in assoc_meta_rels]),
+    """
+    cypher_query = cypher.CypherQuery(
+        query=query,
+        params={
+            "source_ids": source_id_list,
+            "target_ids": target_id_list,
+            "assoc_meta_rels": assoc_meta_rels,
+        },
+        chunk_params=["source_ids", "target_ids"],
     )
-    url = "{url}/cypher".format(url=config.epigraphdb_api_url)
-    data = {"query": query}
-    r = requests.post(url, json=data)
-    r.raise_for_status()
-    res = pd.json_normalize(r.json()["results"])
+    results = cypher.query_cypher(cypher_query, config=config)
+    res = pd.json_normalize(results)
     return res
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import pandera as pa
 from loguru import logger
@@ -75,22 +75,93 @@ class AssocEvidenceProcessor:
         pred_term: str,
         pval_threshold: float = params.ASSOC_PVAL_THRESHOLD,
     ) -> bool:
-        assert evidence_type in ALLOWED_EVIDENCE_TYPE
-        assert pred_term in epigraphdb.EPIGRAPHDB_SEMREP_PREDS
-        if pred_term in epigraphdb.EPIGRAPHDB_PRED_GROUP["directional"]:
-            assert evidence_type in DIRECTIONAL_EVIDENCE_TYPE
-        elif pred_term in epigraphdb.EPIGRAPHDB_PRED_GROUP["undirectional"]:
-            assert evidence_type in UNDIRECTIONAL_EVIDENCE_TYPE
-        subject_ids = [_["ent_id"] for _ in subject_ents]
-        object_ids = [_["ent_id"] for _ in object_ents]
+        self._check_args(evidence_type=evidence_type, pred_term=pred_term)
         evidence_df = processing.get_evidence_results(
-            subject_ids=subject_ids,
-            object_ids=object_ids,
+            subject_ids=[_["ent_id"] for _ in subject_ents],
+            object_ids=[_["ent_id"] for _ in object_ents],
             evidence_type=evidence_type,
             pred_term=pred_term,
             pval_threshold=pval_threshold,
             config=self.config,
         )
+        res = self._set_evidence_df(evidence_df)
+        return res
+
+    async def aprocess(
+        self,
+        evidence_type: str,
+        subject_ents: List[ent_types.BaseEnt],
+        object_ents: List[ent_types.BaseEnt],
+        pred_term: str,
+        pval_threshold: float = params.ASSOC_PVAL_THRESHOLD,
+    ) -> bool:
+        self._check_args(evidence_type=evidence_type, pred_term=pred_term)
+        evidence_df = await processing.aget_evidence_results(
+            subject_ids=[_["ent_id"] for _ in subject_ents],
+            object_ids=[_["ent_id"] for _ in object_ents],
+            evidence_type=evidence_type,
+            pred_term=pred_term,
+            pval_threshold=pval_threshold,
+            config=self.config,
+        )
+        res = self._set_evidence_df(evidence_df)
+        return res
+
+    def process_all(
+        self,
+        subject_ents: List[ent_types.BaseEnt],
+        object_ents: List[ent_types.BaseEnt],
+        pred_term: str,
+        pval_threshold: float = params.ASSOC_PVAL_THRESHOLD,
+    ) -> Dict[str, DataFrame[assoc_types.AssocEvidenceDf]]:
+        """Evidence of every evidence type of `pred_term`, by type,
+        with all cypher queries sent concurrently.
+        """
+        evidence_types = self._evidence_types(pred_term)
+        res = processing.get_all_evidence_results(
+            subject_ids=[_["ent_id"] for _ in subject_ents],
+            object_ids=[_["ent_id"] for _ in object_ents],
+            pred_term=pred_term,
+            pval_threshold=pval_threshold,
+            config=self.config,
+            evidence_types=evidence_types,
+        )
+        return res
+
+    async def aprocess_all(
+        self,
+        subject_ents: List[ent_types.BaseEnt],
+        object_ents: List[ent_types.BaseEnt],
+        pred_term: str,
+        pval_threshold: float = params.ASSOC_PVAL_THRESHOLD,
+    ) -> Dict[str, DataFrame[assoc_types.AssocEvidenceDf]]:
+        evidence_types = self._evidence_types(pred_term)
+        res = await processing.aget_all_evidence_results(
+            subject_ids=[_["ent_id"] for _ in subject_ents],
+            object_ids=[_["ent_id"] for _ in object_ents],
+            pred_term=pred_term,
+            pval_threshold=pval_threshold,
+            config=self.config,
+            evidence_types=evidence_types,
+        )
+        return res
+
+    def _evidence_types(self, pred_term: str) -> List[str]:
+        assert pred_term in epigraphdb.EPIGRAPHDB_SEMREP_PREDS
+        res = EVIDENCE_TYPES[epigraphdb.PRED_DIRECTIONAL_MAPPING[pred_term]]
+        return res
+
+    def _check_args(self, evidence_type: str, pred_term: str) -> None:
+        assert evidence_type in ALLOWED_EVIDENCE_TYPE
+        assert pred_term in epigraphdb.EPIGRAPHDB_SEMREP_PREDS
+        if pred_term in epigraphdb.EPIGRAPHDB_PRED_GROUP["directional"]:
+            assert evidence_type in DIRECTIONAL_EVIDENCE_TYPE
+        elif pred_term in epigraphdb.EPIGRAPHDB_PRED_GROUP["undirectional"]:
+            assert evidence_type in UNDIRECTIONAL_EVIDENCE_TYPE
+
+    def _set_evidence_df(
+        self, evidence_df: DataFrame[assoc_types.AssocEvidenceDf]
+    ) -> bool:
         if len(evidence_df) == 0:
             logger.debug("evidence_df is empty")
             return False
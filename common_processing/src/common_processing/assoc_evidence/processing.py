@@ -1,16 +1,51 @@
+import asyncio
 from functools import partial
-from typing import Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 import pandas as pd
 import pandera as pa
-import requests
 from loguru import logger
 from pandera.typing import DataFrame
+from typing_extensions import TypedDict
 
+from ..funcs import cypher, parallel
 from ..resources import epigraphdb
 from ..types import Config, assoc_types
 
 
+class EvidenceQueries(TypedDict):
+    queries: List[cypher.CypherQuery]
+    columns: Dict[str, str]
+    direction: str
+
+
+class EdgeFilter(TypedDict):
+    meta_rel: str
+    # None: either direction
+    forward: Optional[bool]
+    # None: no pval thresholding
+    significant: Optional[bool]
+
+
+class EvidenceEdges(TypedDict):
+    edges: List[EdgeFilter]
+    direction: str
+
+
+FORWARD_COLUMNS = {
+    "source_id": "subject_id",
+    "source_term": "subject_term",
+    "target_id": "object_id",
+    "target_term": "object_term",
+}
+REVERSE_COLUMNS = {
+    "source_id": "object_id",
+    "source_term": "object_term",
+    "target_id": "subject_id",
+    "target_term": "subject_term",
+}
+
+
 def get_evidence_results(
     subject_ids: List[str],
     object_ids: List[str],
@@ -19,31 +54,291 @@ def get_evidence_results(
     pval_threshold: float,
     config: Config,
 ) -> DataFrame[assoc_types.AssocEvidenceDf]:
-    pred_func_maps: Dict[str, Dict[str, Callable]] = {
-        "directional": {
-            "supporting": directional_supporting,
-            "contradictory_directional_type1": directional_contradictory_type1,
-            "contradictory_directional_type2": directional_contradictory_type2,
-            "generic_directional": directional_generic,
-        },
-        "undirectional": {
-            "supporting": undirectional_supporting,
-            "contradictory_undirectional": undirectional_contradictory,
-        },
+    evidence_queries = make_evidence_queries(
+        subject_ids=subject_ids,
+        object_ids=object_ids,
+        evidence_type=evidence_type,
+        pred_term=pred_term,
+        pval_threshold=pval_threshold,
+    )
+    df_list = [
+        _query_cypher(query=_, config=config)
+        for _ in evidence_queries["queries"]
+    ]
+    result_df = _make_evidence_df(
+        df_list=df_list,
+        columns=evidence_queries["columns"],
+        direction=evidence_queries["direction"],
+    )
+    return result_df
+
+
+async def aget_evidence_results(
+    subject_ids: List[str],
+    object_ids: List[str],
+    evidence_type: str,
+    pred_term: str,
+    pval_threshold: float,
+    config: Config,
+) -> DataFrame[assoc_types.AssocEvidenceDf]:
+    """Async `get_evidence_results`, the cypher queries of an evidence type
+    are sent concurrently.
+    """
+    evidence_queries = make_evidence_queries(
+        subject_ids=subject_ids,
+        object_ids=object_ids,
+        evidence_type=evidence_type,
+        pred_term=pred_term,
+        pval_threshold=pval_threshold,
+    )
+    df_list = await asyncio.gather(
+        *[
+            _aquery_cypher(query=_, config=config)
+            for _ in evidence_queries["queries"]
+        ]
+    )
+    result_df = _make_evidence_df(
+        df_list=list(df_list),
+        columns=evidence_queries["columns"],
+        direction=evidence_queries["direction"],
+    )
+    return result_df
+
+
+def get_all_evidence_results(
+    subject_ids: List[str],
+    object_ids: List[str],
+    pred_term: str,
+    pval_threshold: float,
+    config: Config,
+    evidence_types: Optional[List[str]] = None,
+) -> Dict[str, DataFrame[assoc_types.AssocEvidenceDf]]:
+    """Results by evidence type of all `evidence_types`
+    (default: all types of `pred_term`), from a single fetch of the
+    edges between the id sets classified locally.
+    """
+    all_evidence_edges = _make_all_evidence_edges(
+        pred_term=pred_term, evidence_types=evidence_types
+    )
+    edge_dfs = get_assoc_edges(
+        subject_ids=subject_ids,
+        object_ids=object_ids,
+        config=config,
+        meta_rels=_unique_meta_rels(all_evidence_edges),
+    )
+    res = classify_evidence(
+        edge_dfs=edge_dfs,
+        pred_term=pred_term,
+        pval_threshold=pval_threshold,
+        evidence_types=evidence_types,
+    )
+    return res
+
+
+async def aget_all_evidence_results(
+    subject_ids: List[str],
+    object_ids: List[str],
+    pred_term: str,
+    pval_threshold: float,
+    config: Config,
+    evidence_types: Optional[List[str]] = None,
+) -> Dict[str, DataFrame[assoc_types.AssocEvidenceDf]]:
+    """Async `get_all_evidence_results`."""
+    all_evidence_edges = _make_all_evidence_edges(
+        pred_term=pred_term, evidence_types=evidence_types
+    )
+    edge_dfs = await aget_assoc_edges(
+        subject_ids=subject_ids,
+        object_ids=object_ids,
+        config=config,
+        meta_rels=_unique_meta_rels(all_evidence_edges),
+    )
+    res = classify_evidence(
+        edge_dfs=edge_dfs,
+        pred_term=pred_term,
+        pval_threshold=pval_threshold,
+        evidence_types=evidence_types,
+    )
+    return res
+
+
+def get_assoc_edges(
+    subject_ids: List[str],
+    object_ids: List[str],
+    config: Config,
+    meta_rels: Optional[List[str]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """All `meta_rels` (default: MR_EVE_MR, PRS, GEN_COR) edges between
+    the subject and object ids by meta rel, with no pval thresholding,
+    to be classified by `classify_evidence`.
+    """
+    edge_queries = _make_edge_queries(
+        subject_ids=subject_ids, object_ids=object_ids, meta_rels=meta_rels
+    )
+    df_list = parallel.thread_map(
+        partial(_query_cypher, config=config), list(edge_queries.values())
+    )
+    res = _make_edge_dfs(dict(zip(edge_queries.keys(), df_list)))
+    return res
+
+
+async def aget_assoc_edges(
+    subject_ids: List[str],
+    object_ids: List[str],
+    config: Config,
+    meta_rels: Optional[List[str]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """Async `get_assoc_edges`."""
+    edge_queries = _make_edge_queries(
+        subject_ids=subject_ids, object_ids=object_ids, meta_rels=meta_rels
+    )
+    df_list = await asyncio.gather(
+        *[
+            _aquery_cypher(query=_, config=config)
+            for _ in edge_queries.values()
+        ]
+    )
+    res = _make_edge_dfs(dict(zip(edge_queries.keys(), df_list)))
+    return res
+
+
+def classify_evidence(
+    edge_dfs: Dict[str, pd.DataFrame],
+    pred_term: str,
+    pval_threshold: float,
+    evidence_types: Optional[List[str]] = None,
+) -> Dict[str, DataFrame[assoc_types.AssocEvidenceDf]]:
+    """Split the `get_assoc_edges` edges into evidence types,
+    the same results as the per type cypher queries of `EVIDENCE_FUNCS`.
+
+    Thresholds can be changed without querying the edges again.
+    """
+    all_evidence_edges = _make_all_evidence_edges(
+        pred_term=pred_term, evidence_types=evidence_types
+    )
+    res = {
+        evidence_type: _classify_edges(
+            edge_dfs=edge_dfs,
+            evidence_edges=evidence_edges,
+            pval_threshold=pval_threshold,
+        )
+        for evidence_type, evidence_edges in all_evidence_edges.items()
     }
-    if pred_term in ["CAUSES", "TREATS", "AFFECTS"]:
-        pred_term_harmonized = "directional"
-    else:
-        pred_term_harmonized = "undirectional"
+    return res
+
+
+def make_evidence_queries(
+    subject_ids: List[str],
+    object_ids: List[str],
+    evidence_type: str,
+    pred_term: str,
+    pval_threshold: float,
+) -> EvidenceQueries:
     evidence_func = partial(
-        pred_func_maps[pred_term_harmonized][evidence_type],
+        EVIDENCE_FUNCS[_pred_directional_type(pred_term)][evidence_type],
         pval_threshold=pval_threshold,
-        config=config,
     )
-    result_df = evidence_func(
+    res = evidence_func(
         subject_ids=subject_ids,
         object_ids=object_ids,
     )
+    return res
+
+
+def _pred_directional_type(pred_term: str) -> str:
+    if pred_term in ["CAUSES", "TREATS", "AFFECTS"]:
+        res = "directional"
+    else:
+        res = "undirectional"
+    return res
+
+
+def _make_all_evidence_edges(
+    pred_term: str, evidence_types: Optional[List[str]]
+) -> Dict[str, EvidenceEdges]:
+    evidence_edges = EVIDENCE_EDGES[_pred_directional_type(pred_term)]
+    if evidence_types is None:
+        evidence_types = list(evidence_edges)
+    res = {_: evidence_edges[_] for _ in evidence_types}
+    return res
+
+
+def _unique_meta_rels(
+    all_evidence_edges: Dict[str, EvidenceEdges]
+) -> List[str]:
+    res = list(
+        dict.fromkeys(
+            edge_filter["meta_rel"]
+            for evidence_edges in all_evidence_edges.values()
+            for edge_filter in evidence_edges["edges"]
+        )
+    )
+    return res
+
+
+def _make_edge_queries(
+    subject_ids: List[str],
+    object_ids: List[str],
+    meta_rels: Optional[List[str]],
+) -> Dict[str, cypher.CypherQuery]:
+    if meta_rels is None:
+        meta_rels = list(EDGE_TEMPLATES)
+    res = {
+        _: _make_query(
+            query=EDGE_TEMPLATES[_].format(pval_clause=""),
+            source_ids=subject_ids,
+            target_ids=object_ids,
+        )
+        for _ in meta_rels
+    }
+    return res
+
+
+def _make_edge_dfs(
+    query_dfs: Dict[str, pd.DataFrame]
+) -> Dict[str, pd.DataFrame]:
+    res = {}
+    for meta_rel, df in query_dfs.items():
+        if meta_rel == "MR_EVE_MR" and "forward" not in df.columns:
+            # empty results carry no direction column
+            df = df.assign(forward=pd.Series(dtype=bool))
+        res[meta_rel] = df
+    return res
+
+
+def _classify_edges(
+    edge_dfs: Dict[str, pd.DataFrame],
+    evidence_edges: EvidenceEdges,
+    pval_threshold: float,
+) -> DataFrame[assoc_types.AssocEvidenceDf]:
+    df_list = []
+    for edge_filter in evidence_edges["edges"]:
+        df = edge_dfs[edge_filter["meta_rel"]]
+        # NOTE: comparisons against a null pval are false,
+        # as in the cypher pval clauses
+        mask = pd.Series(True, index=df.index)
+        if edge_filter["forward"] is not None:
+            mask &= df["forward"] == edge_filter["forward"]
+        if edge_filter["significant"] is True:
+            mask &= df["pval"] <= pval_threshold
+        elif edge_filter["significant"] is False:
+            mask &= df["pval"] > pval_threshold
+        df_list.append(df.loc[mask].drop(columns=["forward"], errors="ignore"))
+    # source is always bound to the subject ids, see EDGE_TEMPLATES
+    result_df = _make_evidence_df(
+        df_list=df_list,
+        columns=FORWARD_COLUMNS,
+        direction=evidence_edges["direction"],
+    )
+    return result_df
+
+
+def _make_evidence_df(
+    df_list: List[pd.DataFrame], columns: Dict[str, str], direction: str
+) -> DataFrame[assoc_types.AssocEvidenceDf]:
+    result_df = (
+        pd.concat(df_list).rename(columns=columns).assign(direction=direction)
+    )
     logger.info(f"{len(result_df)}")
     logger.info(f"{result_df.groupby('meta_rel').size()}")
     return result_df
@@ -51,13 +346,25 @@ def get_evidence_results(
 
 @pa.check_types
 def _query_cypher(
-    query: str, config: Config
+    query: cypher.CypherQuery, config: Config
+) -> DataFrame[assoc_types.AssocEvidenceQueryDf]:
+    results = cypher.query_cypher(query=query, config=config)
+    res = _make_query_df(results)
+    return res
+
+
+async def _aquery_cypher(
+    query: cypher.CypherQuery, config: Config
+) -> DataFrame[assoc_types.AssocEvidenceQueryDf]:
+    results = await cypher.aquery_cypher(query=query, config=config)
+    res = _make_query_df(results)
+    return res
+
+
+@pa.check_types
+def _make_query_df(
+    results: List[Dict[str, Any]]
 ) -> DataFrame[assoc_types.AssocEvidenceQueryDf]:
-    url = "{url}/cypher".format(url=config.epigraphdb_api_url)
-    data = {"query": query}
-    r = requests.post(url, json=data)
-    r.raise_for_status()
-    results = r.json()["results"]
     if len(results) == 0:
         example_df = assoc_types.AssocEvidenceQueryDf.example(size=1)
         empty_df = example_df.iloc[:0, :].copy()
@@ -66,8 +373,14 @@ def _query_cypher(
     return res
 
 
-def _list_to_str(items: List[str]) -> str:
-    res = ",".join([f"'{_}'" for _ in items])
+def _make_query(
+    query: str, source_ids: List[str], target_ids: List[str], **params
+) -> cypher.CypherQuery:
+    res = cypher.CypherQuery(
+        query=query,
+        params={"source_ids": source_ids, "target_ids": target_ids, **params},
+        chunk_params=["source_ids", "target_ids"],
+    )
     return res
 
 
@@ -75,193 +388,252 @@ def directional_supporting(
     subject_ids: List[str],
     object_ids: List[str],
     pval_threshold: float,
-    config: Config,
     **kwargs,
-):
-    pval_clause_mreve = f"AND r.pval <= {pval_threshold}"
-    mreve_query = epigraphdb.MR_EVE_MR_TEMPLATE.format(
-        source_id_list=_list_to_str(subject_ids),
-        target_id_list=_list_to_str(object_ids),
-        pval_clause=pval_clause_mreve,
-        arrow=">",
-    )
-    df = _query_cypher(query=mreve_query, config=config)
-    result_df = df.rename(
-        columns={
-            "source_id": "subject_id",
-            "source_term": "subject_term",
-            "target_id": "object_id",
-            "target_term": "object_term",
-        }
-    ).assign(direction="forward")
-    return result_df
+) -> EvidenceQueries:
+    pval_clause_mreve = "AND r.pval <= $pval_threshold"
+    mreve_query = _make_query(
+        query=epigraphdb.MR_EVE_MR_TEMPLATE.format(
+            pval_clause=pval_clause_mreve, arrow=">"
+        ),
+        source_ids=subject_ids,
+        target_ids=object_ids,
+        pval_threshold=pval_threshold,
+    )
+    res: EvidenceQueries = {
+        "queries": [mreve_query],
+        "columns": FORWARD_COLUMNS,
+        "direction": "forward",
+    }
+    return res
 
 
 def directional_contradictory_type1(
     subject_ids: List[str],
     object_ids: List[str],
     pval_threshold: float,
-    config: Config,
     **kwargs,
-):
-    pval_clause_mreve = f"AND r.pval <= {pval_threshold}"
-    mreve_query = epigraphdb.MR_EVE_MR_TEMPLATE.format(
-        source_id_list=_list_to_str(object_ids),
-        target_id_list=_list_to_str(subject_ids),
-        pval_clause=pval_clause_mreve,
-        arrow=">",
-    )
-    df = _query_cypher(query=mreve_query, config=config)
-    result_df = df.rename(
-        columns={
-            "source_id": "object_id",
-            "source_term": "object_term",
-            "target_id": "subject_id",
-            "target_term": "subject_term",
-        }
-    ).assign(direction="reverse")
-    return result_df
+) -> EvidenceQueries:
+    pval_clause_mreve = "AND r.pval <= $pval_threshold"
+    mreve_query = _make_query(
+        query=epigraphdb.MR_EVE_MR_TEMPLATE.format(
+            pval_clause=pval_clause_mreve, arrow=">"
+        ),
+        source_ids=object_ids,
+        target_ids=subject_ids,
+        pval_threshold=pval_threshold,
+    )
+    res: EvidenceQueries = {
+        "queries": [mreve_query],
+        "columns": REVERSE_COLUMNS,
+        "direction": "reverse",
+    }
+    return res
 
 
 def directional_contradictory_type2(
     subject_ids: List[str],
     object_ids: List[str],
     pval_threshold: float,
-    config: Config,
     **kwargs,
-):
-    pval_clause_mreve = f"AND r.pval > {pval_threshold}"
-    mreve_query = epigraphdb.MR_EVE_MR_TEMPLATE.format(
-        source_id_list=_list_to_str(subject_ids),
-        target_id_list=_list_to_str(object_ids),
-        pval_clause=pval_clause_mreve,
-        arrow="",
-    )
-    df = _query_cypher(query=mreve_query, config=config)
-    result_df = df.rename(
-        columns={
-            "source_id": "subject_id",
-            "source_term": "subject_term",
-            "target_id": "object_id",
-            "target_term": "object_term",
-        }
-    ).assign(direction="forward")
-    return result_df
+) -> EvidenceQueries:
+    pval_clause_mreve = "AND r.pval > $pval_threshold"
+    mreve_query = _make_query(
+        query=epigraphdb.MR_EVE_MR_TEMPLATE.format(
+            pval_clause=pval_clause_mreve, arrow=""
+        ),
+        source_ids=subject_ids,
+        target_ids=object_ids,
+        pval_threshold=pval_threshold,
+    )
+    res: EvidenceQueries = {
+        "queries": [mreve_query],
+        "columns": FORWARD_COLUMNS,
+        "direction": "forward",
+    }
+    return res
 
 
 def directional_generic(
     subject_ids: List[str],
     object_ids: List[str],
-    config: Config,
     **kwargs,
-):
-    prs_query = epigraphdb.PRS_TEMPLATE.format(
-        source_id_list=_list_to_str(subject_ids),
-        target_id_list=_list_to_str(object_ids),
-        pval_clause="",
-    )
-    prs_df = _query_cypher(query=prs_query, config=config)
-    gen_cor_query = epigraphdb.GEN_COR_TEMPLATE.format(
-        source_id_list=_list_to_str(subject_ids),
-        target_id_list=_list_to_str(object_ids),
-        pval_clause="",
-    )
-    gen_cor_df = _query_cypher(query=gen_cor_query, config=config)
-    df_list = [prs_df, gen_cor_df]
-    result_df = (
-        pd.concat(df_list)
-        .rename(
-            columns={
-                "source_id": "subject_id",
-                "source_term": "subject_term",
-                "target_id": "object_id",
-                "target_term": "object_term",
-            }
-        )
-        .assign(direction="undirectional")
+) -> EvidenceQueries:
+    prs_query = _make_query(
+        query=epigraphdb.PRS_TEMPLATE.format(pval_clause=""),
+        source_ids=subject_ids,
+        target_ids=object_ids,
     )
-    return result_df
+    gen_cor_query = _make_query(
+        query=epigraphdb.GEN_COR_TEMPLATE.format(pval_clause=""),
+        source_ids=subject_ids,
+        target_ids=object_ids,
+    )
+    res: EvidenceQueries = {
+        "queries": [prs_query, gen_cor_query],
+        "columns": FORWARD_COLUMNS,
+        "direction": "undirectional",
+    }
+    return res
 
 
 def undirectional_supporting(
     subject_ids: List[str],
     object_ids: List[str],
     pval_threshold: float,
-    config: Config,
     **kwargs,
-):
-    mreve_query = epigraphdb.MR_EVE_MR_TEMPLATE.format(
-        source_id_list=_list_to_str(subject_ids),
-        target_id_list=_list_to_str(object_ids),
-        pval_clause=f"AND r.pval <= {pval_threshold}",
-        arrow="",
-    )
-    mreve_df = _query_cypher(query=mreve_query, config=config)
-    prs_query = epigraphdb.PRS_TEMPLATE.format(
-        source_id_list=_list_to_str(subject_ids),
-        target_id_list=_list_to_str(object_ids),
-        pval_clause=f"AND r.p <= {pval_threshold}",
-    )
-    prs_df = _query_cypher(query=prs_query, config=config)
-    gen_cor_query = epigraphdb.GEN_COR_TEMPLATE.format(
-        source_id_list=_list_to_str(subject_ids),
-        target_id_list=_list_to_str(object_ids),
-        pval_clause=f"AND r.p <= {pval_threshold}",
-    )
-    gen_cor_df = _query_cypher(query=gen_cor_query, config=config)
-    df_list = [prs_df, gen_cor_df, mreve_df]
-    result_df = (
-        pd.concat(df_list)
-        .rename(
-            columns={
-                "source_id": "subject_id",
-                "source_term": "subject_term",
-                "target_id": "object_id",
-                "target_term": "object_term",
-            }
-        )
-        .assign(direction="undirectional")
+) -> EvidenceQueries:
+    mreve_query = _make_query(
+        query=epigraphdb.MR_EVE_MR_TEMPLATE.format(
+            pval_clause="AND r.pval <= $pval_threshold", arrow=""
+        ),
+        source_ids=subject_ids,
+        target_ids=object_ids,
+        pval_threshold=pval_threshold,
     )
-    return result_df
+    prs_query = _make_query(
+        query=epigraphdb.PRS_TEMPLATE.format(
+            pval_clause="AND r.p <= $pval_threshold"
+        ),
+        source_ids=subject_ids,
+        target_ids=object_ids,
+        pval_threshold=pval_threshold,
+    )
+    gen_cor_query = _make_query(
+        query=epigraphdb.GEN_COR_TEMPLATE.format(
+            pval_clause="AND r.p <= $pval_threshold"
+        ),
+        source_ids=subject_ids,
+        target_ids=object_ids,
+        pval_threshold=pval_threshold,
+    )
+    res: EvidenceQueries = {
+        "queries": [prs_query, gen_cor_query, mreve_query],
+        "columns": FORWARD_COLUMNS,
+        "direction": "undirectional",
+    }
+    return res
 
 
 def undirectional_contradictory(
     subject_ids: List[str],
     object_ids: List[str],
     pval_threshold: float,
-    config: Config,
     **kwargs,
-):
-    mreve_query = epigraphdb.MR_EVE_MR_TEMPLATE.format(
-        source_id_list=_list_to_str(subject_ids),
-        target_id_list=_list_to_str(object_ids),
-        pval_clause=f"AND r.pval > {pval_threshold}",
-        arrow="",
-    )
-    mreve_df = _query_cypher(query=mreve_query, config=config)
-    prs_query = epigraphdb.PRS_TEMPLATE.format(
-        source_id_list=_list_to_str(subject_ids),
-        target_id_list=_list_to_str(object_ids),
-        pval_clause=f"AND r.p > {pval_threshold}",
-    )
-    prs_df = _query_cypher(query=prs_query, config=config)
-    gen_cor_query = epigraphdb.GEN_COR_TEMPLATE.format(
-        source_id_list=_list_to_str(subject_ids),
-        target_id_list=_list_to_str(object_ids),
-        pval_clause=f"AND r.p > {pval_threshold}",
-    )
-    gen_cor_df = _query_cypher(query=gen_cor_query, config=config)
-    df_list = [prs_df, gen_cor_df, mreve_df]
-    result_df = (
-        pd.concat(df_list)
-        .rename(
-            columns={
-                "source_id": "subject_id",
-                "source_term": "subject_term",
-                "target_id": "object_id",
-                "target_term": "object_term",
-            }
-        )
-        .assign(direction="undirectional")
+) -> EvidenceQueries:
+    mreve_query = _make_query(
+        query=epigraphdb.MR_EVE_MR_TEMPLATE.format(
+            pval_clause="AND r.pval > $pval_threshold", arrow=""
+        ),
+        source_ids=subject_ids,
+        target_ids=object_ids,
+        pval_threshold=pval_threshold,
     )
-    return result_df
+    prs_query = _make_query(
+        query=epigraphdb.PRS_TEMPLATE.format(
+            pval_clause="AND r.p > $pval_threshold"
+        ),
+        source_ids=subject_ids,
+        target_ids=object_ids,
+        pval_threshold=pval_threshold,
+    )
+    gen_cor_query = _make_query(
+        query=epigraphdb.GEN_COR_TEMPLATE.format(
+            pval_clause="AND r.p > $pval_threshold"
+        ),
+        source_ids=subject_ids,
+        target_ids=object_ids,
+        pval_threshold=pval_threshold,
+    )
+    res: EvidenceQueries = {
+        "queries": [prs_query, gen_cor_query, mreve_query],
+        "columns": FORWARD_COLUMNS,
+        "direction": "undirectional",
+    }
+    return res
+
+
+EVIDENCE_FUNCS: Dict[str, Dict[str, Callable[..., EvidenceQueries]]] = {
+    "directional": {
+        "supporting": directional_supporting,
+        "contradictory_directional_type1": directional_contradictory_type1,
+        "contradictory_directional_type2": directional_contradictory_type2,
+        "generic_directional": directional_generic,
+    },
+    "undirectional": {
+        "supporting": undirectional_supporting,
+        "contradictory_undirectional": undirectional_contradictory,
+    },
+}
+
+
+EDGE_TEMPLATES: Dict[str, str] = {
+    "MR_EVE_MR": epigraphdb.MR_EVE_MR_EDGES_TEMPLATE,
+    "PRS": epigraphdb.PRS_TEMPLATE,
+    "GEN_COR": epigraphdb.GEN_COR_TEMPLATE,
+}
+
+# local counterparts of EVIDENCE_FUNCS over the get_assoc_edges edges,
+# keep the edge order in line with the order of the queries there
+EVIDENCE_EDGES: Dict[str, Dict[str, EvidenceEdges]] = {
+    "directional": {
+        "supporting": {
+            "edges": [
+                {"meta_rel": "MR_EVE_MR", "forward": True, "significant": True}
+            ],
+            "direction": "forward",
+        },
+        "contradictory_directional_type1": {
+            "edges": [
+                {
+                    "meta_rel": "MR_EVE_MR",
+                    "forward": False,
+                    "significant": True,
+                }
+            ],
+            "direction": "reverse",
+        },
+        "contradictory_directional_type2": {
+            "edges": [
+                {
+                    "meta_rel": "MR_EVE_MR",
+                    "forward": None,
+                    "significant": False,
+                }
+            ],
+            "direction": "forward",
+        },
+        "generic_directional": {
+            "edges": [
+                {"meta_rel": "PRS", "forward": None, "significant": None},
+                {"meta_rel": "GEN_COR", "forward": None, "significant": None},
+            ],
+            "direction": "undirectional",
+        },
+    },
+    "undirectional": {
+        "supporting": {
+            "edges": [
+                {"meta_rel": "PRS", "forward": None, "significant": True},
+                {"meta_rel": "GEN_COR", "forward": None, "significant": True},
+                {
+                    "meta_rel": "MR_EVE_MR",
+                    "forward": None,
+                    "significant": True,
+                },
+            ],
+            "direction": "undirectional",
+        },
+        "contradictory_undirectional": {
+            "edges": [
+                {"meta_rel": "PRS", "forward": None, "significant": False},
+                {"meta_rel": "GEN_COR", "forward": None, "significant": False},
+                {
+                    "meta_rel": "MR_EVE_MR",
+                    "forward": None,
+                    "significant": False,
+                },
+            ],
+            "direction": "undirectional",
+        },
+    },
+}
@@ -2,12 +2,11 @@ from typing import Dict, List, Optional
 
 import pandas as pd
 import pandera as pa
-import requests
 from loguru import logger
 from pandera.typing import DataFrame
 from pydash import py_
 
-from ..funcs import ner
+from ..funcs import http_client, ner
 from ..resources import epigraphdb, semrep_data_dict
 from ..types import Config, semrep_types
 
@@ -16,8 +15,9 @@ def run_semrep(text: str, config: Config) -> List[str]:
     try:
         text = str(text)
         url = config.semrep_api_url
-        r = requests.post(
+        r = http_client.post(
             url=url,
+            service="semrep",
             data=text.encode("utf-8"),
             headers={"Content-Type": "text/plain"},
             # time out in 60s
@@ -0,0 +1,3 @@
+from .graph import EfoGraph, get_efo_graph  # noqa
+from .ic_index import EfoIcIndex, get_efo_ic_index  # noqa
+from .neighbours import EFO_NEIGHBOURS_DB_FILE, lookup_efo_neighbours  # noqa
@@ -0,0 +1,196 @@
+import sqlite3
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+EFO_ROOT_ID = "http://www.ebi.ac.uk/efo/EFO_0000001"
+EFO_GRAPH_FILE = "efo_graph.npz"
+EFO_DB_FILE = "epigraphdb_efo.db"
+
+
+def _make_csr(
+    sources: np.ndarray, targets: np.ndarray, num_nodes: int
+) -> List[np.ndarray]:
+    order = np.argsort(sources, kind="stable")
+    indices = targets[order]
+    indptr = np.concatenate(
+        [[0], np.cumsum(np.bincount(sources, minlength=num_nodes))]
+    ).astype(np.int64)
+    return [indptr, indices]
+
+
+class EfoGraph:
+    """EFO ontology graph as CSR adjacency arrays.
+
+    Follows the `EFO_CHILD_OF` convention of EpiGraphDB,
+    i.e. `(parent)-[:EFO_CHILD_OF]->(child)`,
+    out edges lead to children and in edges lead to parents.
+    `depth` and `root_pred` (predecessor on a shortest path from
+    the root) are precomputed by a breadth first search from the root.
+    """
+
+    def __init__(
+        self,
+        ent_ids: np.ndarray,
+        ent_terms: np.ndarray,
+        out_indptr: np.ndarray,
+        out_indices: np.ndarray,
+        in_indptr: np.ndarray,
+        in_indices: np.ndarray,
+        depth: np.ndarray,
+        root_pred: np.ndarray,
+    ):
+        self.ent_ids = ent_ids
+        self.ent_terms = ent_terms
+        self.out_indptr = out_indptr
+        self.out_indices = out_indices
+        self.in_indptr = in_indptr
+        self.in_indices = in_indices
+        self.depth = depth
+        self.root_pred = root_pred
+        self._row_idx = {ent_id: idx for idx, ent_id in enumerate(ent_ids)}
+
+    @classmethod
+    def from_edges(
+        cls,
+        ent_ids: List[str],
+        ent_terms: List[str],
+        parent_ids: List[str],
+        child_ids: List[str],
+        root_id: str = EFO_ROOT_ID,
+    ) -> "EfoGraph":
+        row_idx = {ent_id: idx for idx, ent_id in enumerate(ent_ids)}
+        edges = [
+            (row_idx[parent], row_idx[child])
+            for parent, child in zip(parent_ids, child_ids)
+            if parent in row_idx and child in row_idx
+        ]
+        sources = np.array([_[0] for _ in edges], dtype=np.int64)
+        targets = np.array([_[1] for _ in edges], dtype=np.int64)
+        num_nodes = len(ent_ids)
+        out_indptr, out_indices = _make_csr(sources, targets, num_nodes)
+        in_indptr, in_indices = _make_csr(targets, sources, num_nodes)
+        depth = np.full(num_nodes, -1, dtype=np.int64)
+        root_pred = np.full(num_nodes, -1, dtype=np.int64)
+        root_idx = row_idx.get(root_id)
+        if root_idx is not None:
+            depth[root_idx] = 0
+            queue = deque([root_idx])
+            while len(queue) > 0:
+                node = queue.popleft()
+                children = out_indices[out_indptr[node] : out_indptr[node + 1]]
+                for child in children:
+                    if depth[child] < 0:
+                        depth[child] = depth[node] + 1
+                        root_pred[child] = node
+                        queue.append(child)
+        else:
+            logger.warning(f"root {root_id} not in efo graph")
+        res = cls(
+            ent_ids=np.array(ent_ids, dtype=str),
+            ent_terms=np.array(ent_terms, dtype=str),
+            out_indptr=out_indptr,
+            out_indices=out_indices,
+            in_indptr=in_indptr,
+            in_indices=in_indices,
+            depth=depth,
+            root_pred=root_pred,
+        )
+        return res
+
+    @classmethod
+    def from_sqlite(cls, db_path: Path) -> "EfoGraph":
+        """Build from the NODES and RELS tables of `epigraphdb_efo.db`."""
+        logger.info(f"Build efo graph from {db_path}")
+        with sqlite3.connect(db_path) as conn:
+            nodes_df = pd.read_sql(
+                'SELECT "efo._id", "efo._name" FROM NODES', conn
+            )
+            rels_df = pd.read_sql(
+                'SELECT "efo.id", "parent_efo.id" FROM RELS', conn
+            )
+        nodes_df = nodes_df.drop_duplicates(subset=["efo._id"])
+        # NOTE: `efo` is the source of EFO_CHILD_OF, i.e. the parent
+        res = cls.from_edges(
+            ent_ids=nodes_df["efo._id"].tolist(),
+            ent_terms=nodes_df["efo._name"].tolist(),
+            parent_ids=rels_df["efo.id"].tolist(),
+            child_ids=rels_df["parent_efo.id"].tolist(),
+        )
+        return res
+
+    @classmethod
+    def load(cls, path: Path) -> "EfoGraph":
+        logger.info(f"Load efo graph from {path}")
+        with np.load(path) as data:
+            res = cls(**{k: data[k] for k in data.files})
+        return res
+
+    def save(self, path: Path) -> None:
+        np.savez(
+            path,
+            ent_ids=self.ent_ids,
+            ent_terms=self.ent_terms,
+            out_indptr=self.out_indptr,
+            out_indices=self.out_indices,
+            in_indptr=self.in_indptr,
+            in_indices=self.in_indices,
+            depth=self.depth,
+            root_pred=self.root_pred,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ent_ids)
+
+    def __contains__(self, ent_id: str) -> bool:
+        return ent_id in self._row_idx
+
+    def term_of(self, ent_id: str) -> str:
+        return str(self.ent_terms[self._row_idx[ent_id]])
+
+    def parents(self, ent_id: str, limit: Optional[int] = None) -> List[str]:
+        idx = self._row_idx.get(ent_id)
+        if idx is None:
+            return []
+        rows = self.in_indices[self.in_indptr[idx] : self.in_indptr[idx + 1]]
+        return self.ent_ids[rows[:limit]].tolist()
+
+    def children(self, ent_id: str, limit: Optional[int] = None) -> List[str]:
+        idx = self._row_idx.get(ent_id)
+        if idx is None:
+            return []
+        rows = self.out_indices[
+            self.out_indptr[idx] : self.out_indptr[idx + 1]
+        ]
+        return self.ent_ids[rows[:limit]].tolist()
+
+    def root_path(self, ent_id: str) -> List[str]:
+        """Nodes on a shortest path from the root to `ent_id`
+        (both inclusive), empty when unreachable.
+        """
+        idx = self._row_idx.get(ent_id)
+        if idx is None or self.depth[idx] < 0:
+            return []
+        rows = [idx]
+        while self.root_pred[rows[-1]] >= 0:
+            rows.append(self.root_pred[rows[-1]])
+        return self.ent_ids[rows[::-1]].tolist()
+
+
+@lru_cache(maxsize=None)
+def get_efo_graph(data_dir: Path) -> EfoGraph:
+    """Per-process EfoGraph, from the precomputed `efo_graph.npz`
+    when available, otherwise built from `epigraphdb_efo.db`.
+    """
+    graph_path = data_dir / EFO_GRAPH_FILE
+    if graph_path.exists():
+        return EfoGraph.load(graph_path)
+    db_path = data_dir / EFO_DB_FILE
+    if not db_path.exists():
+        raise FileNotFoundError(f"Neither {graph_path} nor {db_path} exists")
+    return EfoGraph.from_sqlite(db_path)
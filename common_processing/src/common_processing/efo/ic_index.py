@@ -0,0 +1,71 @@
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+
+class EfoIcIndex:
+    """In-memory index of EFO information content scores,
+    loaded once per process from the IC table of `epigraphdb_efo.db`.
+    """
+
+    def __init__(
+        self,
+        ent_ids: np.ndarray,
+        ent_terms: np.ndarray,
+        ic_scores: np.ndarray,
+    ):
+        self.ent_ids = ent_ids
+        self.ent_terms = ent_terms
+        self.ic_scores = ic_scores
+        self._row_idx = {ent_id: idx for idx, ent_id in enumerate(ent_ids)}
+
+    @classmethod
+    def from_sqlite(cls, db_path: Path) -> "EfoIcIndex":
+        logger.info(f"Load efo ic index from {db_path}")
+        with sqlite3.connect(db_path) as conn:
+            rows = conn.execute(
+                "SELECT efo_id, efo_term, ic_score FROM IC"
+            ).fetchall()
+        res = cls(
+            ent_ids=np.array([_[0] for _ in rows], dtype=object),
+            ent_terms=np.array([_[1] for _ in rows], dtype=object),
+            ic_scores=np.array([_[2] for _ in rows], dtype=np.float64),
+        )
+        return res
+
+    def __len__(self) -> int:
+        return len(self.ent_ids)
+
+    def rows(self, ent_ids: List[str]) -> np.ndarray:
+        """Row indices of `ent_ids`, -1 for ids not in the index."""
+        res = np.array(
+            [self._row_idx.get(_, -1) for _ in ent_ids], dtype=np.int64
+        )
+        return res
+
+    def lookup(
+        self, ent_ids: List[str], ic_score_threshold: Optional[float] = None
+    ) -> pd.DataFrame:
+        rows = self.rows(list(dict.fromkeys(ent_ids)))
+        rows = rows[rows >= 0]
+        if ic_score_threshold is not None:
+            rows = rows[self.ic_scores[rows] > ic_score_threshold]
+        res = pd.DataFrame(
+            {
+                "ent_term": self.ent_terms[rows].astype(str),
+                "ent_id": self.ent_ids[rows].astype(str),
+                "ic_score": self.ic_scores[rows],
+            }
+        )
+        return res
+
+
+@lru_cache(maxsize=None)
+def get_efo_ic_index(db_path: Path) -> EfoIcIndex:
+    """Per-process EfoIcIndex, the sqlite db is only read on a cold start."""
+    return EfoIcIndex.from_sqlite(db_path)
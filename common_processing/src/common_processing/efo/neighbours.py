@@ -0,0 +1,46 @@
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+EFO_NEIGHBOURS_DB_FILE = "efo_neighbours.db"
+EFO_NEIGHBOURS_TABLE = "EFO_NEIGHBOURS"
+EFO_NEIGHBOURS_META_NODES = ["Gwas", "Literatureterm"]
+# NOTE: neighbours stored per efo node and meta node,
+# lookups with a larger limit go to the neural service
+EFO_NEIGHBOURS_LIMIT = 50
+
+
+def lookup_efo_neighbours(
+    db_path: Path, efo_id: str, meta_node: str, limit: int
+) -> Optional[List[Dict[str, Any]]]:
+    """Precomputed top `limit` `meta_node` neighbours of an efo node
+    in the neural service `/query/entity` result format,
+    None when they are not in the table.
+    """
+    if limit > EFO_NEIGHBOURS_LIMIT:
+        return None
+    query = """
+    SELECT ent_id, ent_term, text, score FROM {table}
+    WHERE efo_id = ? AND meta_node = ?
+    ORDER BY rank
+    LIMIT ?
+    """.format(
+        table=EFO_NEIGHBOURS_TABLE
+    )
+    # NOTE: the connection context manager only commits, close explicitly
+    with closing(sqlite3.connect(db_path)) as conn:
+        rows = conn.execute(query, (efo_id, meta_node, limit)).fetchall()
+    if len(rows) == 0:
+        return None
+    res = [
+        {
+            "id": ent_id,
+            "name": ent_term,
+            "text": text,
+            "score": score,
+            "meta_node": meta_node,
+        }
+        for ent_id, ent_term, text, score in rows
+    ]
+    return res
@@ -1,3 +1,5 @@
+from .cache import make_harmonization_cache  # noqa
+from .embedding_index import EmbeddingIndex, get_embedding_index  # noqa
 from .ontology_harmonizer import OntologyEntHarmonizer  # noqa
 from .phenotype_harmonizer import PhenotypeEntHarmonizer  # noqa
 from .umls_harmonizer import UmlsEntHarmonizer  # noqa
@@ -0,0 +1,100 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from ..funcs.cache import CacheBackend, make_tiered_cache
+from ..types import ent_types
+
+# NOTE: harmonization results change with the EpiGraphDB data release,
+# bump this to invalidate all existing entries
+CACHE_VERSION = "1"
+DEFAULT_TTL = 30 * 24 * 60 * 60  # 30 days
+
+
+def make_harmonization_cache(
+    path: Optional[Path] = None,
+    redis_url: Optional[str] = None,
+    ttl: Optional[float] = DEFAULT_TTL,
+    max_entries: int = 100_000,
+) -> CacheBackend:
+    res = make_tiered_cache(
+        path=path, redis_url=redis_url, ttl=ttl, max_entries=max_entries
+    )
+    return res
+
+
+def normalize_term(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+def make_cache_key(kind: str, ent_term: str, **params) -> str:
+    """Key by harmonizer kind, normalized term, and harmonization params."""
+    payload = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "term": normalize_term(ent_term),
+            "params": params,
+        },
+        sort_keys=True,
+    )
+    digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    res = f"ent_harmonization:{kind}:{digest}"
+    return res
+
+
+def ents_key_param(ents: List[ent_types.BaseEnt]) -> List[List[str]]:
+    res = sorted([[_["ent_id"], _["ent_term"]] for _ in ents])
+    return res
+
+
+def dump_dfs(dfs: Dict[str, Optional[pd.DataFrame]]) -> Dict[str, Any]:
+    res = {
+        k: {
+            "columns": v.columns.tolist(),
+            "dtypes": [str(_) for _ in v.dtypes],
+            "data": v.values.tolist(),
+        }
+        if v is not None
+        else None
+        for k, v in dfs.items()
+    }
+    return res
+
+
+def load_dfs(data: Dict[str, Any]) -> Dict[str, Optional[pd.DataFrame]]:
+    res = {
+        k: pd.DataFrame(v["data"], columns=v["columns"]).astype(
+            dict(zip(v["columns"], v["dtypes"]))
+        )
+        if v is not None
+        else None
+        for k, v in data.items()
+    }
+    return res
+
+
+def get_results(
+    backend: Optional[CacheBackend], key: str
+) -> Optional[Dict[str, Any]]:
+    """Cached harmonization results, {"status": bool, "dfs": {...}}"""
+    if backend is None:
+        return None
+    value = backend.get(key)
+    if value is None:
+        return None
+    res = {"status": value["status"], "dfs": load_dfs(value["dfs"])}
+    return res
+
+
+def set_results(
+    backend: Optional[CacheBackend],
+    key: str,
+    status: bool,
+    dfs: Dict[str, Optional[pd.DataFrame]] = {},
+) -> None:
+    if backend is None:
+        return None
+    backend.set(key, {"status": status, "dfs": dump_dfs(dfs)})
@@ -0,0 +1,139 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+EMBEDDING_META_NODES = ["Efo", "Gwas", "Literatureterm"]
+# NOTE: number of matrix rows per matmul block in `search`
+SEARCH_BLOCK_SIZE = 65_536
+
+
+class EmbeddingIndex:
+    """Local counterpart of the neural service `/query/entity` search
+    over exported embedding matrices.
+
+    Per meta node, `{meta_node}_vectors.npy` holds the L2 normalized
+    embeddings (float32 or float16, memory-mapped) and
+    `{meta_node}_ents.npz` the `ent_ids` / `ent_terms` of the rows.
+    Scores are cosine similarities from a blocked matmul top-k.
+    Text queries need the encoder model and stay with the neural service.
+    """
+
+    def __init__(
+        self,
+        vectors: Dict[str, np.ndarray],
+        ent_ids: Dict[str, np.ndarray],
+        ent_terms: Dict[str, np.ndarray],
+    ):
+        self.vectors = vectors
+        self.ent_ids = ent_ids
+        self.ent_terms = ent_terms
+        self._row_idx = {
+            meta_node: {ent_id: idx for idx, ent_id in enumerate(ids)}
+            for meta_node, ids in ent_ids.items()
+        }
+
+    @classmethod
+    def from_dir(cls, path: Path) -> "EmbeddingIndex":
+        logger.info(f"Load embedding index from {path}")
+        vectors, ent_ids, ent_terms = {}, {}, {}
+        for meta_node in EMBEDDING_META_NODES:
+            vectors_file = path / f"{meta_node}_vectors.npy"
+            if not vectors_file.exists():
+                continue
+            vectors[meta_node] = np.load(vectors_file, mmap_mode="r")
+            with np.load(path / f"{meta_node}_ents.npz") as data:
+                ent_ids[meta_node] = data["ent_ids"]
+                ent_terms[meta_node] = data["ent_terms"]
+        res = cls(vectors=vectors, ent_ids=ent_ids, ent_terms=ent_terms)
+        return res
+
+    def to_dir(self, path: Path) -> None:
+        path.mkdir(parents=True, exist_ok=True)
+        for meta_node, vectors in self.vectors.items():
+            np.save(path / f"{meta_node}_vectors.npy", vectors)
+            np.savez(
+                path / f"{meta_node}_ents.npz",
+                ent_ids=np.asarray(self.ent_ids[meta_node], dtype=str),
+                ent_terms=np.asarray(self.ent_terms[meta_node], dtype=str),
+            )
+
+    def query_entity(
+        self,
+        entity_id: str,
+        meta_node: str,
+        include_meta_nodes: List[str],
+        limit: int,
+        **kwargs,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """None when the entity or any of `include_meta_nodes`
+        is not in the index.
+        """
+        if meta_node not in self.vectors:
+            return None
+        # NOTE: partial exports, the neural service has all meta nodes
+        if any(_ not in self.vectors for _ in include_meta_nodes):
+            return None
+        row = self._row_idx[meta_node].get(entity_id)
+        if row is None:
+            return None
+        query = np.asarray(self.vectors[meta_node][row], dtype=np.float32)
+        res = self.search(
+            query=query, meta_nodes=include_meta_nodes, limit=limit
+        )
+        return res
+
+    def search(
+        self, query: np.ndarray, meta_nodes: List[str], limit: int
+    ) -> List[Dict[str, Any]]:
+        """Top `limit` rows across `meta_nodes` in the neural service
+        result format, by descending score.
+        """
+        candidates: List[Dict[str, Any]] = []
+        for meta_node in meta_nodes:
+            rows, scores = _top_k(
+                matrix=self.vectors[meta_node], query=query, limit=limit
+            )
+            candidates.extend(
+                [
+                    {
+                        "id": str(self.ent_ids[meta_node][row]),
+                        "name": str(self.ent_terms[meta_node][row]),
+                        "text": str(self.ent_terms[meta_node][row]),
+                        "score": float(score),
+                        "meta_node": meta_node,
+                    }
+                    for row, score in zip(rows, scores)
+                ]
+            )
+        res = sorted(candidates, key=lambda _: -_["score"])[:limit]
+        return res
+
+
+def _top_k(matrix: np.ndarray, query: np.ndarray, limit: int):
+    best_rows = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0, dtype=np.float32)
+    for start in range(0, len(matrix), SEARCH_BLOCK_SIZE):
+        block = np.asarray(
+            matrix[start : start + SEARCH_BLOCK_SIZE], dtype=np.float32
+        )
+        scores = block @ query
+        k = min(limit, len(scores))
+        if k == 0:
+            continue
+        rows = np.argpartition(-scores, k - 1)[:k]
+        best_rows = np.concatenate([best_rows, rows + start])
+        best_scores = np.concatenate([best_scores, scores[rows]])
+        if len(best_rows) > limit:
+            keep = np.argpartition(-best_scores, limit - 1)[:limit]
+            best_rows, best_scores = best_rows[keep], best_scores[keep]
+    order = np.argsort(-best_scores, kind="stable")
+    return best_rows[order], best_scores[order]
+
+
+@lru_cache(maxsize=None)
+def get_embedding_index(path: Path) -> EmbeddingIndex:
+    """Per-process EmbeddingIndex, the matrices are memory-mapped."""
+    return EmbeddingIndex.from_dir(path)
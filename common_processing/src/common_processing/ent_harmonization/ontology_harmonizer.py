@@ -1,20 +1,24 @@
-from typing import List, Optional
+import asyncio
+from functools import partial
+from typing import Dict, List, Optional
 
 import pandera as pa
 from pandera.typing import DataFrame
 from pydantic import validate_arguments
 
+from ..funcs.cache import CacheBackend
 from ..settings import params
 from ..types import Config, ent_types
-from . import processing
+from . import cache, processing
 
 from icecream import ic  # noqa
 
 
 class OntologyEntHarmonizer:
-    @validate_arguments
-    def __init__(self, config: Config):
+    @validate_arguments(config=dict(arbitrary_types_allowed=True))
+    def __init__(self, config: Config, cache: Optional[CacheBackend] = None):
         self.config = config
+        self.cache = cache
         self.reset()
 
     def reset(self):
@@ -29,6 +33,11 @@ class OntologyEntHarmonizer:
         self._identity_scores_df: Optional[
             DataFrame[processing.IdentityScoresDf]
         ] = None
+        # results of `harmonize_many`, keyed by ent_term
+        self._batch_candidates_df: Dict[
+            str, DataFrame[ent_types.OntologyEntDf]
+        ] = {}
+        self._batch_ents_df: Dict[str, DataFrame[ent_types.OntologyEntDf]] = {}
 
     @property  # type: ignore
     @pa.check_types
@@ -70,6 +79,16 @@ class OntologyEntHarmonizer:
         ic_score_threshold: float = params.IC_THRESHOLD_EFO,
         identity_score_threshold: float = params.IDENTITY_THRESHOLD,
     ) -> bool:
+        cache_key = self._cache_key(
+            ent_term=ent_term,
+            similarity_score_threshold=similarity_score_threshold,
+            num_similarity_candidates=num_similarity_candidates,
+            ic_score_threshold=ic_score_threshold,
+            identity_score_threshold=identity_score_threshold,
+        )
+        cached_status = self._load_cached(cache_key)
+        if cached_status is not None:
+            return cached_status
         similarity_scores_df = processing.efo_similarity_candidates(
             term=ent_term,
             limit=num_similarity_candidates,
@@ -77,6 +96,7 @@ class OntologyEntHarmonizer:
             config=self.config,
         )
         if similarity_scores_df is None:
+            cache.set_results(self.cache, cache_key, status=False)
             return False
         ic_scores_df = processing.efo_ic_scores(
             ent_ids=similarity_scores_df["ent_id"].tolist(),
@@ -90,37 +110,259 @@ class OntologyEntHarmonizer:
             ),
             config=self.config,
         )
-        identity_valid = identity_scores_df[
-            identity_scores_df.apply(
-                lambda row: abs(row["identity_score"])
-                <= identity_score_threshold,
-                axis=1,
+        self._make_results(
+            cache_key=cache_key,
+            similarity_scores_df=similarity_scores_df,
+            ic_scores_df=ic_scores_df,
+            identity_scores_df=identity_scores_df,
+            identity_score_threshold=identity_score_threshold,
+        )
+        return True
+
+    @validate_arguments
+    async def aharmonize(
+        self,
+        ent_id: str,
+        ent_term: str,
+        similarity_score_threshold: float = params.SIM_THRESHOLD_EFO,
+        num_similarity_candidates: int = params.NUM_SIMILARITY_CANDIDATES_EFO,
+        ic_score_threshold: float = params.IC_THRESHOLD_EFO,
+        identity_score_threshold: float = params.IDENTITY_THRESHOLD,
+    ) -> bool:
+        """Async `harmonize`, upstream requests do not block the event loop."""
+        cache_key = self._cache_key(
+            ent_term=ent_term,
+            similarity_score_threshold=similarity_score_threshold,
+            num_similarity_candidates=num_similarity_candidates,
+            ic_score_threshold=ic_score_threshold,
+            identity_score_threshold=identity_score_threshold,
+        )
+        # NOTE: cache tiers past memory are blocking, keep them off the loop
+        loop = asyncio.get_event_loop()
+        cached_status = await loop.run_in_executor(
+            None, partial(self._load_cached, cache_key)
+        )
+        if cached_status is not None:
+            return cached_status
+        similarity_scores_df = await processing.aefo_similarity_candidates(
+            term=ent_term,
+            limit=num_similarity_candidates,
+            similarity_score_threshold=similarity_score_threshold,
+            config=self.config,
+        )
+        if similarity_scores_df is None:
+            await loop.run_in_executor(
+                None,
+                partial(
+                    cache.set_results, self.cache, cache_key, status=False
+                ),
             )
-        ]
-        candidates_df = identity_scores_df.merge(
-            ic_scores_df,
-            left_on=["ent_id", "ent_term"],
-            right_on=["ent_id", "ent_term"],
-        ).merge(
-            similarity_scores_df,
-            left_on=["ent_id", "ent_term"],
-            right_on=["ent_id", "ent_term"],
-        )[
-            [
-                "ent_id",
-                "ent_term",
-                "similarity_score",
-                "ic_score",
-                "identity_score",
-            ]
-        ]
-        ents_df = candidates_df[
-            candidates_df["ent_id"].isin(identity_valid["ent_id"])
-        ]
+            return False
+        ic_scores_df = processing.efo_ic_scores(
+            ent_ids=similarity_scores_df["ent_id"].tolist(),
+            ic_score_threshold=ic_score_threshold,
+            config=self.config,
+        )
+        identity_scores_df = await processing.aefo_identity_scores(
+            reference_term=ent_term,
+            ents=ic_scores_df[["ent_id", "ent_term"]].to_dict(
+                orient="records"
+            ),
+            config=self.config,
+        )
+        await loop.run_in_executor(
+            None,
+            partial(
+                self._make_results,
+                cache_key=cache_key,
+                similarity_scores_df=similarity_scores_df,
+                ic_scores_df=ic_scores_df,
+                identity_scores_df=identity_scores_df,
+                identity_score_threshold=identity_score_threshold,
+            ),
+        )
+        return True
+
+    def _cache_key(self, ent_term: str, **params) -> str:
+        res = cache.make_cache_key("ontology", ent_term=ent_term, **params)
+        return res
+
+    def _load_cached(self, cache_key: str) -> Optional[bool]:
+        cached = cache.get_results(self.cache, cache_key)
+        if cached is None:
+            return None
+        if cached["status"]:
+            self._set_results(**cached["dfs"])
+        return cached["status"]
+
+    def _make_results(
+        self,
+        cache_key: str,
+        similarity_scores_df: DataFrame[processing.SimilarityScoresDf],
+        ic_scores_df: DataFrame[processing.IcScoresDf],
+        identity_scores_df: DataFrame[processing.IdentityScoresDf],
+        identity_score_threshold: float,
+    ):
+        candidates_df, ents_df = processing.make_efo_candidates(
+            similarity_scores_df=similarity_scores_df,
+            ic_scores_df=ic_scores_df,
+            identity_scores_df=identity_scores_df,
+            identity_score_threshold=identity_score_threshold,
+        )
+        cache.set_results(
+            self.cache,
+            cache_key,
+            status=True,
+            dfs={
+                "similarity_scores_df": similarity_scores_df,
+                "ic_scores_df": ic_scores_df,
+                "identity_scores_df": identity_scores_df,
+                "candidates_df": candidates_df,
+                "ents_df": ents_df,
+            },
+        )
+        self._set_results(
+            similarity_scores_df=similarity_scores_df,
+            ic_scores_df=ic_scores_df,
+            identity_scores_df=identity_scores_df,
+            candidates_df=candidates_df,
+            ents_df=ents_df,
+        )
+
+    def _set_results(
+        self,
+        similarity_scores_df: DataFrame[processing.SimilarityScoresDf],
+        ic_scores_df: DataFrame[processing.IcScoresDf],
+        identity_scores_df: DataFrame[processing.IdentityScoresDf],
+        candidates_df: DataFrame[ent_types.OntologyEntDf],
+        ents_df: DataFrame[ent_types.OntologyEntDf],
+    ):
         # NOTE: this is for type inferencing
         self._similarity_scores_df = similarity_scores_df
         self._ic_scores_df = ic_scores_df
         self._identity_scores_df = identity_scores_df
         self._candidates_df = candidates_df
         self._ents_df = ents_df
-        return True
+
+    @validate_arguments
+    def harmonize_many(
+        self,
+        ent_terms: List[str],
+        similarity_score_threshold: float = params.SIM_THRESHOLD_EFO,
+        num_similarity_candidates: int = params.NUM_SIMILARITY_CANDIDATES_EFO,
+        ic_score_threshold: float = params.IC_THRESHOLD_EFO,
+        identity_score_threshold: float = params.IDENTITY_THRESHOLD,
+    ) -> Dict[str, bool]:
+        """Batched `harmonize` over a list of terms.
+
+        Unique terms are queried for similarity candidates concurrently,
+        ic scores are looked up once for the union of candidates,
+        and identity scores are sent to the transformers service in batches.
+
+        Returns harmonization status by term,
+        use `candidates_of` / `ents_of` to retrieve results.
+        """
+        status: Dict[str, bool] = {}
+        cache_keys: Dict[str, str] = {}
+        for term in dict.fromkeys(ent_terms):
+            cache_keys[term] = self._cache_key(
+                ent_term=term,
+                similarity_score_threshold=similarity_score_threshold,
+                num_similarity_candidates=num_similarity_candidates,
+                ic_score_threshold=ic_score_threshold,
+                identity_score_threshold=identity_score_threshold,
+            )
+            cached = cache.get_results(self.cache, cache_keys[term])
+            if cached is not None:
+                status[term] = cached["status"]
+                if cached["status"]:
+                    self._batch_candidates_df[term] = cached["dfs"][
+                        "candidates_df"
+                    ]
+                    self._batch_ents_df[term] = cached["dfs"]["ents_df"]
+        terms = [_ for _ in cache_keys.keys() if _ not in status.keys()]
+        if len(terms) == 0:
+            return status
+        similarity_scores = processing.efo_similarity_candidates_many(
+            terms=terms,
+            limit=num_similarity_candidates,
+            similarity_score_threshold=similarity_score_threshold,
+            config=self.config,
+        )
+        valid_similarity_scores = {
+            k: v for k, v in similarity_scores.items() if v is not None
+        }
+        for term in terms:
+            status[term] = term in valid_similarity_scores.keys()
+            if not status[term]:
+                cache.set_results(self.cache, cache_keys[term], status=False)
+        if len(valid_similarity_scores) == 0:
+            return status
+        candidate_ids = list(
+            dict.fromkeys(
+                [
+                    ent_id
+                    for df in valid_similarity_scores.values()
+                    for ent_id in df["ent_id"].tolist()
+                ]
+            )
+        )
+        ic_scores_df = processing.efo_ic_scores(
+            ent_ids=candidate_ids,
+            ic_score_threshold=ic_score_threshold,
+            config=self.config,
+        )
+        # NOTE: in the similarity order of each term, as in `harmonize`
+        ic_scores_by_term = {
+            term: df[["ent_id"]]
+            .drop_duplicates()
+            .merge(ic_scores_df, on="ent_id")
+            for term, df in valid_similarity_scores.items()
+        }
+        identity_scores_df = processing.efo_identity_scores_many(
+            reference_ents=[
+                (term, ent)
+                for term, df in ic_scores_by_term.items()
+                for ent in df[["ent_id", "ent_term"]].to_dict(orient="records")
+            ],
+            config=self.config,
+        )
+        for term, similarity_scores_df in valid_similarity_scores.items():
+            term_identity_scores_df = identity_scores_df[
+                identity_scores_df["reference_term"] == term
+            ][["ent_id", "ent_term", "identity_score"]]
+            candidates_df, ents_df = processing.make_efo_candidates(
+                similarity_scores_df=similarity_scores_df,
+                ic_scores_df=ic_scores_by_term[term],
+                identity_scores_df=term_identity_scores_df,
+                identity_score_threshold=identity_score_threshold,
+            )
+            cache.set_results(
+                self.cache,
+                cache_keys[term],
+                status=True,
+                dfs={
+                    "similarity_scores_df": similarity_scores_df,
+                    "ic_scores_df": ic_scores_by_term[term],
+                    "identity_scores_df": term_identity_scores_df,
+                    "candidates_df": candidates_df,
+                    "ents_df": ents_df,
+                },
+            )
+            self._batch_candidates_df[term] = candidates_df
+            self._batch_ents_df[term] = ents_df
+        return status
+
+    def candidates_of(self, ent_term: str) -> List[ent_types.OntologyEnt]:
+        df = self._batch_candidates_df.get(ent_term)
+        if df is None:
+            return []
+        res: List[ent_types.OntologyEnt] = df.to_dict(orient="records")
+        return res
+
+    def ents_of(self, ent_term: str) -> List[ent_types.OntologyEnt]:
+        df = self._batch_ents_df.get(ent_term)
+        if df is None:
+            return []
+        res: List[ent_types.OntologyEnt] = df.to_dict(orient="records")
+        return res
@@ -1,3 +1,4 @@
+import asyncio
 from functools import partial
 from typing import Callable, Dict, List, Optional, Tuple
 
@@ -6,11 +7,12 @@ import pandera as pa
 from pandera.typing import DataFrame
 from pydantic import validate_arguments
 
-from ..funcs import ent_filters
+from ..funcs import ent_filters, parallel
 from ..resources import epigraphdb
+from ..funcs.cache import CacheBackend
 from ..settings import params
 from ..types import Config, ent_types
-from . import processing
+from . import cache, processing
 
 from icecream import ic  # noqa
 
@@ -27,9 +29,10 @@ filter_funcs: Dict[str, List[Callable]] = {
 
 
 class PhenotypeEntHarmonizer:
-    @validate_arguments
-    def __init__(self, config: Config):
+    @validate_arguments(config=dict(arbitrary_types_allowed=True))
+    def __init__(self, config: Config, cache: Optional[CacheBackend] = None):
         self.config = config
+        self.cache = cache
         self.reset()
 
     def reset(self):
@@ -63,23 +66,162 @@ class PhenotypeEntHarmonizer:
         similarity_score_threshold: float = params.SIM_THRESHOLD_TRAIT,
         verbose: bool = True,
     ) -> bool:
-        sim_scores = [
+        cache_key = self._cache_key(
+            ontology_ents=ontology_ents,
+            pred_term=pred_term,
+            num_similarity_candidates=num_similarity_candidates,
+            similarity_score_threshold=similarity_score_threshold,
+        )
+        cached_status = self._load_cached(cache_key)
+        if cached_status is not None:
+            return cached_status
+        # NOTE: one candidate query per ontology ent, sent concurrently
+        sim_scores = parallel.thread_map(
+            lambda ent_id: processing.gwas_similarity_candidates(
+                ent_id=ent_id,
+                limit=num_similarity_candidates,
+                similarity_score_threshold=similarity_score_threshold,
+                config=self.config,
+            ),
+            [_["ent_id"] for _ in ontology_ents],
+        )
+        similarity_scores_df = self._make_similarity_scores_df(
+            ontology_ents=ontology_ents, sim_scores=sim_scores
+        )
+        if similarity_scores_df is None:
+            cache.set_results(self.cache, cache_key, status=False)
+            return False
+        filtered_ents = self._filter_ents(
+            similarity_scores_df=similarity_scores_df,
+            pred_term=pred_term,
+            verbose=verbose,
+        )
+        self._make_results(
+            cache_key=cache_key,
+            similarity_scores_df=similarity_scores_df,
+            filtered_ents=filtered_ents,
+        )
+        return True
+
+    async def aharmonize(
+        self,
+        ontology_ents: List[ent_types.BaseEnt],
+        pred_term: str,
+        num_similarity_candidates: int = params.NUM_SIMILARITY_CANDIDATES_TRAIT,
+        similarity_score_threshold: float = params.SIM_THRESHOLD_TRAIT,
+        verbose: bool = True,
+    ) -> bool:
+        """Async `harmonize`, candidates are queried concurrently."""
+        cache_key = self._cache_key(
+            ontology_ents=ontology_ents,
+            pred_term=pred_term,
+            num_similarity_candidates=num_similarity_candidates,
+            similarity_score_threshold=similarity_score_threshold,
+        )
+        # NOTE: cache tiers past memory are blocking, keep them off the loop
+        loop = asyncio.get_event_loop()
+        cached_status = await loop.run_in_executor(
+            None, partial(self._load_cached, cache_key)
+        )
+        if cached_status is not None:
+            return cached_status
+        sim_scores = await asyncio.gather(
+            *[
+                processing.agwas_similarity_candidates(
+                    ent_id=_["ent_id"],
+                    limit=num_similarity_candidates,
+                    similarity_score_threshold=similarity_score_threshold,
+                    config=self.config,
+                )
+                for _ in ontology_ents
+            ]
+        )
+        similarity_scores_df = self._make_similarity_scores_df(
+            ontology_ents=ontology_ents, sim_scores=list(sim_scores)
+        )
+        if similarity_scores_df is None:
+            await loop.run_in_executor(
+                None,
+                partial(
+                    cache.set_results, self.cache, cache_key, status=False
+                ),
+            )
+            return False
+        # NOTE: ent filters are blocking queries, keep them off the loop
+        filtered_ents = await loop.run_in_executor(
+            None,
+            partial(
+                self._filter_ents,
+                similarity_scores_df=similarity_scores_df,
+                pred_term=pred_term,
+                verbose=verbose,
+            ),
+        )
+        await loop.run_in_executor(
+            None,
+            partial(
+                self._make_results,
+                cache_key=cache_key,
+                similarity_scores_df=similarity_scores_df,
+                filtered_ents=filtered_ents,
+            ),
+        )
+        return True
+
+    def _cache_key(
+        self,
+        ontology_ents: List[ent_types.BaseEnt],
+        pred_term: str,
+        num_similarity_candidates: int,
+        similarity_score_threshold: float,
+    ) -> str:
+        res = cache.make_cache_key(
+            "phenotype",
+            ent_term="",
+            ontology_ents=cache.ents_key_param(ontology_ents),
+            pred_directional_type=epigraphdb.PRED_DIRECTIONAL_MAPPING[
+                pred_term
+            ],
+            num_similarity_candidates=num_similarity_candidates,
+            similarity_score_threshold=similarity_score_threshold,
+        )
+        return res
+
+    def _load_cached(self, cache_key: str) -> Optional[bool]:
+        cached = cache.get_results(self.cache, cache_key)
+        if cached is None:
+            return None
+        if cached["status"]:
+            self._similarity_scores_df = cached["dfs"]["similarity_scores_df"]
+            self._ents_df = cached["dfs"]["ents_df"]
+        return cached["status"]
+
+    def _make_similarity_scores_df(
+        self,
+        ontology_ents: List[ent_types.BaseEnt],
+        sim_scores: List[Optional[DataFrame[processing.SimilarityScoresDf]]],
+    ) -> Optional[DataFrame[ent_types.PhenotypeSimilarityScoreDf]]:
+        annotated_sim_scores = [
             _
             for _ in (
                 [
-                    self._process_similarity(
-                        _,
-                        num_similarity_candidates=num_similarity_candidates,
-                        similarity_score_threshold=similarity_score_threshold,
-                    )
-                    for _ in ontology_ents
+                    self._annotate_similarity(df, ontology_ent=ent)
+                    for ent, df in zip(ontology_ents, sim_scores)
                 ]
             )
             if _ is not None
         ]
-        if len(sim_scores) == 0:
-            return False
-        similarity_scores_df = pd.concat(sim_scores).reset_index(drop=True)
+        if len(annotated_sim_scores) == 0:
+            return None
+        res = pd.concat(annotated_sim_scores).reset_index(drop=True)
+        return res
+
+    def _filter_ents(
+        self,
+        similarity_scores_df: DataFrame[ent_types.PhenotypeSimilarityScoreDf],
+        pred_term: str,
+        verbose: bool,
+    ) -> List[ent_types.BaseEnt]:
         pre_partial_funcs: List[Callable] = filter_funcs[
             epigraphdb.PRED_DIRECTIONAL_MAPPING[pred_term]
         ]
@@ -96,6 +238,14 @@ class PhenotypeEntHarmonizer:
             ents=ents,
             funcs=filter_funcs_partialed,
         )
+        return filtered_ents
+
+    def _make_results(
+        self,
+        cache_key: str,
+        similarity_scores_df: DataFrame[ent_types.PhenotypeSimilarityScoreDf],
+        filtered_ents: List[ent_types.BaseEnt],
+    ):
         ents_df = (
             similarity_scores_df[
                 similarity_scores_df["ent_id"].isin(
@@ -105,23 +255,24 @@ class PhenotypeEntHarmonizer:
             .assign(meta_ent="Gwas")
             .reset_index(drop=True)
         )
+        cache.set_results(
+            self.cache,
+            cache_key,
+            status=True,
+            dfs={
+                "similarity_scores_df": similarity_scores_df,
+                "ents_df": ents_df,
+            },
+        )
         self._similarity_scores_df = similarity_scores_df
         self._ents_df = ents_df
-        return True
 
     @pa.check_types
-    def _process_similarity(
+    def _annotate_similarity(
         self,
+        df: Optional[DataFrame[processing.SimilarityScoresDf]],
         ontology_ent: ent_types.BaseEnt,
-        num_similarity_candidates: int,
-        similarity_score_threshold: float,
     ) -> Optional[DataFrame[ent_types.PhenotypeSimilarityScoreDf]]:
-        df = processing.gwas_similarity_candidates(
-            ent_id=ontology_ent["ent_id"],
-            limit=num_similarity_candidates,
-            similarity_score_threshold=similarity_score_threshold,
-            config=self.config,
-        )
         if df is None:
             return None
         else:
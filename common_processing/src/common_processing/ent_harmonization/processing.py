@@ -1,13 +1,22 @@
-import sqlite3
-from typing import Any, Dict, List, Optional
+import asyncio
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 import pandera as pa
-import requests
 from pandera.typing import DataFrame, Series
 
-from ..funcs import ent_filters
+from ..efo import (
+    EFO_NEIGHBOURS_DB_FILE,
+    get_efo_ic_index,
+    lookup_efo_neighbours,
+)
+from ..funcs import ent_filters, http_client, parallel
 from ..types import Config, ent_types
+from .embedding_index import get_embedding_index
+
+# NOTE: number of text pairs per request to the transformers service
+IDENTITY_BATCH_SIZE = 256
 
 
 class QueryCandidateDf(pa.SchemaModel):
@@ -36,20 +45,157 @@ class IcScoresDf(pa.SchemaModel):
     ic_score: Series[float]
 
 
+class BatchIdentityScoresDf(IdentityScoresDf):
+    reference_term: Series[str]
+
+
 @pa.check_types
 def efo_similarity_candidates(
     term: str, limit: int, similarity_score_threshold: float, config: Config
 ) -> Optional[DataFrame[SimilarityScoresDf]]:
-    url = "{url}/query/text".format(url=config.epigraphdb_neural_url)
+    endpoint, params = _efo_similarity_query(term=term, limit=limit)
+    res = _neural_candidates(
+        endpoint=endpoint,
+        params=params,
+        similarity_score_threshold=similarity_score_threshold,
+        config=config,
+    )
+    return res
+
+
+async def aefo_similarity_candidates(
+    term: str, limit: int, similarity_score_threshold: float, config: Config
+) -> Optional[DataFrame[SimilarityScoresDf]]:
+    endpoint, params = _efo_similarity_query(term=term, limit=limit)
+    res = await _aneural_candidates(
+        endpoint=endpoint,
+        params=params,
+        similarity_score_threshold=similarity_score_threshold,
+        config=config,
+    )
+    return res
+
+
+def _efo_similarity_query(term: str, limit: int) -> Tuple[str, Dict[str, Any]]:
     params: Dict[str, Any] = {
         "text": term,
         "asis": False,
         "include_meta_nodes": ["Efo"],
         "limit": limit,
     }
-    r = requests.get(url, params=params)
-    r.raise_for_status()
-    query_df: DataFrame[QueryCandidateDf] = pd.DataFrame(r.json()["results"])
+    return "/query/text", params
+
+
+def _neural_candidates(
+    endpoint: str,
+    params: Dict[str, Any],
+    similarity_score_threshold: float,
+    config: Config,
+) -> Optional[DataFrame[SimilarityScoresDf]]:
+    results = _local_results(endpoint=endpoint, params=params, config=config)
+    if results is None:
+        url = "{url}{endpoint}".format(
+            url=config.epigraphdb_neural_url, endpoint=endpoint
+        )
+        r = http_client.get(url, service="epigraphdb_neural", params=params)
+        r.raise_for_status()
+        results = r.json()["results"]
+    res = _make_similarity_scores_df(
+        results=results,
+        similarity_score_threshold=similarity_score_threshold,
+    )
+    return res
+
+
+async def _aneural_candidates(
+    endpoint: str,
+    params: Dict[str, Any],
+    similarity_score_threshold: float,
+    config: Config,
+) -> Optional[DataFrame[SimilarityScoresDf]]:
+    # NOTE: sqlite lookups and local searches are blocking,
+    #       keep them off the loop
+    loop = asyncio.get_event_loop()
+    results = await loop.run_in_executor(
+        None,
+        partial(
+            _local_results, endpoint=endpoint, params=params, config=config
+        ),
+    )
+    if results is None:
+        url = "{url}{endpoint}".format(
+            url=config.epigraphdb_neural_url, endpoint=endpoint
+        )
+        r = await http_client.aget(
+            url, service="epigraphdb_neural", params=params
+        )
+        r.raise_for_status()
+        results = r.json()["results"]
+    res = _make_similarity_scores_df(
+        results=results,
+        similarity_score_threshold=similarity_score_threshold,
+    )
+    return res
+
+
+def _local_results(
+    endpoint: str, params: Dict[str, Any], config: Config
+) -> Optional[List[Dict[str, Any]]]:
+    """Results of a neural service query from the efo neighbours table
+    or the local embeddings, None when neither can answer.
+    """
+    res = _efo_neighbours_results(
+        endpoint=endpoint, params=params, config=config
+    )
+    if res is None and config.local_embeddings:
+        res = _local_neural_results(
+            endpoint=endpoint, params=params, config=config
+        )
+    return res
+
+
+def _efo_neighbours_results(
+    endpoint: str, params: Dict[str, Any], config: Config
+) -> Optional[List[Dict[str, Any]]]:
+    """Results of an efo `/query/entity` query from the precomputed
+    efo neighbours table, None when it is not built or cannot answer.
+    """
+    if endpoint != "/query/entity" or params["meta_node"] != "Efo":
+        return None
+    if len(params["include_meta_nodes"]) != 1:
+        return None
+    db_path = config.data_path / "efo" / EFO_NEIGHBOURS_DB_FILE
+    if not db_path.exists():
+        return None
+    res = lookup_efo_neighbours(
+        db_path=db_path,
+        efo_id=params["entity_id"],
+        meta_node=params["include_meta_nodes"][0],
+        limit=params["limit"],
+    )
+    return res
+
+
+def _local_neural_results(
+    endpoint: str, params: Dict[str, Any], config: Config
+) -> Optional[List[Dict[str, Any]]]:
+    """Results of the neural service query from the local embedding index,
+    None when it is disabled or cannot answer the query.
+    """
+    if not config.local_embeddings:
+        return None
+    embedding_index = get_embedding_index(config.data_path / "embeddings")
+    if endpoint != "/query/entity":
+        return None
+    res = embedding_index.query_entity(**params)
+    return res
+
+
+@pa.check_types
+def _make_similarity_scores_df(
+    results: List[Dict[str, Any]], similarity_score_threshold: float
+) -> Optional[DataFrame[SimilarityScoresDf]]:
+    query_df: DataFrame[QueryCandidateDf] = pd.DataFrame(results)
     if len(query_df) == 0:
         return None
     res: DataFrame[SimilarityScoresDf] = query_df.rename(
@@ -71,17 +217,10 @@ def efo_ic_scores(
     ic_score_threshold: Optional[float] = None,
 ) -> DataFrame[IcScoresDf]:
     db_path = config.data_path / "efo" / "epigraphdb_efo.db"
-    ent_ids_expr = str(ent_ids).replace("[", "(").replace("]", ")")
-    query = f"""
-    SELECT efo_term, efo_id, ic_score FROM IC
-    WHERE efo_id IN {ent_ids_expr}
-    """
-    with sqlite3.connect(db_path) as conn:
-        query_df = pd.read_sql(query, conn)
-
-    df = query_df.rename(columns={"efo_id": "ent_id", "efo_term": "ent_term"})
-    if ic_score_threshold is not None:
-        df = df.query(f"ic_score > {ic_score_threshold}")
+    efo_ic_index = get_efo_ic_index(db_path)
+    df = efo_ic_index.lookup(
+        ent_ids=ent_ids, ic_score_threshold=ic_score_threshold
+    )
     return df
 
 
@@ -92,46 +231,179 @@ def efo_identity_scores(
     config: Config,
 ) -> DataFrame[IdentityScoresDf]:
     target_terms = [_["ent_term"] for _ in ents]
-    text_pairs = {
-        "text_1": [reference_term for _ in target_terms],
-        "text_2": [_ for _ in target_terms],
-    }
+    scores = _transformers_inference(
+        text_1=[reference_term for _ in target_terms],
+        text_2=target_terms,
+        config=config,
+    )
+    res = pd.DataFrame(ents).assign(identity_score=scores)
+    return res
+
+
+async def aefo_identity_scores(
+    reference_term: str,
+    ents: List[ent_types.BaseEnt],
+    config: Config,
+) -> DataFrame[IdentityScoresDf]:
+    target_terms = [_["ent_term"] for _ in ents]
+    scores = await _atransformers_inference(
+        text_1=[reference_term for _ in target_terms],
+        text_2=target_terms,
+        config=config,
+    )
+    res = pd.DataFrame(ents).assign(identity_score=scores)
+    return res
+
+
+@pa.check_types
+def efo_identity_scores_many(
+    reference_ents: List[Tuple[str, ent_types.BaseEnt]],
+    config: Config,
+    batch_size: int = IDENTITY_BATCH_SIZE,
+) -> DataFrame[BatchIdentityScoresDf]:
+    """Batched version of `efo_identity_scores`,
+    `reference_ents` are pairs of (reference_term, ent),
+    which are sent to the transformers service in chunks of `batch_size`.
+    """
+    if len(reference_ents) == 0:
+        empty_df = BatchIdentityScoresDf.example(size=1).iloc[:0, :].copy()
+        return empty_df
+    scores: List[float] = []
+    for idx in range(0, len(reference_ents), batch_size):
+        chunk = reference_ents[idx : (idx + batch_size)]
+        scores = scores + _transformers_inference(
+            text_1=[_[0] for _ in chunk],
+            text_2=[_[1]["ent_term"] for _ in chunk],
+            config=config,
+        )
+    res = pd.DataFrame(
+        [
+            {
+                "reference_term": reference_term,
+                "ent_id": ent["ent_id"],
+                "ent_term": ent["ent_term"],
+            }
+            for reference_term, ent in reference_ents
+        ]
+    ).assign(identity_score=scores)
+    return res
+
+
+def _transformers_inference(
+    text_1: List[str], text_2: List[str], config: Config
+) -> List[float]:
     url = "{url}/inference".format(url=config.neural_transformers_url)
-    r = requests.post(
+    r = http_client.post(
         url,
-        json={"text_1": text_pairs["text_1"], "text_2": text_pairs["text_2"]},
+        service="neural_transformers",
+        json={"text_1": text_1, "text_2": text_2},
     )
     r.raise_for_status()
-    scores = r.json()
-    res = pd.DataFrame(ents).assign(identity_score=scores)
+    res = r.json()
+    return res
+
+
+async def _atransformers_inference(
+    text_1: List[str], text_2: List[str], config: Config
+) -> List[float]:
+    url = "{url}/inference".format(url=config.neural_transformers_url)
+    r = await http_client.apost(
+        url,
+        service="neural_transformers",
+        json={"text_1": text_1, "text_2": text_2},
+    )
+    r.raise_for_status()
+    res = r.json()
     return res
 
 
+def efo_similarity_candidates_many(
+    terms: List[str],
+    limit: int,
+    similarity_score_threshold: float,
+    config: Config,
+    max_workers: int = parallel.MAX_WORKERS,
+) -> Dict[str, Optional[DataFrame[SimilarityScoresDf]]]:
+    """Fetch `efo_similarity_candidates` for unique `terms`
+    on a bounded thread pool.
+    """
+    unique_terms = list(dict.fromkeys(terms))
+    func = partial(
+        efo_similarity_candidates,
+        limit=limit,
+        similarity_score_threshold=similarity_score_threshold,
+        config=config,
+    )
+    results = parallel.thread_map(func, unique_terms, max_workers=max_workers)
+    res = dict(zip(unique_terms, results))
+    return res
+
+
+def make_efo_candidates(
+    similarity_scores_df: DataFrame[SimilarityScoresDf],
+    ic_scores_df: DataFrame[IcScoresDf],
+    identity_scores_df: DataFrame[IdentityScoresDf],
+    identity_score_threshold: float,
+) -> Tuple[
+    DataFrame[ent_types.OntologyEntDf], DataFrame[ent_types.OntologyEntDf]
+]:
+    """Combine the scores into (candidates_df, ents_df),
+    where ents are candidates passing the identity threshold.
+    """
+    identity_valid = identity_scores_df[
+        identity_scores_df["identity_score"].abs() <= identity_score_threshold
+    ]
+    candidates_df = (
+        identity_scores_df[["ent_id", "ent_term", "identity_score"]]
+        .merge(
+            ic_scores_df,
+            left_on=["ent_id", "ent_term"],
+            right_on=["ent_id", "ent_term"],
+        )
+        .merge(
+            similarity_scores_df,
+            left_on=["ent_id", "ent_term"],
+            right_on=["ent_id", "ent_term"],
+        )[
+            [
+                "ent_id",
+                "ent_term",
+                "similarity_score",
+                "ic_score",
+                "identity_score",
+            ]
+        ]
+    )
+    ents_df = candidates_df[
+        candidates_df["ent_id"].isin(identity_valid["ent_id"])
+    ]
+    return candidates_df, ents_df
+
+
 @pa.check_types
 def gwas_similarity_candidates(
     ent_id: str, limit: int, similarity_score_threshold: float, config: Config
 ) -> Optional[DataFrame[SimilarityScoresDf]]:
-    url = "{url}/query/entity".format(url=config.epigraphdb_neural_url)
-    params: Dict[str, Any] = {
-        "entity_id": ent_id,
-        "meta_node": "Efo",
-        "include_meta_nodes": ["Gwas"],
-        "limit": limit,
-    }
-    r = requests.get(url, params=params)
-    r.raise_for_status()
-    query_df: DataFrame[QueryCandidateDf] = pd.DataFrame(r.json()["results"])
-    if len(query_df) == 0:
-        return None
-    res: DataFrame[SimilarityScoresDf] = query_df.rename(
-        columns={
-            "id": "ent_id",
-            "name": "ent_term",
-            "score": "similarity_score",
-        }
-    ).query(f"similarity_score > {similarity_score_threshold}")
-    if len(res) == 0:
-        return None
+    endpoint, params = _gwas_similarity_query(ent_id=ent_id, limit=limit)
+    res = _neural_candidates(
+        endpoint=endpoint,
+        params=params,
+        similarity_score_threshold=similarity_score_threshold,
+        config=config,
+    )
+    return res
+
+
+async def agwas_similarity_candidates(
+    ent_id: str, limit: int, similarity_score_threshold: float, config: Config
+) -> Optional[DataFrame[SimilarityScoresDf]]:
+    endpoint, params = _gwas_similarity_query(ent_id=ent_id, limit=limit)
+    res = await _aneural_candidates(
+        endpoint=endpoint,
+        params=params,
+        similarity_score_threshold=similarity_score_threshold,
+        config=config,
+    )
     return res
 
 
@@ -139,27 +411,30 @@ def gwas_similarity_candidates(
 def umls_similarity_candidates_on_efo(
     ent_id: str, limit: int, similarity_score_threshold: float, config: Config
 ) -> Optional[DataFrame[SimilarityScoresDf]]:
-    url = "{url}/query/entity".format(url=config.epigraphdb_neural_url)
-    params: Dict[str, Any] = {
-        "entity_id": ent_id,
-        "meta_node": "Efo",
-        "include_meta_nodes": ["Literatureterm"],
-        "limit": limit,
-    }
-    r = requests.get(url, params=params)
-    r.raise_for_status()
-    query_df: DataFrame[QueryCandidateDf] = pd.DataFrame(r.json()["results"])
-    if len(query_df) == 0:
-        return None
-    res: DataFrame[SimilarityScoresDf] = query_df.rename(
-        columns={
-            "id": "ent_id",
-            "name": "ent_term",
-            "score": "similarity_score",
-        }
-    ).query(f"similarity_score > {similarity_score_threshold}")
-    if len(res) == 0:
-        return None
+    endpoint, params = _umls_similarity_on_efo_query(
+        ent_id=ent_id, limit=limit
+    )
+    res = _neural_candidates(
+        endpoint=endpoint,
+        params=params,
+        similarity_score_threshold=similarity_score_threshold,
+        config=config,
+    )
+    return res
+
+
+async def aumls_similarity_candidates_on_efo(
+    ent_id: str, limit: int, similarity_score_threshold: float, config: Config
+) -> Optional[DataFrame[SimilarityScoresDf]]:
+    endpoint, params = _umls_similarity_on_efo_query(
+        ent_id=ent_id, limit=limit
+    )
+    res = await _aneural_candidates(
+        endpoint=endpoint,
+        params=params,
+        similarity_score_threshold=similarity_score_threshold,
+        config=config,
+    )
     return res
 
 
@@ -170,27 +445,69 @@ def umls_similarity_candidates_on_umls(
     similarity_score_threshold: float,
     config: Config,
 ) -> Optional[DataFrame[SimilarityScoresDf]]:
-    url = "{url}/query/text".format(url=config.epigraphdb_neural_url)
+    endpoint, params = _umls_similarity_on_umls_query(
+        umls_term=umls_term, limit=limit
+    )
+    res = _neural_candidates(
+        endpoint=endpoint,
+        params=params,
+        similarity_score_threshold=similarity_score_threshold,
+        config=config,
+    )
+    return res
+
+
+async def aumls_similarity_candidates_on_umls(
+    umls_term: str,
+    limit: int,
+    similarity_score_threshold: float,
+    config: Config,
+) -> Optional[DataFrame[SimilarityScoresDf]]:
+    endpoint, params = _umls_similarity_on_umls_query(
+        umls_term=umls_term, limit=limit
+    )
+    res = await _aneural_candidates(
+        endpoint=endpoint,
+        params=params,
+        similarity_score_threshold=similarity_score_threshold,
+        config=config,
+    )
+    return res
+
+
+def _gwas_similarity_query(
+    ent_id: str, limit: int
+) -> Tuple[str, Dict[str, Any]]:
+    params: Dict[str, Any] = {
+        "entity_id": ent_id,
+        "meta_node": "Efo",
+        "include_meta_nodes": ["Gwas"],
+        "limit": limit,
+    }
+    return "/query/entity", params
+
+
+def _umls_similarity_on_efo_query(
+    ent_id: str, limit: int
+) -> Tuple[str, Dict[str, Any]]:
+    params: Dict[str, Any] = {
+        "entity_id": ent_id,
+        "meta_node": "Efo",
+        "include_meta_nodes": ["Literatureterm"],
+        "limit": limit,
+    }
+    return "/query/entity", params
+
+
+def _umls_similarity_on_umls_query(
+    umls_term: str, limit: int
+) -> Tuple[str, Dict[str, Any]]:
     params: Dict[str, Any] = {
         "text": umls_term,
         "include_meta_nodes": ["Literatureterm"],
         "limit": limit,
     }
-    r = requests.get(url, params=params)
-    r.raise_for_status()
-    query_df: DataFrame[QueryCandidateDf] = pd.DataFrame(r.json()["results"])
-    if len(query_df) == 0:
-        return None
-    res: DataFrame[SimilarityScoresDf] = query_df.rename(
-        columns={
-            "id": "ent_id",
-            "name": "ent_term",
-            "score": "similarity_score",
-        }
-    ).query(f"similarity_score > {similarity_score_threshold}")
-    if len(res) == 0:
-        return None
-    return res
+    return "/query/text", params
 
 
 def traits_filter_ents_by_predicates(
@@ -1,3 +1,5 @@
+import asyncio
+from functools import partial
 from typing import List, Optional
 
 import pandas as pd
@@ -5,17 +7,20 @@ import pandera as pa
 from pandera.typing import DataFrame
 from pydantic import validate_arguments
 
+from ..funcs import parallel
+from ..funcs.cache import CacheBackend
 from ..settings import params
 from ..types import Config, ent_types
-from . import processing
+from . import cache, processing
 
 from icecream import ic  # noqa
 
 
 class UmlsEntHarmonizer:
-    @validate_arguments
-    def __init__(self, config: Config):
+    @validate_arguments(config=dict(arbitrary_types_allowed=True))
+    def __init__(self, config: Config, cache: Optional[CacheBackend] = None):
         self.config = config
+        self.cache = cache
         self.reset()
 
     def reset(self):
@@ -49,31 +54,153 @@ class UmlsEntHarmonizer:
         similarity_score_threshold: float = params.SIM_THRESHOLD_UMLS,
         verbose: bool = False,
     ) -> bool:
-        sim_scores = [
+        cache_key = self._cache_key(
+            umls_ent=umls_ent,
+            ontology_ents=ontology_ents,
+            num_similarity_candidates=num_similarity_candidates,
+            similarity_score_threshold=similarity_score_threshold,
+        )
+        cached_status = self._load_cached(cache_key)
+        if cached_status is not None:
+            return cached_status
+        # NOTE: one candidate query per ent, sent concurrently
+        candidate_queries = [
+            partial(
+                processing.umls_similarity_candidates_on_umls,
+                umls_term=umls_ent["ent_term"],
+                limit=num_similarity_candidates,
+                similarity_score_threshold=similarity_score_threshold,
+                config=self.config,
+            )
+        ] + [
+            partial(
+                processing.umls_similarity_candidates_on_efo,
+                ent_id=_["ent_id"],
+                limit=num_similarity_candidates,
+                similarity_score_threshold=similarity_score_threshold,
+                config=self.config,
+            )
+            for _ in ontology_ents
+        ]
+        sim_scores = parallel.thread_map(lambda _: _(), candidate_queries)
+        res = self._make_results(
+            cache_key=cache_key,
+            umls_ent=umls_ent,
+            ontology_ents=ontology_ents,
+            sim_scores=sim_scores,
+        )
+        return res
+
+    async def aharmonize(
+        self,
+        umls_ent: ent_types.BaseEnt,
+        ontology_ents: List[ent_types.BaseEnt],
+        num_similarity_candidates: int = params.NUM_SIMILARITY_CANDIDATES_UMLS,
+        similarity_score_threshold: float = params.SIM_THRESHOLD_UMLS,
+        verbose: bool = False,
+    ) -> bool:
+        """Async `harmonize`, candidates are queried concurrently."""
+        cache_key = self._cache_key(
+            umls_ent=umls_ent,
+            ontology_ents=ontology_ents,
+            num_similarity_candidates=num_similarity_candidates,
+            similarity_score_threshold=similarity_score_threshold,
+        )
+        # NOTE: cache tiers past memory are blocking, keep them off the loop
+        loop = asyncio.get_event_loop()
+        cached_status = await loop.run_in_executor(
+            None, partial(self._load_cached, cache_key)
+        )
+        if cached_status is not None:
+            return cached_status
+        sim_scores = await asyncio.gather(
+            processing.aumls_similarity_candidates_on_umls(
+                umls_term=umls_ent["ent_term"],
+                limit=num_similarity_candidates,
+                similarity_score_threshold=similarity_score_threshold,
+                config=self.config,
+            ),
+            *[
+                processing.aumls_similarity_candidates_on_efo(
+                    ent_id=_["ent_id"],
+                    limit=num_similarity_candidates,
+                    similarity_score_threshold=similarity_score_threshold,
+                    config=self.config,
+                )
+                for _ in ontology_ents
+            ],
+        )
+        res = await loop.run_in_executor(
+            None,
+            partial(
+                self._make_results,
+                cache_key=cache_key,
+                umls_ent=umls_ent,
+                ontology_ents=ontology_ents,
+                sim_scores=list(sim_scores),
+            ),
+        )
+        return res
+
+    def _cache_key(
+        self,
+        umls_ent: ent_types.BaseEnt,
+        ontology_ents: List[ent_types.BaseEnt],
+        num_similarity_candidates: int,
+        similarity_score_threshold: float,
+    ) -> str:
+        res = cache.make_cache_key(
+            "umls",
+            ent_term=umls_ent["ent_term"],
+            umls_ent_id=umls_ent["ent_id"],
+            ontology_ents=cache.ents_key_param(ontology_ents),
+            num_similarity_candidates=num_similarity_candidates,
+            similarity_score_threshold=similarity_score_threshold,
+        )
+        return res
+
+    def _load_cached(self, cache_key: str) -> Optional[bool]:
+        cached = cache.get_results(self.cache, cache_key)
+        if cached is None:
+            return None
+        if cached["status"]:
+            self._similarity_scores_df = cached["dfs"]["similarity_scores_df"]
+            self._ents_df = cached["dfs"]["ents_df"]
+        return cached["status"]
+
+    def _make_results(
+        self,
+        cache_key: str,
+        umls_ent: ent_types.BaseEnt,
+        ontology_ents: List[ent_types.BaseEnt],
+        sim_scores: List[Optional[DataFrame[processing.SimilarityScoresDf]]],
+    ) -> bool:
+        """`sim_scores`: candidates on the umls term,
+        followed by candidates on each of `ontology_ents`.
+        """
+        annotated_sim_scores = [
             _
             for _ in (
                 [
-                    self._process_similarity_on_umls(
+                    self._annotate_similarity_on_umls(
+                        sim_scores[0],
                         umls_id=umls_ent["ent_id"],
                         umls_term=umls_ent["ent_term"],
-                        num_similarity_candidates=num_similarity_candidates,
-                        similarity_score_threshold=similarity_score_threshold,
                     )
                 ]
                 + [
-                    self._process_similarity_on_efo(
-                        _,
-                        num_similarity_candidates=num_similarity_candidates,
-                        similarity_score_threshold=similarity_score_threshold,
-                    )
-                    for _ in ontology_ents
+                    self._annotate_similarity_on_efo(df, ontology_ent=ent)
+                    for ent, df in zip(ontology_ents, sim_scores[1:])
                 ]
             )
             if _ is not None
         ]
-        if len(sim_scores) == 0:
+        if len(annotated_sim_scores) == 0:
+            cache.set_results(self.cache, cache_key, status=False)
             return False
-        similarity_scores_df = pd.concat(sim_scores).reset_index(drop=True)
+        similarity_scores_df = pd.concat(annotated_sim_scores).reset_index(
+            drop=True
+        )
         ents = (
             similarity_scores_df[["ent_id", "ent_term"]]
             .drop_duplicates()
@@ -90,23 +217,25 @@ class UmlsEntHarmonizer:
             .assign(meta_ent="LiteratureTerm")
             .reset_index(drop=True)
         )
+        cache.set_results(
+            self.cache,
+            cache_key,
+            status=True,
+            dfs={
+                "similarity_scores_df": similarity_scores_df,
+                "ents_df": ents_df,
+            },
+        )
         self._similarity_scores_df = similarity_scores_df
         self._ents_df = ents_df
         return True
 
     @pa.check_types
-    def _process_similarity_on_efo(
+    def _annotate_similarity_on_efo(
         self,
+        df: Optional[DataFrame[processing.SimilarityScoresDf]],
         ontology_ent: ent_types.BaseEnt,
-        num_similarity_candidates: int,
-        similarity_score_threshold: float,
     ) -> Optional[DataFrame[ent_types.PhenotypeSimilarityScoreDf]]:
-        df = processing.umls_similarity_candidates_on_efo(
-            ent_id=ontology_ent["ent_id"],
-            limit=num_similarity_candidates,
-            similarity_score_threshold=similarity_score_threshold,
-            config=self.config,
-        )
         if df is None:
             return None
         else:
@@ -118,19 +247,12 @@ class UmlsEntHarmonizer:
             return df
 
     @pa.check_types
-    def _process_similarity_on_umls(
+    def _annotate_similarity_on_umls(
         self,
+        df: Optional[DataFrame[processing.SimilarityScoresDf]],
         umls_id: str,
         umls_term: str,
-        num_similarity_candidates: int,
-        similarity_score_threshold: float,
     ) -> Optional[DataFrame[ent_types.PhenotypeSimilarityScoreDf]]:
-        df = processing.umls_similarity_candidates_on_umls(
-            umls_term=umls_term,
-            limit=num_similarity_candidates,
-            similarity_score_threshold=similarity_score_threshold,
-            config=self.config,
-        )
         if df is None:
             return None
         else:
@@ -0,0 +1,270 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+# NOTE: values stored in the cache backends need to be json serializable
+
+# NOTE: number of sqlite cache hits whose access times are kept
+#       in memory before they are written in one transaction
+ACCESS_FLUSH_SIZE = 256
+# NOTE: number of sqlite cache sets between evictions, the cache can
+#       grow past max_entries by up to this many entries in between
+EVICT_INTERVAL = 256
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        ...
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache with TTL eviction."""
+
+    def __init__(self, max_entries: int = 2048, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            created_at, value = item
+            if self.ttl is not None and time.time() - created_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+class SqliteCache(CacheBackend):
+    """On-disk LRU cache with TTL eviction, backed by a sqlite file.
+
+    The file can be shared by multiple processes (e.g. ray workers
+    and api workers), each process holds its own connection.
+
+    Reads do not write: access times of hits are batched and written
+    on the next `set` or every ACCESS_FLUSH_SIZE hits.
+    Least recently accessed entries past `max_entries` are evicted
+    in one batch every `evict_interval` sets.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = 100_000,
+        ttl: Optional[float] = None,
+        evict_interval: int = EVICT_INTERVAL,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evict_interval = evict_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._accessed: Dict[str, float] = {}
+        self._num_sets = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # NOTE: connections must not be shared across forked processes
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=30, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS CACHE (
+                    key TEXT PRIMARY KEY,
+                    value TEXT,
+                    created_at REAL,
+                    accessed_at REAL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS CACHE_ACCESSED_AT
+                ON CACHE (accessed_at)
+                """
+            )
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+            self._accessed = {}
+        return self._conn
+
+    def _flush_accessed(self, conn: sqlite3.Connection) -> None:
+        if len(self._accessed) == 0:
+            return None
+        conn.executemany(
+            "UPDATE CACHE SET accessed_at = ? WHERE key = ?",
+            [
+                (accessed_at, key)
+                for key, accessed_at in self._accessed.items()
+            ],
+        )
+        self._accessed = {}
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        num_entries = conn.execute("SELECT COUNT(*) FROM CACHE").fetchone()[0]
+        if num_entries <= self.max_entries:
+            return None
+        conn.execute(
+            """
+            DELETE FROM CACHE WHERE key IN (
+                SELECT key FROM CACHE
+                ORDER BY accessed_at ASC
+                LIMIT ?
+            )
+            """,
+            (num_entries - self.max_entries,),
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, created_at FROM CACHE WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    return None
+                value, created_at = row
+                now = time.time()
+                if self.ttl is not None and now - created_at > self.ttl:
+                    conn.execute("DELETE FROM CACHE WHERE key = ?", (key,))
+                    conn.commit()
+                    return None
+                self._accessed[key] = now
+                if len(self._accessed) >= ACCESS_FLUSH_SIZE:
+                    self._flush_accessed(conn)
+                    conn.commit()
+            return json.loads(value)
+        except sqlite3.Error as e:
+            logger.warning(f"sqlite cache get failed, {self.path=}; {e}")
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            with self._lock:
+                conn = self._connect()
+                self._flush_accessed(conn)
+                now = time.time()
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO CACHE
+                    (key, value, created_at, accessed_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (key, json.dumps(value), now, now),
+                )
+                self._num_sets += 1
+                if self._num_sets >= self.evict_interval:
+                    self._evict(conn)
+                    self._num_sets = 0
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"sqlite cache set failed, {self.path=}; {e}")
+
+
+class RedisCache(CacheBackend):
+    """Redis backed cache with TTL eviction.
+
+    LRU eviction is delegated to the redis server,
+    i.e. `maxmemory-policy allkeys-lru`.
+    """
+
+    def __init__(
+        self, url: str, ttl: Optional[float] = None, prefix: str = "asq"
+    ):
+        # NOTE: optional dependency, only needed when this backend is in use
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            value = self.client.get(f"{self.prefix}:{key}")
+        except Exception as e:
+            logger.warning(f"redis cache get failed; {e}")
+            return None
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        ex = int(self.ttl) if self.ttl is not None else None
+        try:
+            self.client.set(f"{self.prefix}:{key}", json.dumps(value), ex=ex)
+        except Exception as e:
+            logger.warning(f"redis cache set failed; {e}")
+
+
+class TieredCache(CacheBackend):
+    """Look up tiers in order (e.g. memory -> redis -> disk),
+    hits in a later tier are written back to the earlier tiers.
+    """
+
+    def __init__(self, tiers: List[CacheBackend]):
+        self.tiers = tiers
+
+    def get(self, key: str) -> Optional[Any]:
+        for idx, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for earlier_tier in self.tiers[:idx]:
+                    earlier_tier.set(key, value)
+                return value
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        for tier in self.tiers:
+            tier.set(key, value)
+
+
+def make_tiered_cache(
+    path: Optional[Path] = None,
+    redis_url: Optional[str] = None,
+    ttl: Optional[float] = None,
+    max_entries: int = 100_000,
+) -> CacheBackend:
+    """Memory tier, followed by redis and sqlite (on-disk) tiers
+    when `redis_url` / `path` are specified.
+    """
+    tiers: List[CacheBackend] = [MemoryCache(ttl=ttl)]
+    if redis_url is not None:
+        try:
+            tiers.append(RedisCache(url=redis_url, ttl=ttl))
+        except ImportError as e:
+            logger.warning(f"redis cache tier skipped; {e}")
+    if path is not None:
+        tiers.append(SqliteCache(path=path, max_entries=max_entries, ttl=ttl))
+    return TieredCache(tiers)
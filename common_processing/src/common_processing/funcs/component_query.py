@@ -1,11 +1,20 @@
-from typing import List
+import asyncio
+from functools import partial
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 import pandera as pa
-import requests
 from loguru import logger
 from pandera.typing import DataFrame, Series
 
+from . import http_client, parallel
+from .cache import CacheBackend
+
+# NOTE: upper bound on pmids per general-search request
+MEDLINE_CHUNK_SIZE = 100
+# NOTE: abstracts are immutable, bump this only on schema changes
+MEDLINE_CACHE_VERSION = "1"
+
 
 class MedlineDf(pa.SchemaModel):
     doi: Series[str]
@@ -17,13 +26,123 @@ class MedlineDf(pa.SchemaModel):
     type: Series[str]
 
 
-def medline_query(lit_id_list: List[str], url: str) -> DataFrame[MedlineDf]:
+def medline_query(
+    lit_id_list: List[str],
+    url: str,
+    cache: Optional[CacheBackend] = None,
+) -> DataFrame[MedlineDf]:
+    """Abstracts of the distinct pmids in `lit_id_list`.
+
+    Pmids not in `cache` are fetched in concurrent chunks
+    of `MEDLINE_CHUNK_SIZE`.
+    """
+    url = "{url}/pubmed/general-search".format(url=url)
+    lit_ids = list(dict.fromkeys(lit_id_list))
+    medline_results = _get_cached(cache, lit_ids)
+    missing_ids = [_ for _ in lit_ids if _ not in medline_results]
+    chunk_results = parallel.thread_map(
+        partial(_query_chunk, url=url), _chunk_ids(missing_ids)
+    )
+    fetched = _group_by_pmid(chunk_results)
+    _set_cached(cache, fetched)
+    medline_results.update(fetched)
+    res = _make_medline_df(
+        results=[item for _ in lit_ids for item in medline_results.get(_, [])],
+        lit_id_list=lit_ids,
+    )
+    return res
+
 
+async def amedline_query(
+    lit_id_list: List[str],
+    url: str,
+    cache: Optional[CacheBackend] = None,
+) -> DataFrame[MedlineDf]:
     url = "{url}/pubmed/general-search".format(url=url)
-    data = {"pmids": lit_id_list, "type": "text"}
-    r = requests.post(url, json=data)
+
+    async def _query(lit_ids: List[str]) -> List[Dict[str, Any]]:
+        data = {"pmids": lit_ids, "type": "text"}
+        r = await http_client.apost(url, service="medline", json=data)
+        r.raise_for_status()
+        res = r.json()
+        return res
+
+    lit_ids = list(dict.fromkeys(lit_id_list))
+    # NOTE: cache tiers past memory are blocking, keep them off the loop
+    loop = asyncio.get_event_loop()
+    medline_results = await loop.run_in_executor(
+        None, partial(_get_cached, cache, lit_ids)
+    )
+    missing_ids = [_ for _ in lit_ids if _ not in medline_results]
+    chunk_results = await asyncio.gather(
+        *[_query(_) for _ in _chunk_ids(missing_ids)]
+    )
+    fetched = _group_by_pmid(list(chunk_results))
+    await loop.run_in_executor(None, partial(_set_cached, cache, fetched))
+    medline_results.update(fetched)
+    res = _make_medline_df(
+        results=[item for _ in lit_ids for item in medline_results.get(_, [])],
+        lit_id_list=lit_ids,
+    )
+    return res
+
+
+def _query_chunk(lit_ids: List[str], url: str) -> List[Dict[str, Any]]:
+    data = {"pmids": lit_ids, "type": "text"}
+    r = http_client.post(url, service="medline", json=data)
     r.raise_for_status()
-    results = r.json()
+    res = r.json()
+    return res
+
+
+def _chunk_ids(lit_ids: List[str]) -> List[List[str]]:
+    res = [
+        lit_ids[idx : idx + MEDLINE_CHUNK_SIZE]
+        for idx in range(0, len(lit_ids), MEDLINE_CHUNK_SIZE)
+    ]
+    return res
+
+
+def _group_by_pmid(
+    chunk_results: List[List[Dict[str, Any]]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    res: Dict[str, List[Dict[str, Any]]] = {}
+    for item in (item for chunk in chunk_results for item in chunk):
+        res.setdefault(str(item["pmid"]), []).append(item)
+    return res
+
+
+def _cache_key(pmid: str) -> str:
+    return f"medline:{MEDLINE_CACHE_VERSION}:{pmid}"
+
+
+def _get_cached(
+    cache: Optional[CacheBackend], lit_ids: List[str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    if cache is None:
+        return {}
+    res = {}
+    for lit_id in lit_ids:
+        value = cache.get(_cache_key(lit_id))
+        if value is not None:
+            res[lit_id] = value
+    return res
+
+
+def _set_cached(
+    cache: Optional[CacheBackend],
+    medline_results: Dict[str, List[Dict[str, Any]]],
+) -> None:
+    # NOTE: pmids without results are not cached, they may be indexed later
+    if cache is None:
+        return None
+    for lit_id, value in medline_results.items():
+        cache.set(_cache_key(lit_id), value)
+
+
+def _make_medline_df(
+    results: List[Dict[str, Any]], lit_id_list: List[str]
+) -> DataFrame[MedlineDf]:
     if len(results) == 0:
         logger.debug(f"empty df, {lit_id_list=}")
         empty_df = MedlineDf.example(size=1).iloc[:0, :].copy()
@@ -0,0 +1,161 @@
+import asyncio
+import itertools
+import json
+import math
+import numbers
+import re
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from ..types import Config
+from . import http_client, parallel
+
+# NOTE: max number of distinct items of a chunked parameter per query
+CYPHER_CHUNK_SIZE = 100
+
+# NOTE: string literals, quoted names and comments are matched first so
+#       that `$name`s inside them are kept as is
+PARAM_PATTERN = re.compile(
+    r"""(?P<quoted>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|`[^`]*`|//[^\n]*)"""
+    r"|\$(?P<name>\w+)"
+)
+
+
+class CypherQuery:
+    """A cypher query with `$name` parameters.
+
+    List parameters in `chunk_params` are split into chunks of
+    `chunk_size` distinct items, with one query per combination of
+    chunks, so the query must return its rows per item
+    (no aggregation across items).
+    """
+
+    def __init__(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        chunk_params: Optional[List[str]] = None,
+        chunk_size: int = CYPHER_CHUNK_SIZE,
+    ):
+        self.query = query
+        self.params = params if params is not None else {}
+        self.chunk_params = chunk_params if chunk_params is not None else []
+        self.chunk_size = chunk_size
+
+    def chunks(self) -> List["CypherQuery"]:
+        chunked_params = [
+            _chunk_items(self.params[_], self.chunk_size)
+            for _ in self.chunk_params
+        ]
+        res = [
+            CypherQuery(
+                query=self.query,
+                params={**self.params, **dict(zip(self.chunk_params, _))},
+            )
+            for _ in itertools.product(*chunked_params)
+        ]
+        return res
+
+    def render(self) -> str:
+        """The query text with the parameters inlined as literals.
+
+        `$name`s not in `params`, or inside string literals and
+        comments, are kept as is. Strings are inlined as json quoted
+        literals, which is the only escaping done, i.e. this is text
+        substitution and not server-side parameters.
+        """
+        res = PARAM_PATTERN.sub(self._render_match, self.query)
+        return res
+
+    def _render_match(self, match: "re.Match[str]") -> str:
+        name = match.group("name")
+        if name is None or name not in self.params:
+            return match.group(0)
+        res = to_literal(self.params[name])
+        return res
+
+    def payload(self) -> Dict[str, Any]:
+        # NOTE: the epigraphdb api /cypher endpoint only takes a query
+        # string, so parameters are inlined at send time
+        res = {"query": self.render()}
+        return res
+
+
+def to_literal(value: Any) -> str:
+    if value is None:
+        res = "null"
+    elif isinstance(value, bool):
+        res = "true" if value else "false"
+    elif isinstance(value, numbers.Integral):
+        res = repr(int(value))
+    elif isinstance(value, numbers.Real):
+        if not math.isfinite(value):
+            raise ValueError(f"Non-finite cypher parameter: {value!r}")
+        res = repr(float(value))
+    elif isinstance(value, str):
+        res = json.dumps(value)
+    elif isinstance(value, (list, tuple)):
+        res = "[{items}]".format(items=", ".join(to_literal(_) for _ in value))
+    elif isinstance(value, dict):
+        res = "{{{items}}}".format(
+            items=", ".join(
+                f"`{key}`: {to_literal(_)}" for key, _ in value.items()
+            )
+        )
+    else:
+        raise TypeError(f"Unsupported cypher parameter: {value!r}")
+    return res
+
+
+def query_cypher(query: CypherQuery, config: Config) -> List[Dict[str, Any]]:
+    """Results of all chunks of `query`, queried concurrently
+    and merged in chunk order.
+    """
+    chunk_results = parallel.thread_map(
+        partial(_post_cypher, config=config), query.chunks()
+    )
+    res = [item for chunk in chunk_results for item in chunk]
+    return res
+
+
+async def aquery_cypher(
+    query: CypherQuery, config: Config
+) -> List[Dict[str, Any]]:
+    """Async `query_cypher`."""
+    chunk_results = await asyncio.gather(
+        *[_apost_cypher(_, config=config) for _ in query.chunks()]
+    )
+    res = [item for chunk in chunk_results for item in chunk]
+    return res
+
+
+def _post_cypher(query: CypherQuery, config: Config) -> List[Dict[str, Any]]:
+    url = "{url}/cypher".format(url=config.epigraphdb_api_url)
+    # NOTE: cypher queries are read only, safe to retry
+    r = http_client.post(
+        url, service="epigraphdb_api", retry_post=True, json=query.payload()
+    )
+    r.raise_for_status()
+    res = r.json()["results"]
+    return res
+
+
+async def _apost_cypher(
+    query: CypherQuery, config: Config
+) -> List[Dict[str, Any]]:
+    url = "{url}/cypher".format(url=config.epigraphdb_api_url)
+    r = await http_client.apost(
+        url, service="epigraphdb_api", retry_post=True, json=query.payload()
+    )
+    r.raise_for_status()
+    res = r.json()["results"]
+    return res
+
+
+def _chunk_items(items: List[Any], chunk_size: int) -> List[List[Any]]:
+    items = list(dict.fromkeys(items))
+    res = [
+        items[idx : idx + chunk_size]
+        for idx in range(0, len(items), chunk_size)
+    ]
+    return res
@@ -1,9 +1,14 @@
-from typing import Callable, List
+from typing import Callable, List, Optional
 
-import requests
 from loguru import logger
 
 from ..types import Config
+from . import cypher
+from .gwas_assoc_index import (
+    GWAS_ASSOC_INDEX_FILE,
+    GwasAssocIndex,
+    get_gwas_assoc_index,
+)
 
 from icecream import ic  # noqa
 from pydash import py_  # noqa
@@ -44,6 +49,15 @@ def prefix_filter(ent_ids: List[str], **kwargs) -> List[str]:
     return ent_ids
 
 
+def gwas_assoc_index(config: Config) -> Optional[GwasAssocIndex]:
+    """The precomputed GwasAssocIndex on the data volume, if built."""
+    path = config.data_path / "gwas" / GWAS_ASSOC_INDEX_FILE
+    if not path.exists():
+        return None
+    res = get_gwas_assoc_index(path)
+    return res
+
+
 # NOTE: this func needs to be partialled on the `config` arg
 def exist_with_epigraphdb_mr_eve_mr(
     ent_ids: List[str],
@@ -52,23 +66,30 @@ def exist_with_epigraphdb_mr_eve_mr(
     **kwargs,
 ) -> List[str]:
     logger.info(f"Begin filter MR_EVE_MR, {len(ent_ids)=}")
-    url = "{url}/cypher".format(url=config.epigraphdb_api_url)
+    index = gwas_assoc_index(config)
+    if index is not None:
+        ent_ids = index.filter(ent_ids, meta_rels=["MR_EVE_MR"])
+        if verbose:
+            logger.info(f"Done filter, {len(ent_ids)=}")
+        return ent_ids
     query = """
     MATCH
       (n:Gwas)-[r:MR_EVE_MR]-(m:Gwas)
     WHERE
-      n._id IN {id_list}
+      n._id IN $ent_ids
     RETURN DISTINCT
       n._id AS ent_id
     LIMIT
-      {limit}
-    """.format(
-        id_list=str(ent_ids), limit=len(ent_ids)
+      $limit
+    """
+    cypher_query = cypher.CypherQuery(
+        query=query,
+        params={"ent_ids": ent_ids, "limit": len(ent_ids)},
+        chunk_params=["ent_ids"],
+    )
+    results = set(
+        [_["ent_id"] for _ in cypher.query_cypher(cypher_query, config=config)]
     )
-    payload = {"query": query}
-    r = requests.post(url, json=payload)
-    r.raise_for_status()
-    results = set([_["ent_id"] for _ in r.json()["results"]])
     ent_ids = list(set(ent_ids).intersection(results))
     if verbose:
         logger.info(f"Done filter, {len(ent_ids)=}")
@@ -82,25 +103,33 @@ def exist_with_epigraphdb_undirectional_assoc(
     **kwargs,
 ) -> List[str]:
     logger.info(f"Begin filter undirectional assoc, {len(ent_ids)=}")
-    url = "{url}/cypher".format(url=config.epigraphdb_api_url)
-    # MAYBE: this needs to be fetched from an cached ent list,
-    # ideally in web backend api, rather than from the graph itself
+    index = gwas_assoc_index(config)
+    if index is not None:
+        ent_ids = index.filter(
+            ent_ids, meta_rels=["MR_EVE_MR", "PRS", "GEN_COR"]
+        )
+        if verbose:
+            logger.info(f"Done filter, {len(ent_ids)=}")
+        return ent_ids
+    # NOTE: graph fallback when the gwas assoc index is not built
     query = """
     MATCH
       (n:Gwas)-[r:MR_EVE_MR|PRS|GEN_COR]-(m:Gwas)
     WHERE
-      n._id IN {id_list}
+      n._id IN $ent_ids
     RETURN DISTINCT
       n._id AS ent_id
     LIMIT
-      {limit}
-    """.format(
-        id_list=str(ent_ids), limit=len(ent_ids)
+      $limit
+    """
+    cypher_query = cypher.CypherQuery(
+        query=query,
+        params={"ent_ids": ent_ids, "limit": len(ent_ids)},
+        chunk_params=["ent_ids"],
+    )
+    results = set(
+        [_["ent_id"] for _ in cypher.query_cypher(cypher_query, config=config)]
     )
-    payload = {"query": query}
-    r = requests.post(url, json=payload)
-    r.raise_for_status()
-    results = set([_["ent_id"] for _ in r.json()["results"]])
     ent_ids = list(set(ent_ids).intersection(results))
     if verbose:
         logger.info(f"Done filter, {len(ent_ids)=}")
@@ -0,0 +1,58 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+from loguru import logger
+
+GWAS_ASSOC_INDEX_FILE = "gwas_assoc_index.npz"
+GWAS_ASSOC_META_RELS = ["MR_EVE_MR", "PRS", "GEN_COR"]
+
+
+class GwasAssocIndex:
+    """Sorted arrays of the GWAS ids with at least one edge of each
+    meta rel, for local association existence lookups.
+    """
+
+    def __init__(self, ent_ids: Dict[str, np.ndarray]):
+        self.ent_ids = {
+            meta_rel: np.unique(np.asarray(ids, dtype=str))
+            for meta_rel, ids in ent_ids.items()
+        }
+
+    @classmethod
+    def from_npz(cls, path: Path) -> "GwasAssocIndex":
+        logger.info(f"Load gwas assoc index from {path}")
+        with np.load(path) as data:
+            res = cls(ent_ids={_: data[_] for _ in data.files})
+        return res
+
+    def to_npz(self, path: Path) -> None:
+        np.savez_compressed(path, **self.ent_ids)
+
+    def contains(self, ent_ids: List[str], meta_rels: List[str]) -> np.ndarray:
+        """Whether each of `ent_ids` has an edge of any of `meta_rels`."""
+        query = np.asarray(ent_ids, dtype=str)
+        res = np.zeros(len(query), dtype=bool)
+        for meta_rel in meta_rels:
+            index_ids = self.ent_ids[meta_rel]
+            if len(index_ids) == 0:
+                continue
+            pos = np.searchsorted(index_ids, query)
+            pos = np.minimum(pos, len(index_ids) - 1)
+            res |= index_ids[pos] == query
+        return res
+
+    def filter(self, ent_ids: List[str], meta_rels: List[str]) -> List[str]:
+        ent_ids = list(dict.fromkeys(ent_ids))
+        if len(ent_ids) == 0:
+            return []
+        mask = self.contains(ent_ids, meta_rels=meta_rels)
+        res = [_ for _, keep in zip(ent_ids, mask) if keep]
+        return res
+
+
+@lru_cache(maxsize=None)
+def get_gwas_assoc_index(path: Path) -> GwasAssocIndex:
+    """Per-process GwasAssocIndex, the file is only read on a cold start."""
+    return GwasAssocIndex.from_npz(path)
@@ -0,0 +1,176 @@
+import asyncio
+import random
+import threading
+from asyncio import AbstractEventLoop
+from typing import Dict, Tuple
+from weakref import WeakKeyDictionary
+
+import httpx
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# NOTE: read timeouts (seconds) by upstream service,
+# cypher queries and semrep parsing can be slow
+TIMEOUTS: Dict[str, float] = {
+    "default": 60.0,
+    "epigraphdb_api": 120.0,
+    "epigraphdb_web_backend": 120.0,
+    "epigraphdb_neural": 30.0,
+    "neural_transformers": 60.0,
+    "neural_models": 30.0,
+    "medline": 60.0,
+    "semrep": 60.0,
+}
+CONNECT_TIMEOUT = 10.0
+# NOTE: upper bound on in-flight async requests per event loop
+MAX_CONCURRENCY = 32
+POOL_SIZE = 32
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUS = (429, 500, 502, 503, 504)
+# NOTE: POSTs are retried only when the caller marks them read only
+IDEMPOTENT_METHODS = Retry.DEFAULT_ALLOWED_METHODS
+
+
+def get_timeout(service: str) -> Tuple[float, float]:
+    res = (CONNECT_TIMEOUT, TIMEOUTS.get(service, TIMEOUTS["default"]))
+    return res
+
+
+# ---- sync ----
+
+_local = threading.local()
+
+
+def get_session(retry_post: bool = False) -> requests.Session:
+    """Per-thread pooled session, retrying idempotent failures
+    with exponential backoff, and POST failures with `retry_post`.
+    """
+    attr = "retry_post_session" if retry_post else "session"
+    session = getattr(_local, attr, None)
+    if session is None:
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS,
+            allowed_methods=(
+                IDEMPOTENT_METHODS | {"POST"}
+                if retry_post
+                else IDEMPOTENT_METHODS
+            ),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=POOL_SIZE,
+            pool_maxsize=POOL_SIZE,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        setattr(_local, attr, session)
+    return session
+
+
+def get(url: str, service: str = "default", **kwargs) -> requests.Response:
+    kwargs.setdefault("timeout", get_timeout(service))
+    res = get_session().get(url, **kwargs)
+    return res
+
+
+def post(
+    url: str, service: str = "default", retry_post: bool = False, **kwargs
+) -> requests.Response:
+    """POST `url`, retried on failures only with `retry_post`,
+    i.e. for read only endpoints.
+    """
+    kwargs.setdefault("timeout", get_timeout(service))
+    res = get_session(retry_post=retry_post).post(url, **kwargs)
+    return res
+
+
+# ---- async ----
+
+# NOTE: httpx clients and semaphores are bound to an event loop
+AsyncClient = Tuple[httpx.AsyncClient, asyncio.Semaphore]
+_async_clients: "WeakKeyDictionary[AbstractEventLoop, AsyncClient]" = (
+    WeakKeyDictionary()
+)
+
+
+def get_async_client() -> AsyncClient:
+    loop = asyncio.get_event_loop()
+    item = _async_clients.get(loop)
+    if item is None:
+        # NOTE: open connections refer back to their loop, so clients of
+        #       closed loops are dropped here, they can no longer be closed
+        for closed_loop in [_ for _ in _async_clients if _.is_closed()]:
+            del _async_clients[closed_loop]
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONCURRENCY,
+                max_keepalive_connections=POOL_SIZE,
+            ),
+        )
+        item = (client, asyncio.Semaphore(MAX_CONCURRENCY))
+        _async_clients[loop] = item
+    return item
+
+
+async def close_async_client() -> None:
+    item = _async_clients.pop(asyncio.get_event_loop(), None)
+    if item is not None:
+        await item[0].aclose()
+
+
+async def arequest(
+    method: str,
+    url: str,
+    service: str = "default",
+    retry_post: bool = False,
+    **kwargs,
+) -> httpx.Response:
+    """Request with bounded concurrency, retrying connection errors
+    and `RETRY_STATUS` responses of idempotent requests (and POSTs
+    with `retry_post`) with exponential backoff and jitter.
+    """
+    client, semaphore = get_async_client()
+    max_retries = (
+        MAX_RETRIES
+        if method in IDEMPOTENT_METHODS or (method == "POST" and retry_post)
+        else 0
+    )
+    connect_timeout, read_timeout = get_timeout(service)
+    kwargs.setdefault(
+        "timeout", httpx.Timeout(read_timeout, connect=connect_timeout)
+    )
+    for attempt in range(max_retries + 1):
+        try:
+            async with semaphore:
+                r = await client.request(method, url, **kwargs)
+            if r.status_code not in RETRY_STATUS or attempt == max_retries:
+                return r
+            logger.debug(f"{url=} status {r.status_code}, {attempt=}")
+        except httpx.TransportError as e:
+            if attempt == max_retries:
+                raise
+            logger.debug(f"{url=} {e!r}, {attempt=}")
+        delay = BACKOFF_FACTOR * (2**attempt)
+        await asyncio.sleep(delay + random.uniform(0, delay))
+    raise RuntimeError("unreachable")  # mypy
+
+
+async def aget(url: str, service: str = "default", **kwargs) -> httpx.Response:
+    res = await arequest("GET", url, service=service, **kwargs)
+    return res
+
+
+async def apost(
+    url: str, service: str = "default", retry_post: bool = False, **kwargs
+) -> httpx.Response:
+    res = await arequest(
+        "POST", url, service=service, retry_post=retry_post, **kwargs
+    )
+    return res
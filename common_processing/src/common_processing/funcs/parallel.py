@@ -0,0 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# NOTE: upper bound on in-flight requests to a single upstream service
+MAX_WORKERS = 8
+
+
+def thread_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = MAX_WORKERS,
+) -> List[R]:
+    """Map `func` over `items` on a bounded thread pool,
+    results are returned in the order of `items`.
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [func(_) for _ in items]
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(items))
+    ) as executor:
+        res = list(executor.map(func, items))
+    return res
@@ -1,13 +1,16 @@
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
+import pandas as pd
 import pandera as pa
 from loguru import logger
 from pandera.typing import DataFrame
 from pydantic import validate_arguments
 
+from ..funcs.cache import CacheBackend
 from ..settings import params
 from ..types import Config, literature_types
 from . import processing
+from .cache import make_literature_cache  # noqa
 
 
 class LiteratureLiteEvidenceProcessor:
@@ -29,43 +32,57 @@ class LiteratureLiteEvidenceProcessor:
         return self._evidence_df
 
     def process(self, triples: List[literature_types.TripleItem]) -> bool:
-
         if len(triples) == 0:
-            logger.debug("Empty triple items")
-            empty_df = (
-                literature_types.LiteratureLiteEvidenceDf.example(size=1)
-                .iloc[:0, :]
-                .copy()
-            )
-            self._evidence_df = empty_df
-            return False
-
+            return self._set_empty(triples)
         self._literature_info_df = processing.get_literature_info_df(
             triple_items=triples, config=self.config
         )
+        res = self._make_results(triples)
+        return res
+
+    async def aprocess(
+        self, triples: List[literature_types.TripleItem]
+    ) -> bool:
+        if len(triples) == 0:
+            return self._set_empty(triples)
+        self._literature_info_df = await processing.aget_literature_info_df(
+            triple_items=triples, config=self.config
+        )
+        res = self._make_results(triples)
+        return res
 
+    def _set_empty(self, triples: List[literature_types.TripleItem]) -> bool:
+        if len(triples) == 0:
+            logger.debug("Empty triple items")
+        else:
+            logger.debug(f"empty pubmed_df {triples=}")
+        empty_df = (
+            literature_types.LiteratureLiteEvidenceDf.example(size=1)
+            .iloc[:0, :]
+            .copy()
+        )
+        self._evidence_df = empty_df
+        return False
+
+    def _make_results(
+        self, triples: List[literature_types.TripleItem]
+    ) -> bool:
         self._pubmed_df = processing.make_pubmed_df(
             literature_df=self._literature_info_df,
             num_items_per_triple=None,
         )
         if len(self._pubmed_df) == 0:
-            logger.debug(f"empty pubmed_df {triples=}")
-            empty_df = (
-                literature_types.LiteratureLiteEvidenceDf.example(size=1)
-                .iloc[:0, :]
-                .copy()
-            )
-            self._evidence_df = empty_df
-            return False
+            return self._set_empty(triples)
         else:
             self._evidence_df = self._pubmed_df
             return True
 
 
 class LiteratureEvidenceProcessor:
-    @validate_arguments
-    def __init__(self, config: Config):
+    @validate_arguments(config=dict(arbitrary_types_allowed=True))
+    def __init__(self, config: Config, cache: Optional[CacheBackend] = None):
         self.config = config
+        self.cache = cache
         self.reset()
 
     def reset(self):
@@ -88,14 +105,7 @@ class LiteratureEvidenceProcessor:
         # NOTE: for now don't attempt that series of try except yet
 
         if len(triples) == 0:
-            logger.debug("Empty triple items")
-            empty_df = (
-                literature_types.LiteratureEvidenceDf.example(size=1)
-                .iloc[:0, :]
-                .copy()
-            )
-            self._evidence_df = empty_df
-            return False
+            return self._set_empty(triples)
 
         # step: get SEMMEDDB_TO_LIT links to literature nodes from triples
         self._literature_info_df = processing.get_literature_info_df(
@@ -108,22 +118,19 @@ class LiteratureEvidenceProcessor:
             num_items_per_triple=num_items_per_triple,
         )
         if len(self._pubmed_df) == 0:
-            logger.debug(f"empty pubmed_df {triples=}")
-            empty_df = (
-                literature_types.LiteratureEvidenceDf.example(size=1)
-                .iloc[:0, :]
-                .copy()
-            )
-            self._evidence_df = empty_df
-            return False
+            return self._set_empty(triples)
         # step: get sentence mentioning the triple
         self._sentence_df = processing.get_sentence_df(
-            pubmed_df=self._pubmed_df, config=self.config
+            pubmed_df=self._pubmed_df,
+            config=self.config,
+            cache=self.cache,
         )
 
         # step: get fulltext (abstract) involving the sentence
         self._fulltext_df = processing.get_fulltext_df(
-            sentence_df=self._sentence_df, config=self.config
+            sentence_df=self._sentence_df,
+            config=self.config,
+            cache=self.cache,
         )
 
         # step: combine together
@@ -133,3 +140,85 @@ class LiteratureEvidenceProcessor:
             fulltext_df=self._fulltext_df,
         )
         return True
+
+    async def aprocess(
+        self,
+        triples: List[literature_types.TripleItem],
+        num_items_per_triple: int = params.NUM_LITERATURE_ITEMS_PER_TRIPLE,
+    ) -> bool:
+        """Async `process`, requests within each step are concurrent."""
+        if len(triples) == 0:
+            return self._set_empty(triples)
+        self._literature_info_df = await processing.aget_literature_info_df(
+            triple_items=triples, config=self.config
+        )
+        self._pubmed_df = processing.make_pubmed_df(
+            literature_df=self._literature_info_df,
+            num_items_per_triple=num_items_per_triple,
+        )
+        if len(self._pubmed_df) == 0:
+            return self._set_empty(triples)
+        self._sentence_df = await processing.aget_sentence_df(
+            pubmed_df=self._pubmed_df,
+            config=self.config,
+            cache=self.cache,
+        )
+        self._fulltext_df = await processing.aget_fulltext_df(
+            sentence_df=self._sentence_df,
+            config=self.config,
+            cache=self.cache,
+        )
+        self._evidence_df = processing.make_literature_evidence_df(
+            pubmed_df=self._pubmed_df,
+            sentence_df=self._sentence_df,
+            fulltext_df=self._fulltext_df,
+        )
+        return True
+
+    async def astream(
+        self,
+        triples: List[literature_types.TripleItem],
+        num_items_per_triple: int = params.NUM_LITERATURE_ITEMS_PER_TRIPLE,
+    ) -> AsyncIterator[DataFrame[literature_types.LiteratureEvidenceDf]]:
+        """`aprocess` yielding the evidence of each pubmed id as soon as
+        it is ready, `evidence_df` holds all of it once exhausted.
+        """
+        if len(triples) == 0:
+            self._set_empty(triples)
+            return
+        self._literature_info_df = await processing.aget_literature_info_df(
+            triple_items=triples, config=self.config
+        )
+        self._pubmed_df = processing.make_pubmed_df(
+            literature_df=self._literature_info_df,
+            num_items_per_triple=num_items_per_triple,
+        )
+        if len(self._pubmed_df) == 0:
+            self._set_empty(triples)
+            return
+        evidence_dfs = {}
+        async for idx, evidence_df in processing.aiter_literature_evidence_dfs(
+            pubmed_df=self._pubmed_df, config=self.config, cache=self.cache
+        ):
+            evidence_dfs[idx] = evidence_df
+            yield evidence_df
+        if len(evidence_dfs) == 0:
+            self._set_empty(triples)
+            return
+        # NOTE: by first appearance of the pubmed id in pubmed_df
+        self._evidence_df = pd.concat(
+            [evidence_dfs[_] for _ in sorted(evidence_dfs)]
+        ).reset_index(drop=True)
+
+    def _set_empty(self, triples: List[literature_types.TripleItem]) -> bool:
+        if len(triples) == 0:
+            logger.debug("Empty triple items")
+        else:
+            logger.debug(f"empty pubmed_df {triples=}")
+        empty_df = (
+            literature_types.LiteratureEvidenceDf.example(size=1)
+            .iloc[:0, :]
+            .copy()
+        )
+        self._evidence_df = empty_df
+        return False
@@ -0,0 +1,49 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..funcs.cache import CacheBackend, make_tiered_cache
+
+# NOTE: literature payloads change with the upstream data release,
+# bump this to invalidate all existing entries
+CACHE_VERSION = "1"
+DEFAULT_TTL = 30 * 24 * 60 * 60  # 30 days
+
+
+def make_literature_cache(
+    path: Optional[Path] = None,
+    redis_url: Optional[str] = None,
+    ttl: Optional[float] = DEFAULT_TTL,
+    max_entries: int = 200_000,
+) -> CacheBackend:
+    res = make_tiered_cache(
+        path=path, redis_url=redis_url, ttl=ttl, max_entries=max_entries
+    )
+    return res
+
+
+def make_cache_key(kind: str, pubmed_id: str) -> str:
+    res = f"literature:{kind}:{CACHE_VERSION}:{pubmed_id}"
+    return res
+
+
+def get_many(
+    backend: Optional[CacheBackend], kind: str, pubmed_ids: List[str]
+) -> Dict[str, Any]:
+    """Cached payloads by pubmed id, misses are left out."""
+    if backend is None:
+        return {}
+    res = {}
+    for pubmed_id in pubmed_ids:
+        value = backend.get(make_cache_key(kind, pubmed_id))
+        if value is not None:
+            res[pubmed_id] = value
+    return res
+
+
+def set_many(
+    backend: Optional[CacheBackend], kind: str, payloads: Dict[str, Any]
+) -> None:
+    if backend is None:
+        return None
+    for pubmed_id, value in payloads.items():
+        backend.set(make_cache_key(kind, pubmed_id), value)
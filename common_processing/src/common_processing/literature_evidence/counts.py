@@ -0,0 +1,40 @@
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+LITERATURE_COUNT_DB_FILE = "literature_counts.db"
+LITERATURE_COUNT_TABLE = "LITERATURE_COUNT"
+# NOTE: below the sqlite host parameter limit
+SQLITE_CHUNK_SIZE = 500
+
+
+def lookup_literature_counts(
+    db_path: Path, triple_ids: List[str]
+) -> pd.DataFrame:
+    """Precomputed per triple literature counts,
+    triples absent from the table have no literature.
+    """
+    triple_ids = list(dict.fromkeys(triple_ids))
+    count_map: Dict[str, int] = {}
+    with closing(sqlite3.connect(db_path)) as conn:
+        for idx in range(0, len(triple_ids), SQLITE_CHUNK_SIZE):
+            chunk = triple_ids[idx : idx + SQLITE_CHUNK_SIZE]
+            query = """
+            SELECT triple_id, literature_count FROM {table}
+            WHERE triple_id IN ({placeholders})
+            """.format(
+                table=LITERATURE_COUNT_TABLE,
+                placeholders=",".join("?" for _ in chunk),
+            )
+            count_map.update(conn.execute(query, chunk).fetchall())
+    res = pd.DataFrame(
+        [
+            {"triple_id": _, "literature_count": count_map.get(_, 0)}
+            for _ in triple_ids
+        ],
+        columns=["triple_id", "literature_count"],
+    ).astype({"triple_id": str, "literature_count": int})
+    return res
@@ -1,14 +1,21 @@
-from typing import List, Optional
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import pandas as pd
 import pandera as pa
-import requests
 from loguru import logger
 from pandera.engines.numpy_engine import Object
 from pandera.typing import DataFrame, Series
 
-from ..funcs import component_query
+from ..funcs import component_query, cypher, http_client, parallel
+from ..funcs.cache import CacheBackend
 from ..types import Config, literature_types
+from . import cache as literature_cache
+from . import counts
+
+LITERATURE_LIMIT_PER_TRIPLE = 20
+# NOTE: number of triples per UNWIND query
+TRIPLE_CHUNK_SIZE = 50
 
 
 class _LiteratureInfoQueryDf(pa.SchemaModel):
@@ -34,8 +41,11 @@ class _LiteratureInfoQueryDf(pa.SchemaModel):
     )
 
 
-class _LiteratureInfoDf(_LiteratureInfoQueryDf):
+class _LiteratureInfoBatchQueryDf(_LiteratureInfoQueryDf):
     triple_id: Series[str]
+
+
+class _LiteratureInfoDf(_LiteratureInfoBatchQueryDf):
     triple_lower: Series[str]
 
 
@@ -77,47 +87,164 @@ def get_literature_info_df(
     triple_items: List[literature_types.TripleItem],
     config: Config,
 ) -> DataFrame[_LiteratureInfoDf]:
-    @pa.check_types
-    def _query(
-        triple_id: str,
-    ) -> DataFrame[_LiteratureInfoQueryDf]:
-        # NOTE: currently limited to SEMMEDDB
-        # MAYBE: drop hard coded literature limit
-        query_template = """
-        MATCH (triple:LiteratureTriple)-[r:SEMMEDDB_TO_LIT]->(literature:Literature)
-        WHERE triple._id = "{id}"
-        RETURN
-            literature
-        LIMIT 20
-        """
-        query = query_template.format(id=triple_id)
-        url = "{url}/cypher".format(url=config.epigraphdb_api_url)
-        r = requests.post(url, json={"query": query})
-        r.raise_for_status()
-        results = r.json()["results"]
-        if len(results) == 0:
-            logger.debug(f"empty df, {triple_id=}")
-            empty_df = (
-                _LiteratureInfoQueryDf.example(size=1).iloc[:0, :].copy()
-            )
-            return empty_df
-        query_df = pd.json_normalize(results)
-        return query_df
+    results = cypher.query_cypher(
+        _literature_info_query(triple_items=triple_items), config=config
+    )
+    res = _make_literature_info_df(results=results, triple_items=triple_items)
+    return res
+
+
+async def aget_literature_info_df(
+    triple_items: List[literature_types.TripleItem],
+    config: Config,
+) -> DataFrame[_LiteratureInfoDf]:
+    """Async `get_literature_info_df`."""
+    results = await cypher.aquery_cypher(
+        _literature_info_query(triple_items=triple_items), config=config
+    )
+    res = _make_literature_info_df(results=results, triple_items=triple_items)
+    return res
+
 
-    literature_info_df = pd.concat(
+def _literature_info_query(
+    triple_items: List[literature_types.TripleItem],
+) -> cypher.CypherQuery:
+    """Queried in chunks of `TRIPLE_CHUNK_SIZE` distinct triples,
+    each triple capped at `LITERATURE_LIMIT_PER_TRIPLE` items.
+    """
+    # NOTE: currently limited to SEMMEDDB
+    # MAYBE: drop hard coded literature limit
+    query = """
+    UNWIND $triple_ids AS triple_id
+    MATCH (triple:LiteratureTriple)-[r:SEMMEDDB_TO_LIT]->(literature:Literature)
+    WHERE triple._id = triple_id
+    WITH triple_id, collect(literature)[..$limit] AS literature_list
+    UNWIND literature_list AS literature
+    RETURN
+        triple_id, literature
+    """
+    res = cypher.CypherQuery(
+        query=query,
+        params={
+            "triple_ids": [_["triple_id"] for _ in triple_items],
+            "limit": LITERATURE_LIMIT_PER_TRIPLE,
+        },
+        chunk_params=["triple_ids"],
+        chunk_size=TRIPLE_CHUNK_SIZE,
+    )
+    return res
+
+
+@pa.check_types
+def _make_literature_info_query_df(
+    results: List[Dict[str, Any]]
+) -> DataFrame[_LiteratureInfoBatchQueryDf]:
+    if len(results) == 0:
+        empty_df = (
+            _LiteratureInfoBatchQueryDf.example(size=1).iloc[:0, :].copy()
+        )
+        return empty_df
+    query_df = pd.json_normalize(results)
+    return query_df
+
+
+@pa.check_types
+def _make_literature_info_df(
+    results: List[Dict[str, Any]],
+    triple_items: List[literature_types.TripleItem],
+) -> DataFrame[_LiteratureInfoDf]:
+    query_df = _make_literature_info_query_df(results=results)
+    triple_df = pd.DataFrame(
         [
-            _query(triple_id=_["triple_id"]).assign(
-                triple_id=_["triple_id"],
-                triple_lower=_["triple_label"].lower(),
-            )
+            {
+                "triple_id": _["triple_id"],
+                "triple_lower": _["triple_label"].lower(),
+            }
             for _ in triple_items
-        ]
+        ],
+        columns=["triple_id", "triple_lower"],
+    )
+    literature_info_df = query_df.merge(
+        triple_df, on="triple_id", how="inner"
     ).reset_index(drop=True)
     logger.info(f"{len(literature_info_df)=}")
     logger.info(f"{literature_info_df.groupby('triple_lower').size()=}")
     return literature_info_df
 
 
+@pa.check_types
+def get_literature_count_df(
+    triple_ids: List[str], config: Config
+) -> DataFrame[literature_types.LiteratureCountDf]:
+    """Number of literature items per triple, without the per triple
+    limit of `get_literature_info_df`.
+
+    Served from the precomputed count table on the data volume
+    when available, otherwise counted on the graph.
+    """
+    db_path = config.data_path / "literature" / counts.LITERATURE_COUNT_DB_FILE
+    if db_path.exists():
+        res = counts.lookup_literature_counts(
+            db_path=db_path, triple_ids=triple_ids
+        )
+        return res
+    results = cypher.query_cypher(
+        _literature_count_query(triple_ids=triple_ids), config=config
+    )
+    res = _make_literature_count_df(results=results, triple_ids=triple_ids)
+    return res
+
+
+async def aget_literature_count_df(
+    triple_ids: List[str], config: Config
+) -> DataFrame[literature_types.LiteratureCountDf]:
+    """Async `get_literature_count_df`."""
+    db_path = config.data_path / "literature" / counts.LITERATURE_COUNT_DB_FILE
+    if db_path.exists():
+        res = counts.lookup_literature_counts(
+            db_path=db_path, triple_ids=triple_ids
+        )
+        return res
+    results = await cypher.aquery_cypher(
+        _literature_count_query(triple_ids=triple_ids), config=config
+    )
+    res = _make_literature_count_df(results=results, triple_ids=triple_ids)
+    return res
+
+
+def _literature_count_query(triple_ids: List[str]) -> cypher.CypherQuery:
+    query = """
+    UNWIND $triple_ids AS triple_id
+    MATCH (triple:LiteratureTriple)-[r:SEMMEDDB_TO_LIT]->(literature:Literature)
+    WHERE triple._id = triple_id
+    RETURN
+        triple_id, count(DISTINCT literature) AS literature_count
+    """
+    res = cypher.CypherQuery(
+        query=query,
+        params={"triple_ids": triple_ids},
+        chunk_params=["triple_ids"],
+        chunk_size=TRIPLE_CHUNK_SIZE,
+    )
+    return res
+
+
+@pa.check_types
+def _make_literature_count_df(
+    results: List[Dict[str, Any]], triple_ids: List[str]
+) -> DataFrame[literature_types.LiteratureCountDf]:
+    # NOTE: triples without literature are not returned by the query
+    count_map = {_["triple_id"]: _["literature_count"] for _ in results}
+    res = pd.DataFrame(
+        [
+            {"triple_id": _, "literature_count": count_map.get(_, 0)}
+            for _ in dict.fromkeys(triple_ids)
+        ],
+        columns=["triple_id", "literature_count"],
+    ).astype({"triple_id": str, "literature_count": int})
+    return res
+
+
 @pa.check_types
 def make_pubmed_df(
     literature_df: DataFrame[_LiteratureInfoDf],
@@ -144,37 +271,115 @@ def make_pubmed_df(
 
 @pa.check_types
 def get_sentence_df(
-    pubmed_df: DataFrame[_PubmedDf], config: Config
+    pubmed_df: DataFrame[_PubmedDf],
+    config: Config,
+    cache: Optional[CacheBackend] = None,
+) -> DataFrame[_SentenceDf]:
+    """Sentences of each pubmed item mentioning its triple.
+
+    Each distinct pubmed id is fetched once (or loaded from `cache`),
+    then filtered for the triples it supports.
+    """
+    # url = "{url}/sentence/".format(url=config.melodi_presto_api_url)
+    # r = requests.post(url, json={"pmid": str(lit_id)})
+    url = "{url}/components/melodi-presto".format(
+        url=config.epigraphdb_web_backend_url
+    )
+
+    def _query(lit_id: str) -> List[Dict[str, Any]]:
+        r = http_client.post(
+            url,
+            service="epigraphdb_web_backend",
+            json=_sentence_payload(lit_id=lit_id),
+        )
+        r.raise_for_status()
+        res = r.json()["data"]
+        return res
+
+    lit_ids = list(dict.fromkeys(pubmed_df["pubmed_id"].tolist()))
+    sentence_results = literature_cache.get_many(cache, "sentence", lit_ids)
+    missing_ids = [_ for _ in lit_ids if _ not in sentence_results]
+    fetched = dict(zip(missing_ids, parallel.thread_map(_query, missing_ids)))
+    literature_cache.set_many(cache, "sentence", fetched)
+    sentence_results.update(fetched)
+    sentence_df = _make_sentence_df(
+        pubmed_df=pubmed_df, sentence_results=sentence_results
+    )
+    return sentence_df
+
+
+async def aget_sentence_df(
+    pubmed_df: DataFrame[_PubmedDf],
+    config: Config,
+    cache: Optional[CacheBackend] = None,
 ) -> DataFrame[_SentenceDf]:
-    @pa.check_types
-    def _query(lit_id: str, triple_lower: str) -> DataFrame[_SentenceQueryDf]:
-        # url = "{url}/sentence/".format(url=config.melodi_presto_api_url)
-        # r = requests.post(url, json={"pmid": str(lit_id)})
-        url = "{url}/components/melodi-presto".format(
-            url=config.epigraphdb_web_backend_url
+    """Async `get_sentence_df`, pubmed ids are queried concurrently."""
+    url = "{url}/components/melodi-presto".format(
+        url=config.epigraphdb_web_backend_url
+    )
+
+    async def _query(lit_id: str) -> List[Dict[str, Any]]:
+        r = await http_client.apost(
+            url,
+            service="epigraphdb_web_backend",
+            json=_sentence_payload(lit_id=lit_id),
         )
-        payload = {
-            "endpoint": "/sentence/",
-            "method": "POST",
-            "params": {"pmid": lit_id},
-        }
-        r = requests.post(url, json=payload)
         r.raise_for_status()
-        results = r.json()["data"]
-        df = pd.json_normalize(results)
-        if len(results) == 0:
-            logger.debug(f"empty df {lit_id=} {triple_lower=}")
-            empty_df = _SentenceQueryDf.example(size=1).iloc[:0, :].copy()
-            return empty_df
-        else:
-            df = df[
-                df["SUB_PRED_OBJ"].apply(lambda x: x.lower() == triple_lower)
-            ]
-            return df
+        res = r.json()["data"]
+        return res
+
+    lit_ids = list(dict.fromkeys(pubmed_df["pubmed_id"].tolist()))
+    sentence_results = literature_cache.get_many(cache, "sentence", lit_ids)
+    missing_ids = [_ for _ in lit_ids if _ not in sentence_results]
+    fetched = dict(
+        zip(
+            missing_ids,
+            await asyncio.gather(*[_query(_) for _ in missing_ids]),
+        )
+    )
+    literature_cache.set_many(cache, "sentence", fetched)
+    sentence_results.update(fetched)
+    sentence_df = _make_sentence_df(
+        pubmed_df=pubmed_df, sentence_results=sentence_results
+    )
+    return sentence_df
+
+
+def _sentence_payload(lit_id: str) -> Dict[str, Any]:
+    payload = {
+        "endpoint": "/sentence/",
+        "method": "POST",
+        "params": {"pmid": lit_id},
+    }
+    return payload
+
+
+@pa.check_types
+def _make_sentence_query_df(
+    results: List[Dict[str, Any]], lit_id: str, triple_lower: str
+) -> DataFrame[_SentenceQueryDf]:
+    df = pd.json_normalize(results)
+    if len(results) == 0:
+        logger.debug(f"empty df {lit_id=} {triple_lower=}")
+        empty_df = _SentenceQueryDf.example(size=1).iloc[:0, :].copy()
+        return empty_df
+    else:
+        df = df[df["SUB_PRED_OBJ"].apply(lambda x: x.lower() == triple_lower)]
+        return df
 
+
+@pa.check_types
+def _make_sentence_df(
+    pubmed_df: DataFrame[_PubmedDf],
+    sentence_results: Dict[str, List[Dict[str, Any]]],
+) -> DataFrame[_SentenceDf]:
     sentence_df = pd.concat(
         [
-            _query(lit_id=_["pubmed_id"], triple_lower=_["triple_lower"])
+            _make_sentence_query_df(
+                results=sentence_results[_["pubmed_id"]],
+                lit_id=_["pubmed_id"],
+                triple_lower=_["triple_lower"],
+            )
             for _ in pubmed_df.to_dict(orient="records")
         ]
     ).reset_index(drop=True)
@@ -185,11 +390,24 @@ def get_sentence_df(
 def get_fulltext_df(
     sentence_df: DataFrame[_SentenceDf],
     config: Config,
+    cache: Optional[CacheBackend] = None,
 ) -> DataFrame[component_query.MedlineDf]:
 
     lit_id_list = sentence_df["PMID"].astype(str).tolist()
     fulltext_df = component_query.medline_query(
-        lit_id_list=lit_id_list, url=config.medline_api_url
+        lit_id_list=lit_id_list, url=config.medline_api_url, cache=cache
+    )
+    return fulltext_df
+
+
+async def aget_fulltext_df(
+    sentence_df: DataFrame[_SentenceDf],
+    config: Config,
+    cache: Optional[CacheBackend] = None,
+) -> DataFrame[component_query.MedlineDf]:
+    lit_id_list = sentence_df["PMID"].astype(str).tolist()
+    fulltext_df = await component_query.amedline_query(
+        lit_id_list=lit_id_list, url=config.medline_api_url, cache=cache
     )
     return fulltext_df
 
@@ -220,3 +438,56 @@ def make_literature_evidence_df(
         )
     )
     return df
+
+
+async def aiter_literature_evidence_dfs(
+    pubmed_df: DataFrame[_PubmedDf],
+    config: Config,
+    cache: Optional[CacheBackend] = None,
+) -> AsyncIterator[
+    Tuple[int, DataFrame[literature_types.LiteratureEvidenceDf]]
+]:
+    """Literature evidence of each pubmed id of `pubmed_df` as soon as
+    its sentences and medline record are fetched, in order of completion.
+
+    Yields (position of the pubmed id in `pubmed_df`, evidence_df),
+    pubmed ids without evidence are skipped.
+    """
+
+    async def _evidence(idx: int, lit_pubmed_df: pd.DataFrame):
+        sentence_df = await aget_sentence_df(
+            pubmed_df=lit_pubmed_df, config=config, cache=cache
+        )
+        if len(sentence_df) == 0:
+            return idx, None
+        fulltext_df = await aget_fulltext_df(
+            sentence_df=sentence_df, config=config, cache=cache
+        )
+        evidence_df = make_literature_evidence_df(
+            pubmed_df=lit_pubmed_df,
+            sentence_df=sentence_df,
+            fulltext_df=fulltext_df,
+        )
+        return idx, evidence_df
+
+    lit_ids = list(dict.fromkeys(pubmed_df["pubmed_id"].tolist()))
+    tasks = [
+        asyncio.ensure_future(
+            _evidence(
+                idx,
+                pubmed_df[pubmed_df["pubmed_id"] == lit_id].reset_index(
+                    drop=True
+                ),
+            )
+        )
+        for idx, lit_id in enumerate(lit_ids)
+    ]
+    try:
+        for task in asyncio.as_completed(tasks):
+            idx, evidence_df = await task
+            if evidence_df is not None and len(evidence_df) > 0:
+                yield idx, evidence_df
+    finally:
+        # NOTE: the consumer stopped early, e.g. a closed stream
+        for task in tasks:
+            task.cancel()
@@ -25,9 +25,8 @@ PRED_DIRECTIONAL_MAPPING = {
 MR_EVE_MR_TEMPLATE = """
     MATCH (source:Gwas)-[r:MR_EVE_MR]-{arrow}(target:Gwas)
     WHERE
-
-        source._id IN [{source_id_list}]
-        AND target._id IN [{target_id_list}]
+        source._id IN $source_ids
+        AND target._id IN $target_ids
         {pval_clause}
     RETURN
         source._id AS source_id,
@@ -42,11 +41,32 @@ MR_EVE_MR_TEMPLATE = """
 """
 
 
+# MR_EVE_MR edges between the two id sets in either direction,
+# `forward` is true when the edge points from source to target
+MR_EVE_MR_EDGES_TEMPLATE = """
+    MATCH (source:Gwas)-[r:MR_EVE_MR]-(target:Gwas)
+    WHERE
+        source._id IN $source_ids
+        AND target._id IN $target_ids
+    RETURN
+        source._id AS source_id,
+        source._name AS source_term,
+        target._id AS target_id,
+        target._name AS target_term,
+        type(r) AS meta_rel,
+        r.b AS effect_size,
+        r.se AS se,
+        r.pval AS pval,
+        r AS rel_data,
+        startNode(r) = source AS forward
+"""
+
+
 PRS_TEMPLATE = """
     MATCH (source:Gwas)-[r:PRS]-(target:Gwas)
     WHERE
-        source._id IN [{source_id_list}]
-        AND target._id IN [{target_id_list}]
+        source._id IN $source_ids
+        AND target._id IN $target_ids
         {pval_clause}
     RETURN
         source._id AS source_id,
@@ -64,8 +84,8 @@ PRS_TEMPLATE = """
 GEN_COR_TEMPLATE = """
     MATCH (source:Gwas)-[r:GEN_COR]-(target:Gwas)
     WHERE
-        source._id IN [{source_id_list}]
-        AND target._id IN [{target_id_list}]
+        source._id IN $source_ids
+        AND target._id IN $target_ids
         {pval_clause}
     RETURN
         source._id AS source_id,
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 import numpy as np
 import pandas as pd
@@ -7,6 +7,12 @@ from pandera.typing import DataFrame
 
 from . import types
 
+# NOTE: position of the claim in a batch, used as a join key
+CLAIM_IDX = "claim_idx"
+
+# NOTE: empty frames of the schemas by schema name, copied on use
+_EMPTY_DFS: Dict[str, pd.DataFrame] = {}
+
 
 @pa.check_types
 def make_assoc_scores(
@@ -17,83 +23,93 @@ def make_assoc_scores(
     ontology_object_mapping: DataFrame[types.OntologyMappingDf],
     trait_subject_mapping: DataFrame[types.TraitMappingDf],
     trait_object_mapping: DataFrame[types.TraitMappingDf],
+    include_mapping_data: bool = True,
 ) -> DataFrame[types.ScoredAssocEvidenceDf]:
+    """`include_mapping_data`: attach the per evidence mapping details,
+    which are only needed for display.
+    """
+    claim = {
+        "assoc_evidence": assoc_evidence,
+        "query_subject_term": query_subject_term,
+        "query_object_term": query_object_term,
+        "ontology_subject_mapping": ontology_subject_mapping,
+        "ontology_object_mapping": ontology_object_mapping,
+        "trait_subject_mapping": trait_subject_mapping,
+        "trait_object_mapping": trait_object_mapping,
+    }
+    res = make_assoc_scores_batch(
+        claims=[claim], include_mapping_data=include_mapping_data
+    )[0]
+    return res
+
+
+def make_assoc_scores_batch(
+    claims: List[Dict[str, Any]], include_mapping_data: bool = True
+) -> List[DataFrame[types.ScoredAssocEvidenceDf]]:
+    """Score many claims in one pass.
+
+    Each of `claims` holds the arguments of `make_assoc_scores`,
+    results are in the order of `claims`.
+    """
+    assoc_evidence = _concat_claims(
+        claims, "assoc_evidence", types.AssocEvidenceDf
+    )
     if len(assoc_evidence) == 0:
-        empty_df = (
-            types.ScoredAssocEvidenceDf.example(size=1).iloc[:0, :].copy()
+        return _split_claims(
+            None,
+            n_claims=len(claims),
+            schema=types.ScoredAssocEvidenceDf,
+            include_mapping_data=include_mapping_data,
         )
-        return empty_df
     subject_mapping_df = _make_trait_mapping_df(
-        query_term=query_subject_term,
-        ontology_mapping_df=ontology_subject_mapping,
-        trait_mapping_df=trait_subject_mapping,
+        query_terms=[_["query_subject_term"] for _ in claims],
+        ontology_mapping_df=_concat_claims(
+            claims, "ontology_subject_mapping", types.OntologyMappingDf
+        ),
+        trait_mapping_df=_concat_claims(
+            claims, "trait_subject_mapping", types.TraitMappingDf
+        ),
     )
     object_mapping_df = _make_trait_mapping_df(
-        query_term=query_object_term,
-        ontology_mapping_df=ontology_object_mapping,
-        trait_mapping_df=trait_object_mapping,
+        query_terms=[_["query_object_term"] for _ in claims],
+        ontology_mapping_df=_concat_claims(
+            claims, "ontology_object_mapping", types.OntologyMappingDf
+        ),
+        trait_mapping_df=_concat_claims(
+            claims, "trait_object_mapping", types.TraitMappingDf
+        ),
     )
     scored_assoc_evidence_df = (
         assoc_evidence.merge(
-            subject_mapping_df.rename(
-                columns={
-                    "mapping_score": "subject_mapping_score",
-                    "data": "subject_mapping_data",
-                }
-            ),
-            left_on="subject_id",
-            right_index=True,
+            _rename_mapping_df(subject_mapping_df, "subject", "subject_id"),
+            on=[CLAIM_IDX, "subject_id"],
         )
         .merge(
-            object_mapping_df.rename(
-                columns={
-                    "mapping_score": "object_mapping_score",
-                    "data": "object_mapping_data",
-                }
-            ),
-            left_on="object_id",
-            right_index=True,
+            _rename_mapping_df(object_mapping_df, "object", "object_id"),
+            on=[CLAIM_IDX, "object_id"],
         )
         .assign(
-            mapping_score=lambda df: df.apply(
-                lambda row: (
-                    row["subject_mapping_score"] * row["object_mapping_score"]
-                ),
-                axis=1,
-            ),
-            assoc_score=lambda df: df.apply(
-                lambda row: _make_assoc_score(
-                    effect_size=row["effect_size"], se=row["se"]
-                ),
-                axis=1,
-            ),
-            mapping_data=lambda df: df.apply(
-                lambda row: {
-                    "subject_mapping_score": row["subject_mapping_score"],
-                    "object_mapping_score": row["object_mapping_score"],
-                    "subject_mapping_data": row["subject_mapping_data"],
-                    "object_mapping_data": row["object_mapping_data"],
-                },
-                axis=1,
+            mapping_score=lambda df: df["subject_mapping_score"]
+            * df["object_mapping_score"],
+            assoc_score=lambda df: _make_assoc_score(
+                effect_size=df["effect_size"].to_numpy(),
+                se=df["se"].to_numpy(),
             ),
         )
+        # NOTE: evidence with any null value is dropped, not only unscored
         .dropna()
-        .drop(
-            columns=[
-                "subject_mapping_score",
-                "object_mapping_score",
-                "subject_mapping_data",
-                "object_mapping_data",
-            ]
-        )
-        .assign(
-            evidence_score=lambda df: df.apply(
-                lambda row: row["mapping_score"] * row["assoc_score"], axis=1
-            )
-        )
-        .reset_index(drop=True)
     )
-    return scored_assoc_evidence_df
+    scored_assoc_evidence_df = _assign_mapping_data(
+        scored_assoc_evidence_df,
+        include_mapping_data=include_mapping_data,
+    ).assign(evidence_score=lambda df: df["mapping_score"] * df["assoc_score"])
+    res = _split_claims(
+        scored_assoc_evidence_df,
+        n_claims=len(claims),
+        schema=types.ScoredAssocEvidenceDf,
+        include_mapping_data=include_mapping_data,
+    )
+    return res
 
 
 @pa.check_types
@@ -105,156 +121,277 @@ def make_triple_scores(
     ontology_object_mapping: DataFrame[types.OntologyMappingDf],
     umls_subject_mapping: DataFrame[types.UmlsMappingDf],
     umls_object_mapping: DataFrame[types.UmlsMappingDf],
+    include_mapping_data: bool = True,
 ) -> DataFrame[types.ScoredTripleEvidenceDf]:
+    """`include_mapping_data`: attach the per evidence mapping details,
+    which are only needed for display.
+    """
+    claim = {
+        "triple_evidence": triple_evidence,
+        "query_subject_term": query_subject_term,
+        "query_object_term": query_object_term,
+        "ontology_subject_mapping": ontology_subject_mapping,
+        "ontology_object_mapping": ontology_object_mapping,
+        "umls_subject_mapping": umls_subject_mapping,
+        "umls_object_mapping": umls_object_mapping,
+    }
+    res = make_triple_scores_batch(
+        claims=[claim], include_mapping_data=include_mapping_data
+    )[0]
+    return res
+
+
+def make_triple_scores_batch(
+    claims: List[Dict[str, Any]], include_mapping_data: bool = True
+) -> List[DataFrame[types.ScoredTripleEvidenceDf]]:
+    """Score many claims in one pass.
+
+    Each of `claims` holds the arguments of `make_triple_scores`,
+    results are in the order of `claims`.
+    """
+    triple_evidence = _concat_claims(
+        claims, "triple_evidence", types.TripleEvidenceDf
+    )
     if len(triple_evidence) == 0:
-        empty_df = (
-            types.ScoredTripleEvidenceDf.example(size=1).iloc[:0, :].copy()
+        return _split_claims(
+            None,
+            n_claims=len(claims),
+            schema=types.ScoredTripleEvidenceDf,
+            include_mapping_data=include_mapping_data,
         )
-        return empty_df
     subject_mapping_df = _make_umls_mapping_df(
-        query_term=query_subject_term,
-        ontology_mapping_df=ontology_subject_mapping,
-        umls_mapping_df=umls_subject_mapping,
+        query_terms=[_["query_subject_term"] for _ in claims],
+        ontology_mapping_df=_concat_claims(
+            claims, "ontology_subject_mapping", types.OntologyMappingDf
+        ),
+        umls_mapping_df=_concat_claims(
+            claims, "umls_subject_mapping", types.UmlsMappingDf
+        ),
     )
     object_mapping_df = _make_umls_mapping_df(
-        query_term=query_object_term,
-        ontology_mapping_df=ontology_object_mapping,
-        umls_mapping_df=umls_object_mapping,
+        query_terms=[_["query_object_term"] for _ in claims],
+        ontology_mapping_df=_concat_claims(
+            claims, "ontology_object_mapping", types.OntologyMappingDf
+        ),
+        umls_mapping_df=_concat_claims(
+            claims, "umls_object_mapping", types.UmlsMappingDf
+        ),
     )
     scored_triple_evidence_df = (
         triple_evidence.merge(
-            subject_mapping_df.reset_index(drop=False).rename(
-                columns={
-                    "ent_id": "ent_subject_id",
-                    "mapping_score": "subject_mapping_score",
-                    "data": "subject_mapping_data",
-                }
+            _rename_mapping_df(
+                subject_mapping_df, "subject", "ent_subject_id"
             ),
-            on=["ent_subject_id"],
+            on=[CLAIM_IDX, "ent_subject_id"],
         )
         .merge(
-            object_mapping_df.reset_index(drop=False).rename(
-                columns={
-                    "ent_id": "ent_object_id",
-                    "mapping_score": "object_mapping_score",
-                    "data": "object_mapping_data",
-                }
-            ),
-            on=["ent_object_id"],
+            _rename_mapping_df(object_mapping_df, "object", "ent_object_id"),
+            on=[CLAIM_IDX, "ent_object_id"],
         )
         .assign(
-            mapping_score=lambda df: df.apply(
-                lambda row: (
-                    row["subject_mapping_score"] * row["object_mapping_score"]
-                ),
-                axis=1,
-            ),
-            triple_score=lambda df: df.apply(
-                lambda row: _make_triple_score(
-                    literature_count=row["literature_count"]
-                ),
-                axis=1,
-            ),
-            mapping_data=lambda df: df.apply(
-                lambda row: {
-                    "subject_mapping_score": row["subject_mapping_score"],
-                    "object_mapping_score": row["object_mapping_score"],
-                    "subject_mapping_data": row["subject_mapping_data"],
-                    "object_mapping_data": row["object_mapping_data"],
-                },
-                axis=1,
+            mapping_score=lambda df: df["subject_mapping_score"]
+            * df["object_mapping_score"],
+            triple_score=lambda df: _make_triple_score(
+                literature_count=df["literature_count"].to_numpy()
             ),
         )
-        .drop(
-            columns=[
-                "subject_mapping_score",
-                "object_mapping_score",
-                "subject_mapping_data",
-                "object_mapping_data",
-            ]
-        )
-        .assign(
-            evidence_score=lambda df: df.apply(
-                lambda row: row["mapping_score"] * row["triple_score"], axis=1
+    )
+    scored_triple_evidence_df = _assign_mapping_data(
+        scored_triple_evidence_df,
+        include_mapping_data=include_mapping_data,
+    ).assign(
+        evidence_score=lambda df: df["mapping_score"] * df["triple_score"]
+    )
+    res = _split_claims(
+        scored_triple_evidence_df,
+        n_claims=len(claims),
+        schema=types.ScoredTripleEvidenceDf,
+        include_mapping_data=include_mapping_data,
+    )
+    return res
+
+
+def _concat_claims(
+    claims: List[Dict[str, Any]], key: str, schema: Type[pa.SchemaModel]
+) -> pd.DataFrame:
+    """Stack the `key` frames of `claims`, tagged by CLAIM_IDX,
+    and validate them against `schema` in one go.
+    """
+    # NOTE: empty frames (possibly without columns) would upcast dtypes
+    dfs = [
+        claim[key].assign(**{CLAIM_IDX: idx})
+        for idx, claim in enumerate(claims)
+        if len(claim[key]) > 0
+    ]
+    if len(dfs) == 0:
+        dfs = [_empty_df(schema).assign(**{CLAIM_IDX: 0})]
+    df = pd.concat(dfs, ignore_index=True)
+    res = schema.validate(df)
+    return res
+
+
+def _split_claims(
+    df: Optional[pd.DataFrame],
+    n_claims: int,
+    schema: Type[pa.SchemaModel],
+    include_mapping_data: bool,
+) -> List[pd.DataFrame]:
+    empty_df = _empty_df(schema)
+    if not include_mapping_data:
+        empty_df = empty_df.drop(columns=["mapping_data"])
+    claim_dfs = (
+        {
+            claim_idx: claim_df.drop(columns=[CLAIM_IDX]).reset_index(
+                drop=True
             )
+            for claim_idx, claim_df in df.groupby(CLAIM_IDX)
+        }
+        if df is not None
+        else {}
+    )
+    res = [claim_dfs.get(idx, empty_df.copy()) for idx in range(n_claims)]
+    return res
+
+
+def _empty_df(schema: Type[pa.SchemaModel]) -> pd.DataFrame:
+    empty_df = _EMPTY_DFS.get(schema.__name__)
+    if empty_df is None:
+        empty_df = pd.DataFrame(
+            {
+                name: pd.Series(dtype=str(column.dtype))
+                for name, column in schema.to_schema().columns.items()
+            }
         )
-        .reset_index(drop=True)
+        _EMPTY_DFS[schema.__name__] = empty_df
+    res = empty_df.copy()
+    return res
+
+
+def _rename_mapping_df(
+    mapping_df: pd.DataFrame, side: str, ent_id_column: str
+) -> pd.DataFrame:
+    res = mapping_df.reset_index(drop=False).rename(
+        columns={
+            "ent_id": ent_id_column,
+            "mapping_score": f"{side}_mapping_score",
+            "data": f"{side}_mapping_data",
+        }
     )
-    return scored_triple_evidence_df
+    return res
 
 
-@pa.check_types
 def _make_trait_mapping_df(
-    query_term: str,
-    ontology_mapping_df: DataFrame[types.OntologyMappingDf],
-    trait_mapping_df: DataFrame[types.TraitMappingDf],
+    query_terms: List[str],
+    ontology_mapping_df: pd.DataFrame,
+    trait_mapping_df: pd.DataFrame,
 ) -> pd.DataFrame:
-    mapping_df = (
-        trait_mapping_df.merge(
-            ontology_mapping_df[["ent_id", "similarity_score"]].rename(
-                columns={
-                    "ent_id": "ref_ent_id",
-                    "similarity_score": "ref_similarity_score",
-                }
-            ),
-            on=["ref_ent_id"],
-        )
-        .assign(
-            query_term=query_term,
-            mapping_score=lambda df: df.apply(
-                lambda row: row["similarity_score"]
-                * row["ref_similarity_score"],
-                axis=1,
-            ),
-        )
-        .assign(data=lambda df: df.apply(lambda row: row.to_dict(), axis=1))
-        .groupby("ent_id")
-        .agg({"mapping_score": "max", "data": lambda s: s.to_list()})
+    mapping_df = trait_mapping_df.merge(
+        ontology_mapping_df[[CLAIM_IDX, "ent_id", "similarity_score"]].rename(
+            columns={
+                "ent_id": "ref_ent_id",
+                "similarity_score": "ref_similarity_score",
+            }
+        ),
+        on=[CLAIM_IDX, "ref_ent_id"],
+    ).assign(
+        query_term=lambda df: np.array(query_terms, dtype=object)[
+            df[CLAIM_IDX].to_numpy()
+        ],
+        mapping_score=lambda df: df["similarity_score"]
+        * df["ref_similarity_score"],
     )
-    return mapping_df
+    res = _aggregate_mapping_df(mapping_df)
+    return res
 
 
-@pa.check_types
 def _make_umls_mapping_df(
-    query_term: str,
-    ontology_mapping_df: DataFrame[types.OntologyMappingDf],
-    umls_mapping_df: DataFrame[types.UmlsMappingDf],
+    query_terms: List[str],
+    ontology_mapping_df: pd.DataFrame,
+    umls_mapping_df: pd.DataFrame,
 ) -> pd.DataFrame:
     mapping_df = (
         umls_mapping_df.merge(
-            ontology_mapping_df[["ent_id", "similarity_score"]].rename(
+            ontology_mapping_df[
+                [CLAIM_IDX, "ent_id", "similarity_score"]
+            ].rename(
                 columns={
                     "ent_id": "ref_ent_id",
                     "similarity_score": "ref_similarity_score",
                 }
             ),
             how="left",
-            on=["ref_ent_id"],
+            on=[CLAIM_IDX, "ref_ent_id"],
         )
         .replace({np.nan: 1})
         .assign(
-            query_term=query_term,
-            mapping_score=lambda df: df.apply(
-                lambda row: row["similarity_score"]
-                * row["ref_similarity_score"],
-                axis=1,
-            ),
+            query_term=lambda df: np.array(query_terms, dtype=object)[
+                df[CLAIM_IDX].to_numpy()
+            ],
+            mapping_score=lambda df: df["similarity_score"]
+            * df["ref_similarity_score"],
         )
-        .assign(data=lambda df: df.apply(lambda row: row.to_dict(), axis=1))
-        .groupby("ent_id")
-        .agg({"mapping_score": "max", "data": lambda s: s.to_list()})
     )
-    return mapping_df
+    res = _aggregate_mapping_df(mapping_df)
+    return res
+
+
+def _aggregate_mapping_df(mapping_df: pd.DataFrame) -> pd.DataFrame:
+    """Max mapping score by (claim, ent_id), along with the list of
+    candidate mapping records as `data`.
+    """
+    data: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
+    for key, record in zip(
+        zip(mapping_df[CLAIM_IDX], mapping_df["ent_id"]),
+        mapping_df.drop(columns=[CLAIM_IDX]).to_dict(orient="records"),
+    ):
+        data.setdefault(key, []).append(record)
+    res = (
+        mapping_df.groupby([CLAIM_IDX, "ent_id"])[["mapping_score"]]
+        .max()
+        .assign(data=lambda df: [data[_] for _ in df.index])
+    )
+    return res
+
+
+def _assign_mapping_data(
+    df: pd.DataFrame, include_mapping_data: bool
+) -> pd.DataFrame:
+    mapping_columns = [
+        "subject_mapping_score",
+        "object_mapping_score",
+        "subject_mapping_data",
+        "object_mapping_data",
+    ]
+    if include_mapping_data:
+        df = df.assign(
+            mapping_data=[
+                dict(zip(mapping_columns, _))
+                for _ in zip(*[df[col].tolist() for col in mapping_columns])
+            ]
+        )
+    res = df.drop(columns=mapping_columns)
+    return res
 
 
-def _make_assoc_score(effect_size: float, se: float) -> Optional[float]:
-    if np.isclose(se, 0):
-        return None
-    if np.isclose(effect_size / se, 0):
-        return None
-    res = max(0, 1 + np.log10(np.abs(effect_size / se)))
+def _make_assoc_score(effect_size: np.ndarray, se: np.ndarray) -> np.ndarray:
+    """1 + log10(|effect_size / se|), floored at 0;
+    nan where se or the ratio is close to 0.
+    """
+    effect_size = np.asarray(effect_size, dtype=float)
+    se = np.asarray(se, dtype=float)
+    valid = ~np.isclose(se, 0)
+    ratio = np.divide(
+        effect_size, se, out=np.zeros_like(effect_size), where=valid
+    )
+    valid &= ~np.isclose(ratio, 0)
+    res = np.full_like(ratio, np.nan)
+    res[valid] = np.maximum(0, 1 + np.log10(np.abs(ratio[valid])))
     return res
 
 
-def _make_triple_score(literature_count: int) -> float:
-    return max(0, 1 + np.log10(literature_count))
+def _make_triple_score(literature_count: np.ndarray) -> np.ndarray:
+    """1 + log10(literature_count), floored at 0."""
+    literature_count = np.asarray(literature_count, dtype=float)
+    with np.errstate(divide="ignore"):
+        res = np.maximum(0, 1 + np.log10(literature_count))
+    return res
@@ -1,9 +1,10 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Type, Union
 
+import numpy as np
 import pandera as pa
 from pandera.engines.numpy_engine import Object
 from pandera.typing import Series
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 
 
 class AssocEvidenceDf(pa.SchemaModel):
@@ -30,14 +31,14 @@ class ScoredAssocEvidenceDf(AssocEvidenceDf):
     mapping_score: Series[float]
     assoc_score: Series[float]
     evidence_score: Series[float]
-    mapping_data: Series[Object]
+    mapping_data: Optional[Series[Object]]
 
 
 class ScoredTripleEvidenceDf(TripleEvidenceDf):
     mapping_score: Series[float]
     triple_score: Series[float]
     evidence_score: Series[float]
-    mapping_data: Series[Object]
+    mapping_data: Optional[Series[Object]]
 
 
 class OntologyMappingDf(pa.SchemaModel):
@@ -80,7 +81,7 @@ class ScoredAssocEvidenceItem(AssocEvidenceItem):
     mapping_score: float
     assoc_score: float
     evidence_score: float
-    mapping_data: Dict[str, Any]
+    mapping_data: Optional[Dict[str, Any]] = None
 
 
 class TripleEvidenceItem(BaseModel):
@@ -96,7 +97,7 @@ class ScoredTripleEvidenceItem(TripleEvidenceItem):
     mapping_score: float
     triple_score: float
     evidence_score: float
-    mapping_data: Dict[str, Any]
+    mapping_data: Optional[Dict[str, Any]] = None
 
 
 class OntologyMappingItem(BaseModel):
@@ -150,3 +151,121 @@ class TripleScoresRequests(BaseModel):
 
 class TripleScoresResponse(BaseModel):
     data: List[ScoredTripleEvidenceItem]
+
+
+# NOTE: arrays per field, e.g. {"ent_id": [...], "ent_term": [...]}
+Columns = Dict[str, List[Any]]
+
+
+# NOTE: numpy dtype kinds accepted for the columns of numeric fields
+COLUMN_KINDS = {int: "iu", float: "iuf"}
+
+
+def _check_column(values: List[Any], type_: Any) -> bool:
+    if len(values) == 0:
+        return True
+    if type_ is str:
+        return all(isinstance(_, str) for _ in values)
+    if type_ in COLUMN_KINDS:
+        return np.asarray(values).dtype.kind in COLUMN_KINDS[type_]
+    return True
+
+
+def _columns_validator(model: Type[BaseModel], *fields: str) -> classmethod:
+    """Columnar tables of `fields` are checked against the `model`
+    fields column by column instead of record by record.
+    """
+
+    def check_columns(
+        v: Union[List[Any], Columns]
+    ) -> Union[List[Any], Columns]:
+        if not isinstance(v, dict):
+            return v
+        if len({len(_) for _ in v.values()}) > 1:
+            raise ValueError("columns should be of the same length")
+        missing = [
+            name
+            for name, field in model.__fields__.items()
+            if field.required and name not in v
+        ]
+        if len(missing) > 0:
+            raise ValueError(f"missing columns: {missing}")
+        for name, field in model.__fields__.items():
+            if name in v and not _check_column(v[name], field.outer_type_):
+                raise ValueError(
+                    f"column {name} should be of {field.outer_type_.__name__}"
+                )
+        return v
+
+    res = validator(*fields, allow_reuse=True)(check_columns)
+    return res
+
+
+class AssocScoresClaim(BaseModel):
+    """Tables are either lists of records, or columnar
+    which are validated per column instead of per record.
+    """
+
+    assoc_evidence: Union[List[AssocEvidenceItem], Columns]
+    query_subject_term: str
+    query_object_term: str
+    ontology_subject_mapping: Union[List[OntologyMappingItem], Columns]
+    ontology_object_mapping: Union[List[OntologyMappingItem], Columns]
+    trait_subject_mapping: Union[List[TraitMappingItem], Columns]
+    trait_object_mapping: Union[List[TraitMappingItem], Columns]
+
+    _check_assoc_evidence = _columns_validator(
+        AssocEvidenceItem, "assoc_evidence"
+    )
+    _check_ontology_mapping = _columns_validator(
+        OntologyMappingItem,
+        "ontology_subject_mapping",
+        "ontology_object_mapping",
+    )
+    _check_trait_mapping = _columns_validator(
+        TraitMappingItem, "trait_subject_mapping", "trait_object_mapping"
+    )
+
+
+class AssocScoresBatchRequests(BaseModel):
+    claims: List[AssocScoresClaim]
+    include_mapping_data: bool = True
+
+
+class AssocScoresBatchResponse(BaseModel):
+    data: List[List[ScoredAssocEvidenceItem]]
+
+
+class TripleScoresClaim(BaseModel):
+    """Tables are either lists of records, or columnar
+    which are validated per column instead of per record.
+    """
+
+    triple_evidence: Union[List[TripleEvidenceItem], Columns]
+    query_subject_term: str
+    query_object_term: str
+    ontology_subject_mapping: Union[List[OntologyMappingItem], Columns]
+    ontology_object_mapping: Union[List[OntologyMappingItem], Columns]
+    umls_subject_mapping: Union[List[UmlsMappingItem], Columns]
+    umls_object_mapping: Union[List[UmlsMappingItem], Columns]
+
+    _check_triple_evidence = _columns_validator(
+        TripleEvidenceItem, "triple_evidence"
+    )
+    _check_ontology_mapping = _columns_validator(
+        OntologyMappingItem,
+        "ontology_subject_mapping",
+        "ontology_object_mapping",
+    )
+    _check_umls_mapping = _columns_validator(
+        UmlsMappingItem, "umls_subject_mapping", "umls_object_mapping"
+    )
+
+
+class TripleScoresBatchRequests(BaseModel):
+    claims: List[TripleScoresClaim]
+    include_mapping_data: bool = True
+
+
+class TripleScoresBatchResponse(BaseModel):
+    data: List[List[ScoredTripleEvidenceItem]]
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import pandera as pa
 from pandera.typing import DataFrame
@@ -43,26 +43,63 @@ class TripleEvidenceProcessor:
         object_ents: List[ent_types.BaseEnt],
         pred_term: str,
     ) -> bool:
+        evidence_df = processing.get_triples(
+            **self._query_args(
+                evidence_type=evidence_type,
+                subject_ents=subject_ents,
+                object_ents=object_ents,
+                pred_term=pred_term,
+            ),
+            config=self.config,
+        )
+        if evidence_df is None:
+            return False
+        self._evidence_df = evidence_df
+        return True
+
+    async def aprocess(
+        self,
+        evidence_type: str,
+        subject_ents: List[ent_types.BaseEnt],
+        object_ents: List[ent_types.BaseEnt],
+        pred_term: str,
+    ) -> bool:
+        evidence_df = await processing.aget_triples(
+            **self._query_args(
+                evidence_type=evidence_type,
+                subject_ents=subject_ents,
+                object_ents=object_ents,
+                pred_term=pred_term,
+            ),
+            config=self.config,
+        )
+        if evidence_df is None:
+            return False
+        self._evidence_df = evidence_df
+        return True
+
+    def _query_args(
+        self,
+        evidence_type: str,
+        subject_ents: List[ent_types.BaseEnt],
+        object_ents: List[ent_types.BaseEnt],
+        pred_term: str,
+    ) -> Dict[str, Any]:
         assert evidence_type in ALLOWED_EVIDENCE_TYPE
         subject_ids = [_["ent_id"] for _ in subject_ents]
         object_ids = [_["ent_id"] for _ in object_ents]
         if evidence_type == "supporting":
-            evidence_df = processing.get_triples(
-                subject_ids=subject_ids,
-                object_ids=object_ids,
-                umls_pred=pred_term,
-                direction="forward",
-                config=self.config,
-            )
+            res = {
+                "subject_ids": subject_ids,
+                "object_ids": object_ids,
+                "umls_pred": pred_term,
+                "direction": "forward",
+            }
         elif evidence_type == "contradictory":
-            evidence_df = processing.get_triples(
-                subject_ids=object_ids,
-                object_ids=subject_ids,
-                umls_pred=pred_term,
-                direction="reverse",
-                config=self.config,
-            )
-        if evidence_df is None:
-            return False
-        self._evidence_df = evidence_df
-        return True
+            res = {
+                "subject_ids": object_ids,
+                "object_ids": subject_ids,
+                "umls_pred": pred_term,
+                "direction": "reverse",
+            }
+        return res
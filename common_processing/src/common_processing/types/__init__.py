@@ -15,6 +15,9 @@ class Config:
     epigraphdb_es_url: str
     backend_url: str
     data_path: Path
+    # search data_path/embeddings instead of the neural service
+    # where possible, see ent_harmonization.embedding_index
+    local_embeddings: bool = False
 
 
 @dataclass
@@ -25,3 +25,8 @@ class LiteratureLiteEvidenceDf(pa.SchemaModel):
     pubmed_id: Series[str]
     triple_id: Series[str]
     triple_lower: Series[str]
+
+
+class LiteratureCountDf(pa.SchemaModel):
+    triple_id: Series[str]
+    literature_count: Series[int]